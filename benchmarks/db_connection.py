@@ -0,0 +1,117 @@
+"""
+Micro-benchmark: per-call latency of src/db.py before and after the shared connection.
+
+"before" replays the old pattern (a fresh engine.connect() and commit per call,
+default SQLite pragmas); "after" uses the module's long-lived connection. The
+log_calculation "after" time includes flush_logs(), so the background writer's
+inserts are counted, not just the queueing.
+
+Usage:
+    python -m benchmarks.db_connection [--iterations 2000]
+"""
+import argparse
+import datetime
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+
+import src.db as db
+
+HP_BONUS_QUERY = """
+    SELECT SUM(a.hp_bonus)
+    FROM artifacts a
+    JOIN game_artifacts ga ON a.artifact_id = ga.artifact_id_fk
+    WHERE ga.game_id_fk = :game_id
+"""
+
+LOG_INSERT_QUERY = """
+    INSERT INTO calculation_logs (
+        game_id_fk, timestamp, unit_name, unit_hp_base, unit_hp_modified,
+        unit_count_input, pit_lord_input, demons_gained, wasted_hp
+    ) VALUES (
+        :game_id_fk, :timestamp, :unit_name, :unit_hp_base, :unit_hp_modified,
+        :unit_count_input, :pit_lord_input, :demons_gained, :wasted_hp
+    )
+"""
+
+
+def _log_params(game_id: int) -> dict:
+    return {
+        "game_id_fk": game_id, "timestamp": datetime.datetime.now(), "unit_name": "Imp",
+        "unit_hp_base": 4.0, "unit_hp_modified": 4.0, "unit_count_input": 100,
+        "pit_lord_input": 8, "demons_gained": 11.43, "wasted_hp": 15.0
+    }
+
+
+def _time_per_call(func, iterations: int, finish=None) -> float:
+    """
+    Returns the mean latency of func() in microseconds. `finish` runs inside the
+    timed section after the last call, for work func() only queues.
+    """
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    if finish is not None:
+        finish()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run(iterations: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        before_url = f"sqlite:///{Path(tmp) / 'before.db'}"
+        after_url = f"sqlite:///{Path(tmp) / 'after.db'}"
+
+        db.configure_database(before_url)
+        db.initialize_database()
+        game_id = db.get_or_create_game("bench")["game_id"]
+        db.set_game_artifacts(game_id, [1, 4])
+        db.configure_database(after_url)
+        db.initialize_database()
+        db.get_or_create_game("bench")
+        db.set_game_artifacts(game_id, [1, 4])
+
+        legacy_engine = create_engine(before_url)
+
+        def legacy_hp_bonus():
+            with legacy_engine.connect() as con:
+                con.execute(text(HP_BONUS_QUERY), {"game_id": game_id}).scalar()
+
+        def legacy_log():
+            with legacy_engine.connect() as con:
+                con.execute(text(LOG_INSERT_QUERY), _log_params(game_id))
+                con.commit()
+
+        def pooled_log():
+            db.log_calculation(game_id, "Imp", 4.0, 4.0, 100, 8, 11.43, 15.0)
+
+        results = {
+            "get_game_hp_bonus": (
+                _time_per_call(legacy_hp_bonus, iterations),
+                _time_per_call(lambda: db.get_game_hp_bonus(game_id), iterations),
+            ),
+            "log_calculation": (
+                _time_per_call(legacy_log, iterations),
+                _time_per_call(pooled_log, iterations, finish=db.flush_logs),
+            ),
+        }
+
+        legacy_engine.dispose()
+        db.close_connection()
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    print(f"{'operation':<20}{'before (us)':>14}{'after (us)':>14}{'speedup':>10}")
+    for name, (before, after) in results.items():
+        print(f"{name:<20}{before:>14.1f}{after:>14.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Benchmark suite for the core, db and rendering hot paths.
+
+Every benchmark reports the median time per call (in microseconds) over
+several repeats. Results are written as JSON and, when a baseline file is
+given, compared against it: any benchmark slower than baseline * (1 + tolerance)
+is a regression and the run exits with status 1.
+
+Usage:
+    python -m benchmarks.run [--logs 1000000] [--output benchmarks/results.json]
+                             [--baseline benchmarks/baseline.json] [--tolerance 0.25]
+                             [--save-baseline] [--only core,db]
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = BENCH_DIR / "results.json"
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+GROUPS = ("core", "chart", "init", "db", "views")
+
+
+def _measure(func, number: int, repeat: int = 5, finish=None) -> float:
+    """
+    Returns the median time per call of func() in microseconds. `finish` runs
+    inside each timed repeat, after the last call (e.g. to flush queued writes).
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if finish is not None:
+            finish()
+        timings.append((time.perf_counter() - started) / number * 1e6)
+    return statistics.median(timings)
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silences the progress output of initialize_database."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        yield
+
+
+def bench_core(results: dict, scenarios: int = 10_000):
+    """Scalar calculate_demon_farm in a loop vs one calculate_demon_farm_batch call, per scenario."""
+    import src.core as core
+
+    rng = np.random.default_rng(0)
+    unit_hp = rng.integers(1, 300, scenarios) * np.array([1.0, 1.1, 1.2, 1.3])[rng.integers(0, 4, scenarios)]
+    counts = rng.integers(0, 5000, scenarios)
+    lords = rng.integers(0, 100, scenarios)
+    rows = list(zip(unit_hp.tolist(), counts.tolist(), lords.tolist()))
+
+    def scalar():
+        for hp, count, pit_lords in rows:
+            core.calculate_demon_farm(hp, count, pit_lords)
+
+    results["core.calculate_demon_farm[scalar]"] = _measure(scalar, 1) / scenarios
+    results["core.calculate_demon_farm_batch"] = _measure(lambda: core.calculate_demon_farm_batch(unit_hp, counts, lords), 5) / scenarios
+
+
+def bench_chart(results: dict):
+    """cli._calculate_chart_data for a typical and a large stack."""
+    import src.cli as cli
+
+    results["cli._calculate_chart_data[875x4.4]"] = _measure(lambda: cli._calculate_chart_data(4.4, 875, 77), 2000)
+    results["cli._calculate_chart_data[99999x13.7]"] = _measure(lambda: cli._calculate_chart_data(13.7, 99_999, 10), 2000)
+
+
+def bench_init(results: dict, tmp: Path):
+    """initialize_database on a brand-new file (cold) and on an up-to-date one (warm)."""
+    import src.db as db
+
+    cold_runs = []
+    for run in range(3):
+        db.configure_database(f"sqlite:///{tmp / f'cold_{run}.db'}")
+        started = time.perf_counter()
+        with _quiet():
+            db.initialize_database()
+        cold_runs.append((time.perf_counter() - started) * 1e6)
+    results["db.initialize_database[cold]"] = statistics.median(cold_runs)
+    results["db.initialize_database[warm]"] = _measure(db.initialize_database, 200)
+
+
+def bench_db(results: dict, tmp: Path, logs: int, games: int = 200):
+    """Every public query in src/db.py against a database holding `logs` calculation_logs rows."""
+    import src.db as db
+
+    from src.datagen import generate_database
+
+    seeded = tmp / "seeded.db"
+    with _quiet():
+        summary = generate_database(seeded, games=games, logs=logs, seed=0)
+    results[f"datagen.generate_database[{logs} logs]"] = summary["seconds"] * 1e6
+    db.configure_database(f"sqlite:///{seeded}")
+
+    game_id = games // 2
+    db.set_game_artifacts(game_id, [1, 4])
+
+    queries = {
+        "get_factions": lambda: db.get_factions(),
+        "get_units_by_faction": lambda: db.get_units_by_faction("Inferno", False),
+        "get_unit_hp": lambda: db.get_unit_hp("Imp"),
+        "get_unit": lambda: db.get_unit("Imp"),
+        "get_all_units": lambda: db.get_all_units(),
+        "get_all_unit_details": lambda: db.get_all_unit_details(),
+        "get_all_artifacts": lambda: db.get_all_artifacts(),
+        "get_or_create_game": lambda: db.get_or_create_game("Load Test 000100"),
+        "update_game_stats": lambda: db.update_game_stats(game_id, 10, 2),
+        "get_game_artifacts": lambda: db.get_game_artifacts(game_id),
+        "set_game_artifacts": lambda: db.set_game_artifacts(game_id, [1, 4]),
+        "get_game_hp_bonus": lambda: db.get_game_hp_bonus(game_id),
+        "get_game_context": lambda: db.get_game_context(game_id),
+        "get_game_log_summary": lambda: db.get_game_log_summary(game_id),
+        "get_games_page": lambda: db.get_games_page("Load Test 0001", ("Load Test 000100", 100), 15),
+    }
+    for name, query in queries.items():
+        results[f"db.{name}"] = _measure(query, 200)
+
+    def log():
+        db.log_calculation(game_id, "Imp", 4.0, 4.4, 100, 9, 12.57, 20.0)
+
+    results["db.log_calculation+flush_logs"] = _measure(log, 200, finish=db.flush_logs)
+
+    def create_and_delete():
+        db.delete_game(db.get_or_create_game("bench-scratch")["game_id"])
+
+    results["db.get_or_create_game+delete_game"] = _measure(create_and_delete, 50)
+    db.flush_logs()
+    db.close_connection()
+
+
+def bench_views(results: dict):
+    """Rendering the distribution chart and the unit selection table to a null console."""
+    from rich.console import Console
+
+    import src.cli as cli
+    import src.db as db
+    import src.views as views
+
+    with open(os.devnull, "w") as devnull:
+        previous, views.console = views.console, Console(file=devnull, force_terminal=True, width=120)
+        try:
+            _, chart_data, next_perfect = cli._calculate_chart_data(4.4, 875, 77)
+            results["views.display_distribution_chart"] = _measure(
+                lambda: views.display_distribution_chart(chart_data, 77, next_perfect, 875), 200
+            )
+            faction = db.get_factions()[0]
+            non_upgraded = db.get_units_by_faction(faction, False)
+            upgraded = db.get_units_by_faction(faction, True)
+            results["views.display_unit_selection_table"] = _measure(
+                lambda: views.display_unit_selection_table(faction, non_upgraded, upgraded), 200
+            )
+        finally:
+            views.console = previous
+
+
+def run(groups: tuple, logs: int) -> dict:
+    """Runs the selected benchmark groups on scratch databases and returns {name: microseconds}."""
+    import src.db as db
+
+    results = {}
+    previous_database = db.get_engine().url.render_as_string(hide_password=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        try:
+            db.configure_database(f"sqlite:///{tmp / 'catalog.db'}")
+            with _quiet():
+                db.initialize_database()
+            if "core" in groups:
+                bench_core(results)
+            if "chart" in groups:
+                bench_chart(results)
+            if "views" in groups:
+                bench_views(results)
+            if "init" in groups:
+                bench_init(results, tmp)
+            if "db" in groups:
+                bench_db(results, tmp, logs)
+        finally:
+            db.configure_database(previous_database)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Returns (name, baseline_us, current_us) for every benchmark slower than the tolerance allows."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current > previous * (1 + tolerance):
+            regressions.append((name, previous, current))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logs", type=int, default=1_000_000, help="calculation_logs rows seeded for the db group.")
+    parser.add_argument("--only", default=",".join(GROUPS), help=f"Comma-separated groups from: {', '.join(GROUPS)}.")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="Where to write this run's JSON.")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against (skipped if missing).")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%).")
+    parser.add_argument("--save-baseline", action="store_true", help="Also write this run as the new baseline.")
+    args = parser.parse_args(argv)
+
+    groups = tuple(group.strip() for group in args.only.split(",") if group.strip())
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown group(s): {', '.join(sorted(unknown))}")
+
+    results = run(groups, args.logs)
+    report = {
+        "meta": {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "logs": args.logs,
+        },
+        "results_us": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))["results_us"]
+
+    print(f"{'benchmark':<44}{'current (us)':>16}{'baseline (us)':>16}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        print(f"{name:<44}{current:>16,.2f}{(f'{previous:,.2f}' if previous else '-'):>16}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, previous, current in regressions:
+        print(f"[✖] {name}: {previous:,.2f} us -> {current:,.2f} us (+{(current / previous - 1) * 100:.0f}%)")
+    if baseline:
+        print("No regressions." if not regressions else f"{len(regressions)} regression(s).")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Scaling benchmark for src/sweep.py: runs the same roster-sized grid with 1..N workers.
+
+Usage:
+    python -m benchmarks.sweep_scaling [--max-workers 8] [--counts 2000] [--pit-lords 50]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from src.sweep import run_sweep
+
+ROSTER_SIZE = 168
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--counts", type=int, default=2000, help="Unit counts 0..N-1 per unit.")
+    parser.add_argument("--pit-lords", type=int, default=50, help="Pit Lord counts 0..N-1.")
+    parser.add_argument("--chunk-size", type=int, default=500_000)
+    args = parser.parse_args()
+
+    base_hp = np.linspace(1, 1000, ROSTER_SIZE).round()
+    counts = np.arange(args.counts)
+    pit_lords = np.arange(args.pit_lords)
+    bonuses = np.arange(6)
+    rows = ROSTER_SIZE * args.counts * args.pit_lords * 4 * len(bonuses)
+
+    print(f"Grid: {rows:,} scenarios")
+    print(f"{'workers':>8}{'seconds':>10}{'rows/s':>16}{'speedup':>10}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        started = time.perf_counter()
+        run_sweep(base_hp, counts, pit_lords, artifact_bonuses=bonuses, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{workers:>8}{elapsed:>10.2f}{rows / elapsed:>16,.0f}{baseline / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
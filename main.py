@@ -1,21 +1,206 @@
-import src.cli as cli
+import argparse
+import os
+import sys
+import time
+
 import src.db as db
-from sqlalchemy.exc import OperationalError
+from src.config import LUT_FILE_PATH, LUT_MAX_COUNT, LUT_MAX_DEMONS
+
+HEAVY_MODULES = ("sqlalchemy", "rich", "questionary", "tqdm", "numpy", "pandas")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the command-line parser for the application."""
+    parser = argparse.ArgumentParser(description="HotA Demon Farming Calculator")
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="Print a startup timing report (per phase and loaded heavy modules) before the menu opens."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time the calculators, renderers and db queries the app calls and print a p50/p95/p99 report at exit "
+             "(same as DEMON_CALC_PROFILE=1)."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser(
+        "rebuild-summary",
+        help="Recompute the per-game summary table from all calculation logs."
+    )
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Stream CSV/JSONL scenario rows through the calculator without the interactive menu."
+    )
+    batch_parser.add_argument("input", nargs="?", default="-", help="Scenario file ('-' for stdin).")
+    batch_parser.add_argument("-o", "--output", default="-", help="Result file ('-' for stdout).")
+    batch_parser.add_argument("--input-format", choices=("csv", "jsonl"), help="Defaults to the input file extension, or csv.")
+    batch_parser.add_argument("--output-format", choices=("csv", "jsonl"), help="Defaults to the output file extension, or csv.")
+    batch_parser.add_argument("--reverse", action="store_true", help="Rows hold target_demons; run the Reverse Calculator.")
+    batch_parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows processed per chunk.")
+    lut_parser = subparsers.add_parser(
+        "build-lut",
+        help="Precompute farm/reverse results for every catalog HP into a memory-mapped lookup table."
+    )
+    lut_parser.add_argument("--max-count", type=int, default=LUT_MAX_COUNT, help="Largest unit count in the table.")
+    lut_parser.add_argument("--max-demons", type=int, default=LUT_MAX_DEMONS, help="Largest target demons in the table.")
+    lut_parser.add_argument("-o", "--output", default=str(LUT_FILE_PATH), help="Table file to write.")
+    gen_parser = subparsers.add_parser(
+        "gen-db",
+        help="Generate a large synthetic database (games, artifacts, calculation logs) for load testing."
+    )
+    gen_parser.add_argument("--out", required=True, help="SQLite file to create.")
+    gen_parser.add_argument("--games", type=int, default=5_000)
+    gen_parser.add_argument("--logs", type=int, default=1_000_000)
+    gen_parser.add_argument("--max-artifacts", type=int, default=4, help="Artifacts linked to each game, at most.")
+    gen_parser.add_argument("--seed", type=int, default=0, help="Same seed, same database.")
+    gen_parser.add_argument("--force", action="store_true", help="Overwrite --out if it exists.")
+    export_parser = subparsers.add_parser(
+        "export-logs",
+        help="Stream calculation logs into Parquet/Arrow files partitioned by game (needs pyarrow)."
+    )
+    export_parser.add_argument("--out", required=True, help="Output directory.")
+    export_parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    export_parser.add_argument("--incremental", action="store_true", help="Only export logs added since the last export to --out.")
+    export_parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows fetched per database round trip.")
+    import_parser = subparsers.add_parser(
+        "import-logs",
+        help="Bulk-import recorded calculations from CSV/JSONL session files (duplicates are skipped)."
+    )
+    import_parser.add_argument("input", nargs="?", default="-", help="Session file ('-' for stdin).")
+    import_parser.add_argument("--input-format", choices=("csv", "jsonl"), help="Defaults to the input file extension, or csv.")
+    import_parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per executemany/transaction.")
+    subparsers.add_parser(
+        "check-plans",
+        help="Run EXPLAIN QUERY PLAN on every db query; exit with status 1 on a full table scan."
+    )
+    return parser
+
+
+def print_startup_report(phases: list):
+    """Prints how long each startup phase took and which heavy modules got imported."""
+    print("--- Startup report ---")
+    for name, seconds in phases:
+        print(f"  {name:<24}{seconds * 1000:>9.2f} ms")
+    print(f"  {'total':<24}{sum(seconds for _, seconds in phases) * 1000:>9.2f} ms")
+    loaded = [module for module in HEAVY_MODULES if module in sys.modules]
+    print(f"  Heavy modules loaded:   {', '.join(loaded) if loaded else 'none'}")
+    print(f"  Database:               {db.get_engine().url}")
+
+
+def run_batch_command(args):
+    """Opens the batch input/output streams and runs the headless calculator."""
+    from src.batch import detect_format, run_batch
+
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or detect_format(args.output)
+    input_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        written = run_batch(
+            input_stream, output_stream,
+            input_format=input_format, output_format=output_format,
+            reverse=args.reverse, chunk_size=args.chunk_size
+        )
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+    print(f"Batch finished: {written} result rows.", file=sys.stderr)
+
+
+def run_import_command(args):
+    """Opens the session file and bulk-imports it into calculation_logs."""
+    from src.batch import detect_format
+    from src.importer import import_logs
+
+    input_format = args.input_format or detect_format(args.input)
+    input_stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    try:
+        summary = import_logs(input_stream, input_format=input_format, chunk_size=args.chunk_size)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+    print(
+        f"Imported {summary['inserted']} of {summary['rows']} rows into {summary['games']} games "
+        f"({summary['duplicates']} duplicates, {summary['skipped']} skipped) in {summary['seconds']:.1f} s "
+        f"({summary['rows'] / max(summary['seconds'], 1e-9):,.0f} rows/s).",
+        file=sys.stderr
+    )
 
 
-print(f"--- DEBUG: Ścieżka używana przez silnik: {db.engine.url}")
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    phases = []
 
-def main():
-    print("Initializing database...")
+    if args.profile or os.environ.get("DEMON_CALC_PROFILE"):
+        import src.profiling as profiling
+        if args.profile or profiling.requested():
+            profiling.enable()
+
+    started = time.perf_counter()
     db.initialize_database()
-    print("Database is ready.")
-    cli.start_app()
+    phases.append(("initialize_database", time.perf_counter() - started))
 
+    if args.command == "rebuild-summary":
+        rows = db.rebuild_game_unit_totals()
+        print(f"Rebuilt game summary: {rows} (game, unit) rows.")
+        return
 
-if __name__ == "__main__":
-    main() 
-    
+    if args.command == "batch":
+        run_batch_command(args)
+        return
+
+    if args.command == "build-lut":
+        from src.lut import build_lut
+        started = time.perf_counter()
+        rows = build_lut(args.output, args.max_count, args.max_demons)
+        print(f"Built lookup table: {rows} HP rows in {time.perf_counter() - started:.2f} s -> {args.output}")
+        return
+
+    if args.command == "gen-db":
+        from src.datagen import generate_database
+        summary = generate_database(
+            args.out, games=args.games, logs=args.logs, max_artifacts=args.max_artifacts,
+            seed=args.seed, overwrite=args.force
+        )
+        print(
+            f"Generated {args.out}: {summary['games']} games, {summary['game_artifacts']} artifact links, "
+            f"{summary['logs']} logs in {summary['seconds']:.1f} s."
+        )
+        return
+
+    if args.command == "export-logs":
+        from src.export import export_logs
+        try:
+            summary = export_logs(args.out, incremental=args.incremental, fmt=args.format, chunk_size=args.chunk_size)
+        except (RuntimeError, FileExistsError) as e:
+            sys.exit(f"[✖] {e}")
+        print(f"Exported {summary['rows']} logs into {summary['files']} files (up to log_id {summary['last_log_id']}).")
+        return
 
+    if args.command == "import-logs":
+        run_import_command(args)
+        return
 
+    if args.command == "check-plans":
+        from src.query_plans import check_query_plans
+        problems = check_query_plans()
+        for statement, detail in problems:
+            print(f"[✖] {detail}: {statement}")
+        print("Query plans OK." if not problems else f"{len(problems)} full table scan(s) found.")
+        sys.exit(1 if problems else 0)
 
+    started = time.perf_counter()
+    import src.cli as cli
+    phases.append(("import src.cli", time.perf_counter() - started))
 
+    if args.importtime:
+        print_startup_report(phases)
+
+    cli.start_app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Per-game analytics over calculation_logs, computed with pandas.
+
+A game's logs (joined with units.gold_cost) are read in chunks and compacted
+(categorical unit names, downcast counts and ids). Consecutive logs less than
+`session_gap` apart form one play session, and every aggregate is computed
+with vectorized groupby operations:
+
+    demons          demons gained per session
+    waste_ratio     wasted HP / total HP pool sacrificed
+    gold_per_demon  gold spent on the sacrificed units per demon gained
+    gold_efficiency value of the demons at DEMON_GOLD_COST / gold spent (> 1: cheaper than buying)
+    lord_utilization HP the Pit Lords actually ground / HP they could have ground
+"""
+import pandas as pd
+
+import src.db as db
+from src.config import DEMON_GOLD_COST, PIT_LORD_GRIND_RATE
+
+DEFAULT_SESSION_GAP = pd.Timedelta(minutes=30)
+
+
+def _compact(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parses timestamps and shrinks one chunk's integer dtypes. HP, demons and waste
+    stay float64: float32 does not hold hundredths of HP exactly, and hp_pool
+    multiplies the modified HP by the unit count.
+    """
+    frame["timestamp"] = pd.to_datetime(frame["timestamp"], format="ISO8601")
+    for column in ("log_id", "unit_count_input", "pit_lord_input", "gold_cost"):
+        frame[column] = pd.to_numeric(frame[column], downcast="integer")
+    for column in ("unit_hp_modified", "demons_gained", "wasted_hp"):
+        frame[column] = frame[column].astype("float64")
+    return frame
+
+
+def load_game_logs(game_id: int, chunk_size: int = 100_000) -> pd.DataFrame:
+    """Returns a game's logs as one compact DataFrame, ordered by time."""
+    chunks = [_compact(chunk) for chunk in db.read_game_logs_frames(game_id, chunk_size)]
+    if not chunks:
+        return _compact(pd.DataFrame({
+            "log_id": [], "timestamp": [], "unit_name": [], "unit_hp_modified": [], "unit_count_input": [],
+            "pit_lord_input": [], "demons_gained": [], "wasted_hp": [], "gold_cost": [],
+        }))
+    logs = pd.concat(chunks, ignore_index=True)
+    logs["unit_name"] = logs["unit_name"].astype("category")
+    return logs.sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def add_derived_columns(logs: pd.DataFrame, session_gap: pd.Timedelta = DEFAULT_SESSION_GAP) -> pd.DataFrame:
+    """Adds session ids and the per-log HP pool, gold spent and Pit Lord capacity."""
+    logs = logs.copy()
+    logs["session"] = (logs["timestamp"].diff() > session_gap).cumsum().astype("int32")
+    logs["hp_pool"] = logs["unit_hp_modified"] * logs["unit_count_input"]
+    logs["gold_spent"] = logs["unit_count_input"].astype("int64") * logs["gold_cost"]
+    logs["lord_capacity"] = logs["pit_lord_input"].astype("int64") * PIT_LORD_GRIND_RATE
+    logs["hp_ground"] = logs["hp_pool"].clip(upper=logs["lord_capacity"])
+    return logs
+
+
+def _ratios(frame: pd.DataFrame) -> pd.DataFrame:
+    """Computes the ratio columns from summed totals (NaN where undefined)."""
+    paid = frame["gold_spent"] > 0
+    frame["waste_ratio"] = frame["wasted_hp"] / frame["hp_pool"].where(frame["hp_pool"] > 0)
+    frame["gold_per_demon"] = (frame["gold_spent"] / frame["paid_demons"].where(frame["paid_demons"] > 0)).where(paid)
+    frame["gold_efficiency"] = (frame["paid_demons"] * DEMON_GOLD_COST / frame["gold_spent"]).where(paid)
+    frame["lord_utilization"] = frame["hp_ground"] / frame["lord_capacity"].where(frame["lord_capacity"] > 0)
+    return frame
+
+
+def session_stats(logs: pd.DataFrame, session_gap: pd.Timedelta = DEFAULT_SESSION_GAP) -> pd.DataFrame:
+    """One row per play session with its totals and ratios."""
+    logs = add_derived_columns(logs, session_gap)
+    logs["paid_demons"] = logs["demons_gained"].where(logs["gold_cost"] > 0, 0.0)
+    sessions = logs.groupby("session").agg(
+        start=("timestamp", "min"),
+        end=("timestamp", "max"),
+        calculations=("log_id", "size"),
+        units=("unit_count_input", "sum"),
+        demons=("demons_gained", "sum"),
+        paid_demons=("paid_demons", "sum"),
+        hp_pool=("hp_pool", "sum"),
+        wasted_hp=("wasted_hp", "sum"),
+        gold_spent=("gold_spent", "sum"),
+        hp_ground=("hp_ground", "sum"),
+        lord_capacity=("lord_capacity", "sum"),
+    )
+    return _ratios(sessions)
+
+
+def game_totals(sessions: pd.DataFrame) -> dict:
+    """Whole-game totals and ratios from the per-session table."""
+    if sessions.empty:
+        return {}
+    totals = sessions[[
+        "calculations", "units", "demons", "paid_demons", "hp_pool", "wasted_hp",
+        "gold_spent", "hp_ground", "lord_capacity",
+    ]].sum().to_frame().T
+    totals = _ratios(totals).iloc[0].to_dict()
+    totals["sessions"] = len(sessions)
+    totals["start"], totals["end"] = sessions["start"].min(), sessions["end"].max()
+    return totals
+
+
+def game_analytics(game_id: int, session_gap: pd.Timedelta = DEFAULT_SESSION_GAP) -> tuple:
+    """
+    Loads a game's logs and returns (sessions, totals):
+    the per-session DataFrame from session_stats and the game_totals dict.
+    """
+    sessions = session_stats(load_game_logs(game_id), session_gap)
+    return sessions, game_totals(sessions)
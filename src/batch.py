@@ -0,0 +1,241 @@
+"""
+Headless batch mode: streams scenario rows from CSV/JSONL through the calculator.
+
+Each input row describes one scenario:
+    unit_name or hp      the unit to sacrifice (catalog name or base HP)
+    count                number of units (farm mode)
+    target_demons        number of demons wanted (reverse mode)
+    pit_lords            number of Pit Lords (farm mode, default 0)
+    first_aid            First Aid level 0-3 (default 0)
+    artifacts            total HP bonus as an integer, or artifact names separated by ';'
+
+Rows are processed in fixed-size chunks, so memory use does not grow with the input.
+"""
+import csv
+import json
+import math
+import sys
+from itertools import islice
+
+import src.core
+import src.lut
+from src.config import PIT_LORD_GRIND_RATE
+
+FARM_FIELDS = [
+    "unit_name", "unit_hp_base", "first_aid", "artifact_bonus",
+    "unit_hp", "unit_count", "pit_lord_count", "total_hp_pool",
+    "max_demons_from_hp", "max_demons_from_lords", "actual_demons_gained",
+    "needed_pit_lords", "wasted_hp", "perfect_grind_units", "perfect_grind_hp", "perfect_grind_lords",
+]
+
+REVERSE_FIELDS = [
+    "unit_name", "unit_hp_base", "first_aid", "artifact_bonus",
+    "target_demons", "unit_hp", "unit_gold_cost", "needed_units", "needed_pit_lords",
+    "actual_hp_pool", "actual_demons_yield", "wasted_hp", "total_gold_cost", "gold_per_demon",
+]
+
+
+_INT64_MAX = 2**63 - 1
+
+
+class BatchInputError(ValueError):
+    """Raised for a scenario row that cannot be resolved or parsed."""
+
+
+def detect_format(path: str, default: str = "csv") -> str:
+    """Guesses 'csv' or 'jsonl' from a file name."""
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def read_rows(stream, input_format: str):
+    """
+    Yields (line_number, row) for every input row, lazily. line_number is the
+    physical line in the file (for a CSV record spanning several lines, its last
+    line), so blank lines and quoted newlines do not shift error messages.
+    A JSONL line that is not a JSON object is yielded as a BatchInputError instead,
+    so the caller reports it against its line number and carries on.
+    """
+    if input_format == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                row = BatchInputError(f"invalid JSON: {e.msg}")
+            else:
+                if not isinstance(row, dict):
+                    row = BatchInputError(f"expected a JSON object, got {type(row).__name__}")
+            yield line_number, row
+    else:
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+
+
+def chunks(rows, chunk_size: int):
+    """Yields lists of up to chunk_size items from rows, lazily."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class Resolver:
+    """Resolves unit names and artifact names against the catalog, touching the db only when needed."""
+
+    def __init__(self):
+        self._artifact_bonus = None
+        self._perfect_stacks = None
+
+    def unit(self, row: dict) -> tuple:
+        unit_name = row.get("unit_name") or ""
+        hp = row.get("hp")
+        if hp not in (None, ""):
+            if not math.isfinite(float(hp)):
+                raise BatchInputError(f"hp must be a finite number, got {hp!r}")
+            return unit_name or f"Custom Unit ({hp} HP)", float(hp), int(row.get("gold_cost") or 0)
+        if not unit_name:
+            raise BatchInputError("row needs either 'unit_name' or 'hp'")
+
+        import src.db as db
+        unit = db.get_unit(unit_name)
+        if unit is None:
+            raise BatchInputError(f"unknown unit '{unit_name}'")
+        return unit_name, float(unit["hp"]), int(unit["gold_cost"])
+
+    def perfect_stack(self, row: dict, unit_name: str, base_hp: float, fa_level: int, bonus: int) -> tuple:
+        """
+        (units, hp_hundredths, pit_lords) from the catalog's perfect-stack index, or None
+        for a custom HP; those are filled in a whole chunk at a time by _farm_records.
+        """
+        if row.get("hp") not in (None, ""):
+            return None
+        if self._perfect_stacks is None:
+            import src.db as db
+            self._perfect_stacks = db.get_perfect_stack_index()
+        return src.core.lookup_perfect_stack(self._perfect_stacks, unit_name, base_hp, fa_level, bonus)
+
+    def artifact_bonus(self, value) -> int:
+        if value in (None, ""):
+            return 0
+        if isinstance(value, (int, float)):
+            return int(value)
+        if isinstance(value, list):
+            names = value
+        else:
+            value = str(value).strip()
+            if value.lstrip("-").isdigit():
+                return int(value)
+            names = [name.strip() for name in value.split(";") if name.strip()]
+
+        if self._artifact_bonus is None:
+            import src.db as db
+            self._artifact_bonus = {art["name"]: art["hp_bonus"] for art in db.get_all_artifacts()}
+        try:
+            return sum(self._artifact_bonus[name] for name in names)
+        except KeyError as e:
+            raise BatchInputError(f"unknown artifact {e}") from None
+
+
+def check_int64_range(hp_hundredths: int, count: int, pit_lords: int):
+    """
+    Raises BatchInputError if a farm scenario would overflow the int64 arithmetic of
+    the vectorized core (modified HP, HP pool or Pit Lord capacity).
+    """
+    if abs(count) > _INT64_MAX or abs(pit_lords) * PIT_LORD_GRIND_RATE > _INT64_MAX:
+        raise BatchInputError("count or pit_lords out of range")
+    if abs(hp_hundredths) * max(abs(count), 10) > _INT64_MAX:
+        raise BatchInputError("HP pool out of range")
+
+
+def _parse_chunk(chunk: list, resolver: Resolver, reverse: bool, errors) -> list:
+    """
+    Turns (line_number, row) pairs into (unit_name, base_hp, gold_cost, first_aid, bonus, amount,
+    pit_lords, perfect_stack) tuples; perfect_stack is only looked up in farm mode.
+    """
+    parsed = []
+    for line_number, row in chunk:
+        try:
+            if isinstance(row, BatchInputError):
+                raise row
+            unit_name, base_hp, gold_cost = resolver.unit(row)
+            first_aid = int(row.get("first_aid") or 0)
+            if first_aid not in src.core.FIRST_AID_LEVELS:
+                raise BatchInputError(f"first_aid must be one of {src.core.FIRST_AID_LEVELS}")
+            bonus = resolver.artifact_bonus(row.get("artifacts"))
+            amount = int(row["target_demons"] if reverse else row["count"])
+            pit_lords = 0 if reverse else int(row.get("pit_lords") or 0)
+            hp_hundredths = src.core.modified_hp_hundredths(base_hp, bonus, first_aid)
+            if reverse and hp_hundredths <= 0:
+                raise BatchInputError("modified HP must be positive to reach a target")
+            if not reverse:
+                check_int64_range(hp_hundredths, amount, pit_lords)
+        except (BatchInputError, KeyError, TypeError, ValueError, OverflowError) as e:
+            errors.write(f"line {line_number}: skipped ({e})\n")
+            continue
+        perfect_stack = None if reverse else resolver.perfect_stack(row, unit_name, base_hp, first_aid, bonus)
+        parsed.append((unit_name, base_hp, gold_cost, first_aid, bonus, amount, pit_lords, perfect_stack))
+    return parsed
+
+
+def _farm_records(parsed: list):
+    import numpy as np
+
+    unit_names, base_hp, _, first_aid, bonus, counts, pit_lords, perfect_stacks = zip(*parsed)
+    base_hp = np.array(base_hp, dtype=np.float64)
+    first_aid = np.array(first_aid, dtype=np.int64)
+    bonus = np.array(bonus, dtype=np.int64)
+    unit_hp = src.core.modified_hp_batch(base_hp, bonus, first_aid)
+
+    custom = np.array([stack is None for stack in perfect_stacks])
+    stacks = np.array([stack or (0, 0, 0) for stack in perfect_stacks], dtype=np.int64)
+    if custom.any():
+        stacks[custom] = np.column_stack(src.lut.perfect_stack_batch(unit_hp[custom]))
+    results = src.core.calculate_demon_farm_batch(unit_hp, counts, pit_lords, stacks.T)
+    columns = [unit_names, base_hp.tolist(), first_aid.tolist(), bonus.tolist()]
+    columns += [results[field].tolist() for field in FARM_FIELDS[4:]]
+    return zip(*columns)
+
+
+def _reverse_records(parsed: list):
+    for unit_name, base_hp, gold_cost, first_aid, bonus, target, _, _ in parsed:
+        unit_hp = src.core.modified_hp(base_hp, bonus, first_aid)
+        results = src.core.calculate_reverse_farm(target, unit_hp, gold_cost)
+        yield (unit_name, base_hp, first_aid, bonus, *(results[field] for field in REVERSE_FIELDS[4:]))
+
+
+def run_batch(input_stream, output_stream, input_format: str = "csv", output_format: str = "csv",
+              reverse: bool = False, chunk_size: int = 50_000, errors=sys.stderr) -> int:
+    """
+    Streams scenarios from input_stream to output_stream.
+    Returns the number of result rows written.
+    """
+    fields = REVERSE_FIELDS if reverse else FARM_FIELDS
+    resolver = Resolver()
+    written = 0
+
+    if output_format == "jsonl":
+        def write(records):
+            output_stream.writelines(json.dumps(dict(zip(fields, record))) + "\n" for record in records)
+    else:
+        writer = csv.writer(output_stream, lineterminator="\n")
+        writer.writerow(fields)
+        write = writer.writerows
+
+    for chunk in chunks(read_rows(input_stream, input_format), chunk_size):
+        parsed = _parse_chunk(chunk, resolver, reverse, errors)
+        if not parsed:
+            continue
+        records = list(_reverse_records(parsed) if reverse else _farm_records(parsed))
+        write(records)
+        written += len(records)
+
+    output_stream.flush()
+    return written
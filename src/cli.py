@@ -9,35 +9,66 @@ from rich.panel import Panel
 
 import src.inputs as inputs
 import src.views as views
+from src.config import CALC_CACHE_SIZE, HP_SCALE
 
 
 console = Console()
 
-def _get_modified_hp(base_hp: float, game_id: int, fa_level: int) -> Tuple[float, int]:
+# The menus recompute the same (hp, count, lords) scenario several times per screen.
+calculate_demon_farm = src.core.memoize(maxsize=CALC_CACHE_SIZE)(src.core.calculate_demon_farm)
+calculate_reverse_farm = src.core.memoize(maxsize=CALC_CACHE_SIZE)(src.core.calculate_reverse_farm)
+
+def _get_modified_hp(base_hp: float, game: src.core.GameContext) -> Tuple[float, int]:
     """
-    Gets the artifact bonus and calculates the modified HP.
+    Calculates the modified HP from the game's cached modifiers (no queries).
     Returns (modified_hp, artifact_bonus)
     """
-    artifact_bonus = db.get_game_hp_bonus(game_id)
-    
-    hp_with_artifacts = base_hp + artifact_bonus
-    
-    fa_multiplier = 1.0 + (fa_level * 0.10)
-    
-    modified_hp = hp_with_artifacts * fa_multiplier
-    
-    return modified_hp, artifact_bonus
+    return game.modified_hp(base_hp), game.artifact_bonus
 
 
-def _calculate_chart_data(unit_hp, unit_count, pit_lord_count):
-    """Builds the data list for the distribution chart."""
-    chart_data_list = []
-    results_current = None
-    
+def _iter_chart_rows(unit_hp, first_count: int, last_count: int, current_count: int = None):
+    """
+    Lazily yields chart rows for first_count..last_count.
+    The HP pool, waste remainder and Pit Lord count are stepped incrementally
+    from the previous row in exact integer hundredths, not recomputed per row.
+    """
+    step = src.core.to_hundredths(unit_hp)
+    demon_hp, lord_hp = src.core.DEMON_HP_HUNDREDTHS, src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS
+
+    pool = first_count * step
+    waste = pool % demon_hp
+    lords = -(-pool // lord_hp)
+
+    for count in range(first_count, last_count + 1):
+        yield {
+            'count': count, 'demons': pool / demon_hp,
+            'waste': waste / HP_SCALE, 'lords': lords,
+            'is_current': count == current_count
+        }
+
+        pool += step
+        waste += step
+        if not 0 <= waste < demon_hp:
+            waste %= demon_hp
+        if not (lords - 1) * lord_hp < pool <= lords * lord_hp:
+            lords = -(-pool // lord_hp)
+
+
+def _catalog_perfect_stack(unit_name: str, fa_level: int = 0, artifact_bonus: int = 0):
+    """The catalog unit's perfect stack from the precomputed index (None if it is not indexed)."""
+    return db.get_perfect_stack_index().get((unit_name, fa_level, artifact_bonus))
+
+
+def _calculate_chart_data(unit_hp, unit_count, pit_lord_count, window: int = 4, perfect_stack: tuple = None):
+    """
+    Builds the data list for the distribution chart: `window` rows on each side
+    of the current count, plus the nearest perfect stacks below and above.
+    `perfect_stack` comes from the perfect-stack index for catalog units.
+    """
     if unit_count < 0:
         unit_count = 0
         
-    results_current = src.core.calculate_demon_farm(unit_hp, unit_count, pit_lord_count)
+    results_current = calculate_demon_farm(unit_hp, unit_count, pit_lord_count, perfect_stack)
     min_perfect_stack = results_current['perfect_grind_units']
     current_waste = results_current['wasted_hp']
     
@@ -48,55 +79,23 @@ def _calculate_chart_data(unit_hp, unit_count, pit_lord_count):
         else:
             next_perfect_count = ((unit_count // min_perfect_stack) + 1) * min_perfect_stack
 
-    for offset in range(-4, 5): 
-        current_count = unit_count + offset
-        is_current = (offset == 0)
-        
-        if current_count < 0:
-            continue
-        
-        if is_current:
-            results = results_current
-        else:
-            results = src.core.calculate_demon_farm(unit_hp, current_count, pit_lord_count)
-        
-        demons_for_bar = results['max_demons_from_hp'] 
-        wasted = results['wasted_hp']
-        needed_lords = results['needed_pit_lords']
-        
-        chart_data_list.append({
-            'count': current_count, 'demons': demons_for_bar, 
-            'waste': wasted, 'lords': needed_lords, 
-            'is_current': is_current
-        })
+    first_count = max(unit_count - window, 0)
+    chart_data_list = list(_iter_chart_rows(unit_hp, first_count, unit_count + window, unit_count))
 
     if min_perfect_stack > 0:
-        first_item = chart_data_list[0]
-        if first_item['count'] > 0 and (first_item['waste'] > 0 or first_item['count'] > min_perfect_stack):
-            perfect_below_count = ((first_item['count'] - 1) // min_perfect_stack) * min_perfect_stack
+        first_count = chart_data_list[0]['count']
+        if first_count > 0 and (chart_data_list[0]['waste'] > 0 or first_count > min_perfect_stack):
+            perfect_below_count = ((first_count - 1) // min_perfect_stack) * min_perfect_stack
             
-            if perfect_below_count >= 0 and perfect_below_count < first_item['count']:
-                results = src.core.calculate_demon_farm(unit_hp, perfect_below_count, pit_lord_count)
-                chart_data_list.insert(0, {
-                    'count': perfect_below_count, 
-                    'demons': results['max_demons_from_hp'],
-                    'waste': results['wasted_hp'], 
-                    'lords': results['needed_pit_lords'], 
-                    'is_current': False,
-                    'is_special': True
-                })
-
-        last_item = chart_data_list[-1]
-        if next_perfect_count > last_item['count']:
-            results = src.core.calculate_demon_farm(unit_hp, next_perfect_count, pit_lord_count)
-            chart_data_list.append({
-                'count': next_perfect_count, 
-                'demons': results['max_demons_from_hp'],
-                'waste': results['wasted_hp'], 
-                'lords': results['needed_pit_lords'], 
-                'is_current': False,
-                'is_special': True
-            })
+            if 0 <= perfect_below_count < first_count:
+                row = next(_iter_chart_rows(unit_hp, perfect_below_count, perfect_below_count))
+                row['is_special'] = True
+                chart_data_list.insert(0, row)
+
+        if next_perfect_count > chart_data_list[-1]['count']:
+            row = next(_iter_chart_rows(unit_hp, next_perfect_count, next_perfect_count))
+            row['is_special'] = True
+            chart_data_list.append(row)
 
     return results_current, chart_data_list, next_perfect_count
 
@@ -153,20 +152,22 @@ def run_simple_calculator():
                     break 
 
                 unit_name, unit_hp, unit_gold_cost = unit_data
+                perfect_stack = _catalog_perfect_stack(unit_name)
                 
                 unit_count = inputs.get_int_input(f"Enter number of units (HP: {unit_hp}): ")
 
-                prelim_results = src.core.calculate_demon_farm(unit_hp, unit_count, 0)
+                prelim_results = calculate_demon_farm(unit_hp, unit_count, 0, perfect_stack)
                 needed_lords = prelim_results['needed_pit_lords']
                 
                 pit_lord_count = inputs.get_int_input(f"Enter number of Pit Lords (needed: {needed_lords}): ", default=str(needed_lords))
 
-                results_current, chart_data_list, next_p_count = _calculate_chart_data(unit_hp, unit_count, pit_lord_count)
+                results_current, chart_data_list, next_p_count = _calculate_chart_data(
+                    unit_hp, unit_count, pit_lord_count, perfect_stack=perfect_stack
+                )
                 
-                results_current["gold_cost"] = unit_gold_cost
-                results_current["game_mode_data"] = { "unit_name": unit_name }
+                context = views.ResultContext(gold_cost=unit_gold_cost, game_mode_data={ "unit_name": unit_name })
 
-                views.display_results(results_current)
+                views.display_results(results_current, context)
                 views.display_distribution_chart(chart_data_list, pit_lord_count, next_p_count, unit_count)
                 
                 console.print("\n... press Enter to calculate for another unit in this faction ...", style="dim")
@@ -176,16 +177,14 @@ def run_simple_calculator():
         unit_hp = inputs.get_float_input("Enter single unit HP: ")
         unit_count = inputs.get_int_input(f"Enter number of units (HP: {unit_hp}): ")
         
-        prelim_results = src.core.calculate_demon_farm(unit_hp, unit_count, 0)
+        prelim_results = calculate_demon_farm(unit_hp, unit_count, 0)
         needed_lords = prelim_results['needed_pit_lords']
         
         pit_lord_count = inputs.get_int_input(f"Enter number of Pit Lords (needed: {needed_lords}): ", default=str(needed_lords))
 
         results_current, chart_data_list, next_p_count = _calculate_chart_data(unit_hp, unit_count, pit_lord_count)
         
-        results_current["gold_cost"] = 0
-
-        views.display_results(results_current)
+        views.display_results(results_current, views.ResultContext(gold_cost=0))
         views.display_distribution_chart(chart_data_list, pit_lord_count, next_p_count, unit_count)
         
         console.print("\n... press Enter to return to the main menu ...", style="dim")
@@ -249,7 +248,7 @@ def run_reverse_calculator():
                 console.print(f"[red]Error: {unit_name} has 0 HP and cannot be sacrificed.[/red]")
                 continue
 
-            results = src.core.calculate_reverse_farm(target_demons, unit_hp, unit_gold_cost)
+            results = calculate_reverse_farm(target_demons, unit_hp, unit_gold_cost)
             
             views.display_reverse_results(results, unit_name)
             
@@ -257,6 +256,42 @@ def run_reverse_calculator():
             input()
 
 
+def run_sacrifice_planner():
+    """Runs the logic for the Sacrifice Planner."""
+    console.print(Panel("[bold]Sacrifice Planner[/bold]\n\nFind the cheapest mix of units (whole roster) that gives at least N demons with zero wasted HP.", border_style="cyan"))
+    
+    target_demons = inputs.get_int_input("Enter target number of demons: ")
+    if target_demons <= 0:
+        console.print("[red]Please enter a positive number.[/red]")
+        return
+
+    fa_level = inputs.get_int_input("Enter First Aid level (0-3):", default="0")
+    if fa_level not in [0, 1, 2, 3]:
+        console.print("[red]Error: First Aid level must be between 0 and 3.[/red]")
+        return
+
+    artifact_bonus = inputs.get_int_input("Enter total artifact HP bonus:", default="0")
+    pit_lord_count = inputs.get_int_input("Enter number of Pit Lords (0 = no limit):", default="0")
+
+    import src.planner as planner
+    plan = planner.plan_cheapest_sacrifice(
+        target_demons,
+        db.get_all_unit_details(),
+        fa_level=fa_level,
+        artifact_bonus=artifact_bonus,
+        pit_lord_count=pit_lord_count if pit_lord_count > 0 else None,
+        perfect_stacks=db.get_perfect_stack_index()
+    )
+
+    if "error" in plan:
+        console.print(f"[bold red]{plan['error']}[/bold red]")
+    else:
+        views.display_sacrifice_plan(plan)
+
+    console.print("\n... press Enter to return to the main menu ...", style="dim")
+    input()
+
+
 def _manage_artifacts(game_id: int):
     """Handles the multi-choice selection for game artifacts."""
     
@@ -284,33 +319,76 @@ def _manage_artifacts(game_id: int):
         return
 
     db.set_game_artifacts(game_id, selected_ids)
-    new_bonus = db.get_game_hp_bonus(game_id)
+    new_bonus = db.get_game_context(game_id).artifact_bonus
     console.print(f"\n[green]Artifacts saved! Current total HP bonus: [bold]+{new_bonus} HP[/bold][/green]")
     input("\n... press Enter to continue ...")
 
 
+GAME_PAGE_SIZE = 15
+
+def _pick_game(message: str, extra_choices: list, value_key: str):
+    """
+    Pages through the saved games (GAME_PAGE_SIZE at a time, keyset-paginated in SQL)
+    with optional name-prefix search. Only the visible page is ever loaded.
+    Returns the picked game's `value_key`, the value of one of `extra_choices`, or None.
+    """
+    name_prefix = ""
+    cursors = [None]  # keyset cursor of every page visited so far
+
+    while True:
+        page = db.get_games_page(name_prefix, cursors[-1], GAME_PAGE_SIZE + 1)
+        has_next = len(page) > GAME_PAGE_SIZE
+        page = page[:GAME_PAGE_SIZE]
+
+        heading = f"--- Games starting with '{name_prefix}' ---" if name_prefix else "--- Saved Games ---"
+        choices = [questionary.Separator(heading)]
+        choices += [
+            questionary.Choice(title=f"{game['name']} (created: {game['created_on']})", value=("game", game[value_key]))
+            for game in page
+        ]
+        if not page:
+            choices.append(questionary.Separator("  (no games found)"))
+
+        choices.append(questionary.Separator("--- Other Options ---"))
+        if has_next:
+            choices.append(questionary.Choice(title="[ Next page ]", value=("next", None)))
+        if len(cursors) > 1:
+            choices.append(questionary.Choice(title="[ Previous page ]", value=("previous", None)))
+        choices.append(questionary.Choice(title="[ Search by name ]", value=("search", None)))
+        if name_prefix:
+            choices.append(questionary.Choice(title="[ Clear search ]", value=("clear", None)))
+        choices += [questionary.Choice(title=title, value=("extra", value)) for title, value in extra_choices]
+
+        selected = questionary.select(message, choices=choices, use_shortcuts=True).ask()
+        if selected is None:
+            return None
+
+        action, value = selected
+        if action in ("game", "extra"):
+            return value
+        elif action == "next":
+            cursors.append((page[-1]['name'], page[-1]['game_id']))
+        elif action == "previous":
+            cursors.pop()
+        elif action in ("search", "clear"):
+            name_prefix = inputs.get_string_input("Name starts with:") if action == "search" else ""
+            cursors = [None]
+
+
 def _delete_game_prompt():
     """Shows a prompt to select and delete a game."""
     console.print(Panel("[bold red]Delete Game[/bold red]", border_style="red"))
     
-    existing_games = db.get_all_games()
-    
-    if not existing_games:
+    if not db.get_games_page(limit=1):
         console.print("[yellow]No games found to delete.[/yellow]")
         input("\n... press Enter to continue ...")
         return
 
-    game_choices = [
-        questionary.Choice(title=f"{game['name']} (created: {game['created_at'].strftime('%Y-%m-%d')})", value=game['game_id'])
-        for game in existing_games
-    ]
-    game_choices.append(questionary.Separator())
-    game_choices.append(questionary.Choice(title="[ CANCEL ]", value=0))
-
-    game_id_to_delete = questionary.select(
+    game_id_to_delete = _pick_game(
         "Which game do you want to delete? (This cannot be undone!)",
-        choices=game_choices
-    ).ask()
+        [("[ CANCEL ]", 0)],
+        value_key='game_id'
+    )
 
     if game_id_to_delete is None or game_id_to_delete == 0:
         console.print("[green]Deletion cancelled.[/green]")
@@ -335,34 +413,15 @@ def run_game_mode():
     
     console.print(Panel("[bold]Game Mode[/bold]\n\nSelect a game to load or create a new one.", border_style="cyan"))
     
-    existing_games = db.get_all_games()
-    
-    game_choices = [
-        questionary.Choice(title=f"{game['name']} (created: {game['created_at'].strftime('%Y-%m-%d')})", value=game['name'])
-        for game in existing_games
-    ]
-    
-    choices = [
-        questionary.Separator("--- Load Existing Game ---"),
-        *game_choices,
-        questionary.Separator("--- Other Options ---"),
-        questionary.Choice(title="[ CREATE NEW GAME ]", value="--new--"),
-        questionary.Choice(title="[ DELETE A GAME ]", value="--delete--"),
-        questionary.Choice(title="[ Back to Main Menu ]", value="--back--")
-    ]
-    
-    if not existing_games:
-        choices = [
-            questionary.Choice(title="[ CREATE NEW GAME ]", value="--new--"),
-            questionary.Choice(title="[ DELETE A GAME ]", value="--delete--"),
-            questionary.Choice(title="[ Back to Main Menu ]", value="--back--")
-        ]
-
-    selected_choice = questionary.select(
+    selected_choice = _pick_game(
         "Select a game or create a new one:",
-        choices=choices,
-        use_shortcuts=True
-    ).ask()
+        [
+            ("[ CREATE NEW GAME ]", "--new--"),
+            ("[ DELETE A GAME ]", "--delete--"),
+            ("[ Back to Main Menu ]", "--back--"),
+        ],
+        value_key='name'
+    )
     
     game_name = ""
     
@@ -379,13 +438,13 @@ def run_game_mode():
     else:
         game_name = selected_choice
 
-    game_data = db.get_or_create_game(game_name)
-    game_id = game_data['game_id']
+    game_id = db.get_or_create_game(game_name)['game_id']
+    game = db.get_game_context(game_id)
     
     console.print(f"[green]Loaded game: '{game_name}'[/green]")
     
     while True:
-        console.rule(f"[bold cyan]Game Mode: {game_name}[/bold cyan] | Pit Lords: {game_data['pit_lord_count']} | First Aid Lvl: {game_data['first_aid_level']}")
+        console.rule(f"[bold cyan]Game Mode: {game_name}[/bold cyan] | Pit Lords: {game.pit_lord_count} | First Aid Lvl: {game.first_aid_level}")
         
         choice = questionary.select(
             "Select action:",
@@ -395,6 +454,7 @@ def run_game_mode():
                 questionary.Choice("Set First Aid Level", '3'),
                 questionary.Choice("Manage HP Artifacts", '4'),
                 questionary.Choice("View Game Summary", '5S'),
+                questionary.Choice("View Session Analytics", '6A'),
                 questionary.Separator(),
                 questionary.Choice("Back to Main Menu", '0')
             ]
@@ -404,46 +464,53 @@ def run_game_mode():
             return
         
         elif choice == '1':
-            run_game_calculator_loop(game_data)
+            run_game_calculator_loop(game)
         
         elif choice == '2':
-            console.print(f"Current Pit Lord count: {game_data['pit_lord_count']}")
-            new_lords = inputs.get_int_input("Enter new Pit Lord count:", default=str(game_data['pit_lord_count']))
+            console.print(f"Current Pit Lord count: {game.pit_lord_count}")
+            new_lords = inputs.get_int_input("Enter new Pit Lord count:", default=str(game.pit_lord_count))
             
-            db.update_game_stats(game_id, new_lords, game_data['first_aid_level'])
-            game_data['pit_lord_count'] = new_lords
+            db.update_game_stats(game_id, new_lords, game.first_aid_level)
+            game = db.get_game_context(game_id)
             
             console.print("[green]Game settings saved.[/green]")
             input("\n... press Enter to continue ...")
 
         elif choice == '3':
-            console.print(f"Current First Aid level: {game_data['first_aid_level']} (0=None, 1=Basic, 2=Adv, 3=Exp)")
-            new_fa = inputs.get_int_input("Enter new First Aid level (0-3):", default=str(game_data['first_aid_level']))
+            console.print(f"Current First Aid level: {game.first_aid_level} (0=None, 1=Basic, 2=Adv, 3=Exp)")
+            new_fa = inputs.get_int_input("Enter new First Aid level (0-3):", default=str(game.first_aid_level))
             
             if new_fa not in [0, 1, 2, 3]:
                 console.print("[red]Error: First Aid level must be between 0 and 3.[/red]")
             else:
-                db.update_game_stats(game_id, game_data['pit_lord_count'], new_fa)
-                game_data['first_aid_level'] = new_fa
+                db.update_game_stats(game_id, game.pit_lord_count, new_fa)
+                game = db.get_game_context(game_id)
                 console.print("[green]Game settings saved.[/green]")
             
             input("\n... press Enter to continue ...")
 
         elif choice == '4':
             _manage_artifacts(game_id)
+            game = db.get_game_context(game_id)
 
         elif choice == '5S':
             summary_data = db.get_game_log_summary(game_id)
             views.display_game_summary(game_name, summary_data)
             input("\n... press Enter to continue ...")
 
+        elif choice == '6A':
+            import src.analytics as analytics
+            sessions, totals = analytics.game_analytics(game_id)
+            views.display_game_analytics(game_name, sessions, totals)
+            input("\n... press Enter to continue ...")
+
 
-def run_game_calculator_loop(game_data: dict):
+def run_game_calculator_loop(game: src.core.GameContext):
     """The calculator loop used within Game Mode."""
     
-    game_id = game_data['game_id']
-    default_pit_lord_count = game_data['pit_lord_count']
-    fa_level = game_data['first_aid_level']
+    game_id = game.game_id
+    default_pit_lord_count = game.pit_lord_count
+    fa_level = game.first_aid_level
     
     if default_pit_lord_count == 0:
         console.print("[bold yellow]Warning: Default Pit Lord count for this game is 0.[/bold yellow]")
@@ -501,11 +568,12 @@ def run_game_calculator_loop(game_data: dict):
 
                 unit_name, base_hp, unit_gold_cost = unit_data
                 
-                modified_hp, artifact_bonus = _get_modified_hp(base_hp, game_id, fa_level)
+                modified_hp, artifact_bonus = _get_modified_hp(base_hp, game)
+                perfect_stack = _catalog_perfect_stack(unit_name, fa_level, artifact_bonus)
                 
                 unit_count = inputs.get_int_input(f"Number of units ({unit_name} | Base HP: {base_hp} -> Mod: {modified_hp:.2f}): ")
 
-                prelim_results_db = src.core.calculate_demon_farm(modified_hp, unit_count, 0)
+                prelim_results_db = calculate_demon_farm(modified_hp, unit_count, 0, perfect_stack)
                 needed_lords_db = prelim_results_db['needed_pit_lords']
 
                 current_pit_lords = inputs.get_int_input(
@@ -515,7 +583,9 @@ def run_game_calculator_loop(game_data: dict):
                 
                 default_pit_lord_count = current_pit_lords 
 
-                results_current, chart_data_list, next_p_count = _calculate_chart_data(modified_hp, unit_count, current_pit_lords)
+                results_current, chart_data_list, next_p_count = _calculate_chart_data(
+                    modified_hp, unit_count, current_pit_lords, perfect_stack=perfect_stack
+                )
 
                 game_mode_info = {
                     "unit_name": unit_name,
@@ -523,11 +593,11 @@ def run_game_calculator_loop(game_data: dict):
                     "art_bonus": artifact_bonus,
                     "fa_level": fa_level
                 }
-                results_current["pit_lord_count"] = current_pit_lords
-                results_current["gold_cost"] = unit_gold_cost
-                results_current["game_mode_data"] = game_mode_info
+                context = views.ResultContext(
+                    gold_cost=unit_gold_cost, pit_lord_count=current_pit_lords, game_mode_data=game_mode_info
+                )
 
-                views.display_results(results_current)
+                views.display_results(results_current, context)
                 views.display_distribution_chart(chart_data_list, current_pit_lords, next_p_count, unit_count)
                 
                 db.log_calculation(
@@ -549,11 +619,11 @@ def run_game_calculator_loop(game_data: dict):
         base_hp = inputs.get_float_input("Enter single unit Base HP: ")
         unit_name = f"Custom Unit ({base_hp} HP)"
         
-        modified_hp, artifact_bonus = _get_modified_hp(base_hp, game_id, fa_level)
+        modified_hp, artifact_bonus = _get_modified_hp(base_hp, game)
         
         unit_count = inputs.get_int_input(f"Number of units ({unit_name} | Base HP: {base_hp} -> Mod: {modified_hp:.2f}): ")
 
-        prelim_results_manual = src.core.calculate_demon_farm(modified_hp, unit_count, 0)
+        prelim_results_manual = calculate_demon_farm(modified_hp, unit_count, 0)
         needed_lords_manual = prelim_results_manual['needed_pit_lords']
 
         current_pit_lords = inputs.get_int_input(
@@ -571,11 +641,9 @@ def run_game_calculator_loop(game_data: dict):
             "art_bonus": artifact_bonus,
             "fa_level": fa_level
         }
-        results_current["pit_lord_count"] = current_pit_lords
-        results_current["gold_cost"] = 0
-        results_current["game_mode_data"] = game_mode_info
+        context = views.ResultContext(gold_cost=0, pit_lord_count=current_pit_lords, game_mode_data=game_mode_info)
 
-        views.display_results(results_current)
+        views.display_results(results_current, context)
         views.display_distribution_chart(chart_data_list, current_pit_lords, next_p_count, unit_count)
         
         db.log_calculation(
@@ -608,6 +676,7 @@ def start_app():
                 questionary.Choice("Simple Calculator", '1'),
                 questionary.Choice("Game Mode (Load/Create)", '2'),
                 questionary.Choice("Reverse Calculator (Demons -> Units)", '3'),
+                questionary.Choice("Sacrifice Planner (Cheapest Units -> Demons)", '4'),
                 questionary.Separator(),
                 questionary.Choice("Exit", '0')
             ],
@@ -620,6 +689,8 @@ def start_app():
             run_game_mode()
         elif choice == '3':
             run_reverse_calculator()
+        elif choice == '4':
+            run_sacrifice_planner()
         elif choice == '0' or choice is None:
             console.print("[bold cyan]Goodbye![/bold cyan]")
             sys.exit(0)
@@ -7,10 +7,21 @@ DB_FILE_NAME = "demonic_calc.db"
 DB_FILE_PATH = BASE_DIR / DB_FILE_NAME
 DB_CONNECTION_STRING = f"sqlite:///{DB_FILE_PATH}"
 
+# Precomputed farm/reverse lookup table, built with `python main.py build-lut`.
+LUT_FILE_PATH = BASE_DIR / "demon_lut.npy"
+LUT_MAX_COUNT = 5000
+LUT_MAX_DEMONS = 1000
+
+# Entries kept by the memoized calculators in src/cli.py.
+CALC_CACHE_SIZE = 512
+
 DEMON_HP = 35
 PIT_LORD_GRIND_RATE = 50
 DEMON_GOLD_COST = 250
 
+# HP is computed as an exact integer number of hundredths (fixed-point).
+HP_SCALE = 100
+
 FACTION_COLORS = {
     "Zamek": "bold white",
     "Bastion": "bold green",
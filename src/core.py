@@ -1,77 +1,386 @@
+import inspect
 import math
-from src.config import DEMON_HP, PIT_LORD_GRIND_RATE
+import threading
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass
+from functools import wraps
+from itertools import combinations
+from src.config import DEMON_HP, PIT_LORD_GRIND_RATE, HP_SCALE
 
-def calculate_demon_farm(unit_hp: float, unit_count: int, pit_lord_count: int) -> dict:
+FIRST_AID_LEVELS = (0, 1, 2, 3)
+
+DEMON_HP_HUNDREDTHS = DEMON_HP * HP_SCALE
+PIT_LORD_GRIND_RATE_HUNDREDTHS = PIT_LORD_GRIND_RATE * HP_SCALE
+
+class ResultMapping:
     """
-    Performs all calculations for demon farming based on provided inputs.
+    Dict-style access for result objects, so code written against the old result
+    dicts (results['wasted_hp'], results.get(...), iterating keys, dict(results))
+    keeps working. Results are frozen, so memoize() can share them safely.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__dataclass_fields__
+
+    def __iter__(self):
+        return iter(self.__dataclass_fields__)
+
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__dataclass_fields__ else default
+
+    def keys(self) -> tuple:
+        return tuple(self.__dataclass_fields__)
+
+    def values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__dataclass_fields__)
+
+    def items(self) -> tuple:
+        return tuple((name, getattr(self, name)) for name in self.__dataclass_fields__)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__dataclass_fields__}
+
+@dataclass(frozen=True, slots=True)
+class FarmResult(ResultMapping):
+    """Result of calculate_demon_farm."""
+    unit_hp: float
+    unit_count: int
+    pit_lord_count: int
+    total_hp_pool: float
+    max_demons_from_hp: float
+    max_demons_from_lords: float
+    actual_demons_gained: float
+    needed_pit_lords: int
+    wasted_hp: float
+    perfect_grind_units: int
+    perfect_grind_hp: float
+    perfect_grind_lords: int
+
+@dataclass(frozen=True, slots=True)
+class ReverseResult(ResultMapping):
+    """Result of calculate_reverse_farm."""
+    target_demons: int
+    unit_hp: float
+    unit_gold_cost: int
+    needed_units: int
+    needed_pit_lords: int
+    actual_hp_pool: float
+    actual_demons_yield: float
+    wasted_hp: float
+    total_gold_cost: int
+    gold_per_demon: float
+
+def to_hundredths(hp: float) -> int:
+    """
+    Converts HP to an exact integer number of hundredths, rounding anything finer.
+    Raises ValueError/OverflowError for NaN or infinite HP.
+    """
+    return round(hp * HP_SCALE)
+
+def modified_hp_hundredths(base_hp: float, artifact_bonus: int, fa_level: int) -> int:
+    """
+    Returns the HP of a unit after artifact and First Aid bonuses, in hundredths.
+    Exact for base HP with up to one decimal place (First Aid adds 10% per level);
+    finer base HP is rounded half up.
+    """
+    boosted = (to_hundredths(base_hp) + artifact_bonus * HP_SCALE) * (10 + fa_level)
+    return (boosted + 5) // 10
+
+def modified_hp(base_hp: float, artifact_bonus: int, fa_level: int) -> float:
+    """Returns the HP of a unit after artifact and First Aid bonuses."""
+    return modified_hp_hundredths(base_hp, artifact_bonus, fa_level) / HP_SCALE
+
+@dataclass(frozen=True, slots=True)
+class GameContext:
+    """A game's HP modifiers, loaded once per game so each calculation needs no queries."""
+    game_id: int
+    pit_lord_count: int
+    first_aid_level: int
+    artifact_bonus: int
+
+    def modified_hp(self, base_hp: float) -> float:
+        """Returns the HP of a unit in this game after artifact and First Aid bonuses."""
+        return modified_hp(base_hp, self.artifact_bonus, self.first_aid_level)
+
+def modified_hp_batch(base_hp, artifact_bonus, fa_level):
+    """Vectorized modified_hp for NumPy arrays, computed in integer hundredths."""
+    import numpy as np
+
+    base_hundredths = np.rint(np.asarray(base_hp, dtype=np.float64) * HP_SCALE).astype(np.int64)
+    boosted = (base_hundredths + np.asarray(artifact_bonus, dtype=np.int64) * HP_SCALE) * (10 + np.asarray(fa_level, dtype=np.int64))
+    return ((boosted + 5) // 10) / HP_SCALE
+
+def perfect_stack_hundredths(hp_hundredths: int) -> tuple:
+    """
+    Finds the smallest stack whose HP pool is an exact multiple of DEMON_HP.
     
     Returns:
-        A dictionary containing all calculated results.
+        (units, hp_hundredths, pit_lords) for the perfect stack.
     """
+    units = DEMON_HP_HUNDREDTHS // math.gcd(hp_hundredths, DEMON_HP_HUNDREDTHS)
+    pool = units * hp_hundredths
+    return units, pool, -(-pool // PIT_LORD_GRIND_RATE_HUNDREDTHS)
+
+MemoInfo = namedtuple("MemoInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+def _detached(result):
+    return dict(result) if isinstance(result, dict) else result
+
+def memoize(maxsize: int = 256, hp_arg: str = "unit_hp"):
+    """
+    Opt-in LRU memoization for the calculate_* functions.
     
-    total_hp_pool = unit_count * unit_hp
+    The `hp_arg` argument is keyed by its value in hundredths, so float noise in the
+    HP does not split cache entries; NaN/infinite HP is never cached.
+    FarmResult/ReverseResult objects are frozen, so one instance is shared by every
+    hit; plain dict results (such as {"error": ...}) are copied on every call.
     
-    max_demons_from_hp = total_hp_pool / DEMON_HP
+    The wrapper exposes cache_info() -> MemoInfo and cache_clear(), like functools.lru_cache.
+    """
+    def decorator(func):
+        hp_index = list(inspect.signature(func).parameters).index(hp_arg)
+        cache = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if kwargs or len(args) <= hp_index:
+                return func(*args, **kwargs)
+            try:
+                key = args[:hp_index] + (to_hundredths(args[hp_index]),) + args[hp_index + 1:]
+            except (ValueError, OverflowError, TypeError):
+                key = None
+            if key is None:
+                return func(*args)
+
+            with lock:
+                result = cache.get(key)
+                if result is not None:
+                    cache.move_to_end(key)
+                    stats["hits"] += 1
+                    return _detached(result)
+                stats["misses"] += 1
+
+            result = func(*args)
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+                    stats["evictions"] += 1
+            return _detached(result)
+
+        def cache_info() -> MemoInfo:
+            with lock:
+                return MemoInfo(stats["hits"], stats["misses"], stats["evictions"], maxsize, len(cache))
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+                stats.update(hits=0, misses=0, evictions=0)
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+def artifact_bonus_combinations(artifact_bonuses: list) -> list:
+    """Returns every distinct total HP bonus reachable with a subset of the artifacts."""
+    totals = {0}
+    for size in range(1, len(artifact_bonuses) + 1):
+        for subset in combinations(artifact_bonuses, size):
+            totals.add(sum(subset))
+    return sorted(totals)
+
+def build_perfect_stack_index(units: list, artifact_bonuses: list) -> dict:
+    """
+    Precomputes the perfect stack for every unit, First Aid level
+    and artifact bonus combination.
+    
+    Args:
+        units: (unit_name, base_hp) pairs, e.g. from db.get_all_units().
+        artifact_bonuses: hp_bonus of every available artifact.
+    
+    Returns:
+        {(unit_name, fa_level, artifact_bonus): (units, hp_hundredths, pit_lords)}
+    """
+    index = {}
+    by_hp = {}
+    bonus_totals = artifact_bonus_combinations(artifact_bonuses)
+    for unit_name, base_hp in units:
+        for fa_level in FIRST_AID_LEVELS:
+            for bonus in bonus_totals:
+                hp_hundredths = modified_hp_hundredths(base_hp, bonus, fa_level)
+                stack = by_hp.get(hp_hundredths)
+                if stack is None:
+                    stack = by_hp[hp_hundredths] = perfect_stack_hundredths(hp_hundredths)
+                index[(unit_name, fa_level, bonus)] = stack
+    return index
+
+def lookup_perfect_stack(index: dict, unit_name: str, base_hp: float, fa_level: int, artifact_bonus: int) -> tuple:
+    """
+    Returns (units, hp_hundredths, pit_lords) from a build_perfect_stack_index() index,
+    computing it only for units or bonuses the index does not cover.
+    """
+    stack = index.get((unit_name, fa_level, artifact_bonus)) if index else None
+    if stack is None:
+        stack = perfect_stack_hundredths(modified_hp_hundredths(base_hp, artifact_bonus, fa_level))
+    return stack
+
+def calculate_demon_farm(unit_hp: float, unit_count: int, pit_lord_count: int, perfect_stack: tuple = None) -> FarmResult:
+    """
+    Performs all calculations for demon farming based on provided inputs.
+    HP is handled as exact integer hundredths, so waste and perfect stacks carry no float noise.
+    
+    Args:
+        perfect_stack: the unit's (units, hp_hundredths, pit_lords) from the perfect-stack
+            index; computed from unit_hp when omitted.
+    
+    Returns:
+        A FarmResult with all calculated results.
+    """
+    hp_hundredths = to_hundredths(unit_hp)
+    pool = unit_count * hp_hundredths
+
+    max_demons_from_hp = pool / DEMON_HP_HUNDREDTHS
     max_demons_from_lords = (pit_lord_count * PIT_LORD_GRIND_RATE) / DEMON_HP
     
     actual_demons_gained = min(max_demons_from_hp, max_demons_from_lords)
     
-    needed_pit_lords = math.ceil(total_hp_pool / PIT_LORD_GRIND_RATE)
-    wasted_hp = total_hp_pool % DEMON_HP
+    needed_pit_lords = -(-pool // PIT_LORD_GRIND_RATE_HUNDREDTHS)
     
+    if perfect_stack is None:
+        perfect_stack = perfect_stack_hundredths(hp_hundredths)
+    units_for_perfect_grind, hp_for_perfect_grind, lords_for_perfect_grind = perfect_stack
+
+    return FarmResult(
+        hp_hundredths / HP_SCALE,  # unit_hp
+        unit_count,
+        pit_lord_count,
+        pool / HP_SCALE,  # total_hp_pool
+        max_demons_from_hp,
+        max_demons_from_lords,
+        actual_demons_gained,
+        needed_pit_lords,
+        (pool % DEMON_HP_HUNDREDTHS) / HP_SCALE,  # wasted_hp
+        units_for_perfect_grind,  # perfect_grind_units
+        hp_for_perfect_grind / HP_SCALE,  # perfect_grind_hp
+        lords_for_perfect_grind,  # perfect_grind_lords
+    )
+
+def _exact_ratio(np, numerator, divisor: int):
+    """
+    numerator / divisor for int64 arrays, rounded like Python's int / int. Up to 2**53
+    the int64 -> float64 conversion is exact; above it, float(numerator) / divisor would
+    round twice, so those (rare) elements are divided as Python ints.
+    """
+    ratio = numerator / divisor
+    huge = np.abs(numerator) > 2**53
+    if huge.any():
+        ratio[huge] = [value / divisor for value in numerator[huge].tolist()]
+    return ratio
+
+def calculate_demon_farm_batch(unit_hp, unit_count, pit_lord_count, perfect_stack: tuple = None) -> dict:
+    """
+    Vectorized version of calculate_demon_farm for whole scenario grids.
+    
+    Accepts scalars or NumPy arrays (broadcast against each other) and
+    returns a struct-of-arrays dict with the same keys as FarmResult.
+    `perfect_stack` optionally gives per-row (units, hp_hundredths, pit_lords)
+    arrays from the perfect-stack index instead of computing them.
+    """
+    import numpy as np
+
+    # Unlike the scalar version, int64 arithmetic wraps around silently, so reject
+    # anything whose HP pool or Pit Lord capacity would not fit.
     try:
-        gcd = math.gcd(int(unit_hp), DEMON_HP)
-        units_for_perfect_grind = int(DEMON_HP / gcd)
-        hp_for_perfect_grind = units_for_perfect_grind * unit_hp
-        lords_for_perfect_grind = math.ceil(hp_for_perfect_grind / PIT_LORD_GRIND_RATE)
-    except ValueError:
-        units_for_perfect_grind = 0
-        hp_for_perfect_grind = 0
-        lords_for_perfect_grind = 0
+        unit_hp, unit_count, pit_lord_count = np.broadcast_arrays(
+            np.asarray(unit_hp, dtype=np.float64),
+            np.asarray(unit_count, dtype=np.int64),
+            np.asarray(pit_lord_count, dtype=np.int64),
+        )
+    except OverflowError as exc:
+        raise ValueError("unit_count and pit_lord_count must fit in int64") from exc
+    limit = np.iinfo(np.int64).max
+    if not np.all(np.abs(unit_hp) * HP_SCALE < limit):
+        raise ValueError("unit_hp must be finite and fit in int64 hundredths")
+    hp_hundredths = np.rint(unit_hp * HP_SCALE).astype(np.int64)
+    if np.any(np.abs(unit_count) > limit // np.maximum(np.abs(hp_hundredths), 1)):
+        raise ValueError("unit_count * unit_hp overflows int64")
+    if np.any(np.abs(pit_lord_count) > limit // PIT_LORD_GRIND_RATE):
+        raise ValueError("pit_lord_count overflows int64")
+    pool = unit_count * hp_hundredths
+
+    max_demons_from_hp = _exact_ratio(np, pool, DEMON_HP_HUNDREDTHS)
+    max_demons_from_lords = (pit_lord_count * PIT_LORD_GRIND_RATE) / DEMON_HP
+    
+    actual_demons_gained = np.minimum(max_demons_from_hp, max_demons_from_lords)
+    
+    needed_pit_lords = -(-pool // PIT_LORD_GRIND_RATE_HUNDREDTHS)
+    
+    if perfect_stack is None:
+        units_for_perfect_grind = DEMON_HP_HUNDREDTHS // np.gcd(hp_hundredths, DEMON_HP_HUNDREDTHS)
+        perfect_pool = units_for_perfect_grind * hp_hundredths
+        perfect_lords = -(-perfect_pool // PIT_LORD_GRIND_RATE_HUNDREDTHS)
+    else:
+        units_for_perfect_grind, perfect_pool, perfect_lords = (np.asarray(column, dtype=np.int64) for column in perfect_stack)
 
     return {
-        "unit_hp": unit_hp,
+        "unit_hp": hp_hundredths / HP_SCALE,
         "unit_count": unit_count,
         "pit_lord_count": pit_lord_count,
-        "total_hp_pool": total_hp_pool,
+        "total_hp_pool": _exact_ratio(np, pool, HP_SCALE),
         "max_demons_from_hp": max_demons_from_hp,
         "max_demons_from_lords": max_demons_from_lords,
         "actual_demons_gained": actual_demons_gained,
         "needed_pit_lords": needed_pit_lords,
-        "wasted_hp": wasted_hp,
+        "wasted_hp": (pool % DEMON_HP_HUNDREDTHS) / HP_SCALE,
         "perfect_grind_units": units_for_perfect_grind,
-        "perfect_grind_hp": hp_for_perfect_grind,
-        "perfect_grind_lords": lords_for_perfect_grind,
+        "perfect_grind_hp": perfect_pool / HP_SCALE,
+        "perfect_grind_lords": perfect_lords,
     }
 
-def calculate_reverse_farm(target_demons: int, unit_hp: float, unit_gold_cost: int) -> dict:
+def calculate_reverse_farm(target_demons: int, unit_hp: float, unit_gold_cost: int):
     """
     Calculates the number of units needed to produce a target number of demons.
+    Returns a ReverseResult, or {"error": ...} for invalid HP.
     """
-    if unit_hp <= 0:
+    try:
+        hp_hundredths = to_hundredths(unit_hp)
+    except (ValueError, OverflowError):
+        return { "error": "Unit HP must be a finite number." }
+    if hp_hundredths <= 0:
         return { "error": "Unit HP must be positive." }
 
-    needed_total_hp = target_demons * DEMON_HP
-    
-    needed_units = math.ceil(needed_total_hp / unit_hp)
+    needed_units = -(-(target_demons * DEMON_HP_HUNDREDTHS) // hp_hundredths)
     
-    actual_hp_pool = needed_units * unit_hp
-    actual_demons_yield = actual_hp_pool / DEMON_HP
-    needed_pit_lords = math.ceil(actual_hp_pool / PIT_LORD_GRIND_RATE)
-    wasted_hp = actual_hp_pool % DEMON_HP
+    pool = needed_units * hp_hundredths
+    actual_hp_pool = pool / HP_SCALE
+    actual_demons_yield = pool / DEMON_HP_HUNDREDTHS
+    needed_pit_lords = -(-pool // PIT_LORD_GRIND_RATE_HUNDREDTHS)
+    wasted_hp = (pool % DEMON_HP_HUNDREDTHS) / HP_SCALE
     
     total_gold_cost = needed_units * unit_gold_cost if unit_gold_cost > 0 else 0
     gold_per_demon = total_gold_cost / actual_demons_yield if actual_demons_yield > 0 and total_gold_cost > 0 else 0
     
-    return {
-        "target_demons": target_demons,
-        "unit_hp": unit_hp,
-        "unit_gold_cost": unit_gold_cost,
-        "needed_units": needed_units,
-        "needed_pit_lords": needed_pit_lords,
-        "actual_hp_pool": actual_hp_pool,
-        "actual_demons_yield": actual_demons_yield,
-        "wasted_hp": wasted_hp,
-        "total_gold_cost": total_gold_cost,
-        "gold_per_demon": gold_per_demon
-    }
\ No newline at end of file
+    return ReverseResult(
+        target_demons,
+        hp_hundredths / HP_SCALE,  # unit_hp
+        unit_gold_cost,
+        needed_units,
+        needed_pit_lords,
+        actual_hp_pool,
+        actual_demons_yield,
+        wasted_hp,
+        total_gold_cost,
+        gold_per_demon,
+    )
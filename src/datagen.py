@@ -0,0 +1,177 @@
+"""
+Synthetic large-database generator for load testing.
+
+Builds a SQLite file with the exact schema of src/db.py (it runs
+db.initialize_database on the new file) and fills it with reproducible
+random data: games, their artifacts and calculation_logs rows whose
+demons/waste come from the vectorized core, like real logs.
+
+For speed, the load runs with bulk-load pragmas (synchronous=OFF, a big
+cache) and plain executemany batches inside one transaction. The
+game_unit_totals triggers and secondary indexes are dropped during the load.
+Afterwards they are recreated and the totals are rebuilt in one pass.
+"""
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+import src.core
+import src.db as db
+
+BULK_LOAD_PRAGMAS = (
+    "PRAGMA synchronous=OFF",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_INDEX_NAME = re.compile(r"CREATE\s+INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+_TRIGGER_NAME = re.compile(r"CREATE\s+TRIGGER\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+_EPOCH = np.datetime64("2024-01-01T00:00:00", "us")
+
+
+def _secondary_indexes() -> list:
+    """(name, CREATE statement) for every index added by a migration."""
+    return [
+        (_INDEX_NAME.search(statement).group(1), statement)
+        for _, statements in db.MIGRATIONS for statement in statements
+        if _INDEX_NAME.search(statement)
+    ]
+
+
+def _timestamps(microseconds: np.ndarray) -> list:
+    """Formats offsets from _EPOCH the way sqlite3 stores datetime values ('YYYY-MM-DD HH:MM:SS.ffffff')."""
+    stamps = (_EPOCH + microseconds.astype("timedelta64[us]")).astype(str)
+    return np.char.replace(stamps, "T", " ").tolist()
+
+
+def _insert_games(con, rng, games: int) -> tuple:
+    """Inserts the games; returns (game_ids, created_at offsets, pit_lords, first_aid)."""
+    first_id = (con.exec_driver_sql("SELECT COALESCE(MAX(game_id), 0) FROM games").scalar() or 0) + 1
+    game_ids = np.arange(first_id, first_id + games)
+    created = np.sort(rng.integers(0, 730 * 86_400, games)) * 1_000_000
+    pit_lords = rng.integers(0, 61, games)
+    first_aid = rng.integers(0, len(src.core.FIRST_AID_LEVELS), games)
+    con.exec_driver_sql(
+        "INSERT INTO games (game_id, name, created_at, pit_lord_count, first_aid_level) VALUES (?, ?, ?, ?, ?)",
+        list(zip(
+            game_ids.tolist(), [f"Load Test {i:06d}" for i in game_ids.tolist()],
+            _timestamps(created), pit_lords.tolist(), first_aid.tolist()
+        ))
+    )
+    return game_ids, created, pit_lords, first_aid
+
+
+def _insert_game_artifacts(con, rng, game_ids: np.ndarray, max_artifacts: int) -> np.ndarray:
+    """Links each game to a random subset of artifacts; returns each game's total HP bonus."""
+    artifacts = db.get_all_artifacts()
+    artifact_ids = np.array([art["artifact_id"] for art in artifacts])
+    hp_bonus = np.array([art["hp_bonus"] for art in artifacts])
+    sizes = rng.integers(0, min(max_artifacts, len(artifacts)) + 1, len(game_ids))
+
+    # One random permutation of the artifact list per game; take its first `size` entries.
+    order = np.argsort(rng.random((len(game_ids), len(artifacts))), axis=1)
+    chosen = np.arange(len(artifacts)) < sizes[:, None]
+    rows, columns = np.nonzero(chosen)
+    picked = order[rows, columns]
+
+    con.exec_driver_sql(
+        "INSERT INTO game_artifacts (game_id_fk, artifact_id_fk) VALUES (?, ?)",
+        list(zip(game_ids[rows].tolist(), artifact_ids[picked].tolist()))
+    )
+    totals = np.zeros(len(game_ids), dtype=np.int64)
+    np.add.at(totals, rows, hp_bonus[picked])
+    return totals
+
+
+def _insert_logs(con, rng, games: tuple, art_bonus: np.ndarray, logs: int, chunk_size: int):
+    """Inserts `logs` calculation_logs rows in executemany batches of chunk_size."""
+    game_ids, created, pit_lords, first_aid = games
+    units = db.get_all_units()
+    unit_names = np.array([name for name, _ in units], dtype=object)
+    unit_hp = np.array([hp for _, hp in units], dtype=np.float64)
+
+    for offset in range(0, logs, chunk_size):
+        size = min(chunk_size, logs - offset)
+        game = rng.integers(0, len(game_ids), size)
+        unit = rng.integers(0, len(units), size)
+        counts = np.maximum(1, rng.lognormal(4.5, 1.2, size).astype(np.int64))
+        lords = pit_lords[game] + rng.integers(-5, 6, size).clip(-pit_lords[game])
+        when = created[game] + rng.integers(0, 90 * 86_400 * 1_000_000, size)
+
+        modified_hp = src.core.modified_hp_batch(unit_hp[unit], art_bonus[game], first_aid[game])
+        results = src.core.calculate_demon_farm_batch(modified_hp, counts, lords)
+
+        con.exec_driver_sql(
+            """
+            INSERT INTO calculation_logs (
+                game_id_fk, timestamp, unit_name, unit_hp_base, unit_hp_modified,
+                unit_count_input, pit_lord_input, demons_gained, wasted_hp
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            list(zip(
+                game_ids[game].tolist(), _timestamps(when), unit_names[unit].tolist(),
+                unit_hp[unit].tolist(), results["unit_hp"].tolist(), counts.tolist(), lords.tolist(),
+                results["actual_demons_gained"].tolist(), results["wasted_hp"].tolist()
+            ))
+        )
+
+
+def generate_database(out, games: int = 5_000, logs: int = 1_000_000, max_artifacts: int = 4,
+                      seed: int = 0, chunk_size: int = 100_000, overwrite: bool = False) -> dict:
+    """
+    Writes a synthetic database to `out`.
+
+    Returns:
+        {"games", "game_artifacts", "logs", "seconds"} for the generated file.
+    """
+    out = Path(out)
+    if out.exists():
+        if not overwrite:
+            raise FileExistsError(f"{out} already exists")
+        for path in (out, Path(f"{out}-wal"), Path(f"{out}-shm")):
+            path.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    rng = np.random.default_rng(seed)
+    previous_database = db.get_engine().url.render_as_string(hide_password=False)
+    db.configure_database(f"sqlite:///{out}")
+    try:
+        db.initialize_database()
+        indexes = _secondary_indexes()
+        triggers = [(_TRIGGER_NAME.search(ddl).group(1), ddl) for ddl in db.GAME_UNIT_TOTALS_TRIGGERS_DDL]
+
+        with db.unit_of_work() as con:
+            # synchronous can't change inside a transaction: send the pragmas before the first statement BEGINs one.
+            for pragma in BULK_LOAD_PRAGMAS:
+                con.connection.driver_connection.execute(pragma)
+            for name, _ in triggers:
+                con.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+            for name, _ in indexes:
+                con.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+            game_rows = _insert_games(con, rng, games)
+            art_bonus = _insert_game_artifacts(con, rng, game_rows[0], max_artifacts)
+            _insert_logs(con, rng, game_rows, art_bonus, logs, chunk_size)
+
+            for _, statement in indexes:
+                con.exec_driver_sql(statement)
+            for _, ddl in triggers:
+                con.exec_driver_sql(ddl)
+            db.rebuild_game_unit_totals()
+
+            counts = {
+                table: con.exec_driver_sql(f"SELECT COUNT(*) FROM {table}").scalar()
+                for table in ("games", "game_artifacts", "calculation_logs")
+            }
+    finally:
+        db.configure_database(previous_database)
+
+    return {
+        "games": counts["games"],
+        "game_artifacts": counts["game_artifacts"],
+        "logs": counts["calculation_logs"],
+        "seconds": time.perf_counter() - started,
+    }
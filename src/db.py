@@ -1,288 +1,557 @@
-from sqlalchemy import create_engine, text
+import atexit
 import datetime
+import functools
+import hashlib
+import threading
+from contextlib import contextmanager
 from src.config import DB_CONNECTION_STRING 
-from tqdm import tqdm
 
-engine = create_engine(DB_CONNECTION_STRING)
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_connection_string = DB_CONNECTION_STRING
+_engine = None
+_local = threading.local()
+_log_writer = None
+
+def get_engine():
+    """Returns the SQLAlchemy engine, importing SQLAlchemy and creating it on first use."""
+    global _engine
+    if _engine is None:
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.pool import SingletonThreadPool
+        _engine = create_engine(
+            _connection_string,
+            poolclass=SingletonThreadPool,
+            connect_args={"cached_statements": 256}
+        )
+        event.listen(_engine, "connect", _apply_pragmas)
+        event.listen(_engine, "begin", _emit_begin)
+    return _engine
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    """Tunes every new SQLite connection (WAL journal, relaxed fsync, bigger cache, mmap)."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+    # Let SQLAlchemy issue BEGIN itself (see _emit_begin): pysqlite's implicit
+    # transactions don't cover SAVEPOINTs, which nested unit_of_work blocks rely on.
+    dbapi_connection.isolation_level = None
+
+def _emit_begin(con):
+    con.exec_driver_sql("BEGIN")
+
+def configure_database(connection_string: str):
+    """Points the module at another database (e.g. a scratch file for benchmarks)."""
+    global _connection_string, _engine
+    shutdown_log_writer()
+    close_connection()
+    if _engine is not None:
+        _engine.dispose()
+    _connection_string = connection_string
+    _engine = None
+    invalidate_catalog()
+    invalidate_game_context()
+
+def _get_connection():
+    """Returns this thread's long-lived connection, opening it on first use."""
+    con = getattr(_local, "connection", None)
+    if con is None or con.closed:
+        con = get_engine().connect()
+        _local.connection = con
+        _local.depth = 0
+    return con
+
+def close_connection():
+    """Closes this thread's long-lived connection, if any."""
+    con = getattr(_local, "connection", None)
+    if con is not None and not con.closed:
+        con.close()
+    _local.connection = None
+
+atexit.register(close_connection)
+
+@contextmanager
+def unit_of_work():
+    """
+    Yields the shared connection and commits when the outermost block exits.
+    Nesting blocks groups several db calls into a single transaction; a nested
+    block runs in a SAVEPOINT, so its failure undoes only its own work.
+    """
+    con = _get_connection()
+    if _local.depth == 0:
+        _local.depth = 1
+        try:
+            yield con
+        except BaseException:
+            con.rollback()
+            raise
+        finally:
+            _local.depth = 0
+        con.commit()
+        return
+
+    savepoint = con.begin_nested()
+    _local.depth += 1
+    try:
+        yield con
+    except BaseException:
+        savepoint.rollback()
+        raise
+    finally:
+        _local.depth -= 1
+    savepoint.commit()
+
+def __getattr__(name):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+@functools.lru_cache(maxsize=None)
+def text(query: str):
+    """Lazily imported, cached equivalent of sqlalchemy.text()."""
+    from sqlalchemy import text as sa_text
+    return sa_text(query)
+
+UNITS_DDL = """
+CREATE TABLE IF NOT EXISTS units (
+    unit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    faction TEXT NOT NULL,
+    unit_name TEXT NOT NULL UNIQUE,
+    hp FLOAT NOT NULL, 
+    is_upgraded BOOLEAN NOT NULL,
+    gold_cost INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+ARTIFACTS_DDL = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    artifact_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    hp_bonus INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+GAMES_DDL = """
+CREATE TABLE IF NOT EXISTS games (
+    game_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    created_at DATETIME NOT NULL,
+    pit_lord_count INTEGER NOT NULL DEFAULT 0,
+    first_aid_level INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+GAME_ARTIFACTS_DDL = """
+CREATE TABLE IF NOT EXISTS game_artifacts (
+    game_id_fk INTEGER NOT NULL,
+    artifact_id_fk INTEGER NOT NULL,
+    FOREIGN KEY (game_id_fk) REFERENCES games (game_id) ON DELETE CASCADE,
+    FOREIGN KEY (artifact_id_fk) REFERENCES artifacts (artifact_id) ON DELETE CASCADE,
+    PRIMARY KEY (game_id_fk, artifact_id_fk)
+);
+"""
+
+LOGS_DDL = """
+CREATE TABLE IF NOT EXISTS calculation_logs (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id_fk INTEGER NOT NULL,
+    timestamp DATETIME NOT NULL,
+    unit_name TEXT NOT NULL,
+    unit_hp_base FLOAT NOT NULL,
+    unit_hp_modified FLOAT NOT NULL,
+    unit_count_input INTEGER NOT NULL,
+    pit_lord_input INTEGER NOT NULL,
+    demons_gained FLOAT NOT NULL,
+    wasted_hp FLOAT NOT NULL,
+    FOREIGN KEY (game_id_fk) REFERENCES games (game_id)
+        ON DELETE CASCADE
+);
+"""
+
+GAME_UNIT_TOTALS_DDL = """
+CREATE TABLE IF NOT EXISTS game_unit_totals (
+    game_id_fk INTEGER NOT NULL,
+    unit_name TEXT NOT NULL,
+    total_units_ground INTEGER NOT NULL DEFAULT 0,
+    total_demons_gained FLOAT NOT NULL DEFAULT 0,
+    total_hp_wasted FLOAT NOT NULL DEFAULT 0,
+    log_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (game_id_fk, unit_name)
+);
+"""
+
+GAME_UNIT_TOTALS_TRIGGERS_DDL = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_calculation_logs_insert_totals
+    AFTER INSERT ON calculation_logs
+    BEGIN
+        INSERT INTO game_unit_totals (game_id_fk, unit_name, total_units_ground, total_demons_gained, total_hp_wasted, log_count)
+        VALUES (NEW.game_id_fk, NEW.unit_name, NEW.unit_count_input, NEW.demons_gained, NEW.wasted_hp, 1)
+        ON CONFLICT(game_id_fk, unit_name) DO UPDATE SET
+            total_units_ground = total_units_ground + excluded.total_units_ground,
+            total_demons_gained = total_demons_gained + excluded.total_demons_gained,
+            total_hp_wasted = total_hp_wasted + excluded.total_hp_wasted,
+            log_count = log_count + 1;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_calculation_logs_delete_totals
+    AFTER DELETE ON calculation_logs
+    BEGIN
+        UPDATE game_unit_totals SET
+            total_units_ground = total_units_ground - OLD.unit_count_input,
+            total_demons_gained = total_demons_gained - OLD.demons_gained,
+            total_hp_wasted = total_hp_wasted - OLD.wasted_hp,
+            log_count = log_count - 1
+        WHERE game_id_fk = OLD.game_id_fk AND unit_name = OLD.unit_name;
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_games_delete_totals
+    AFTER DELETE ON games
+    BEGIN
+        DELETE FROM game_unit_totals WHERE game_id_fk = OLD.game_id;
+    END;
+    """,
+]
+
+SCHEMA_MIGRATIONS_DDL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    name TEXT PRIMARY KEY,
+    applied_at DATETIME NOT NULL
+);
+"""
+
+# Ordered, append-only list of (name, statements). Each migration runs once per database.
+MIGRATIONS = [
+    ("0001_secondary_indexes", [
+        "CREATE INDEX IF NOT EXISTS idx_units_faction_upgraded_hp ON units (faction, is_upgraded, hp)",
+        "CREATE INDEX IF NOT EXISTS idx_calculation_logs_game_unit ON calculation_logs (game_id_fk, unit_name)",
+        "CREATE INDEX IF NOT EXISTS idx_calculation_logs_timestamp ON calculation_logs (timestamp)",
+    ]),
+    ("0002_games_name_nocase", [
+        "CREATE INDEX IF NOT EXISTS idx_games_name_nocase ON games (name COLLATE NOCASE)",
+    ]),
+    ("0003_calculation_logs_content_hash", [
+        "ALTER TABLE calculation_logs ADD COLUMN content_hash BLOB",
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_calculation_logs_content_hash ON calculation_logs (content_hash)",
+    ]),
+]
+
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    fingerprint TEXT NOT NULL,
+    updated_at DATETIME NOT NULL
+);
+"""
+
+UNIT_LIST = [
+    # Faction, Name, HP, IsUpgraded, GoldCost
+    # Zamek
+    ('Zamek', 'Pikinier', 10, 0, 60),
+    ('Zamek', 'Halabardnik', 10, 1, 75),
+    ('Zamek', 'Łucznik', 10, 0, 100),
+    ('Zamek', 'Strzelec', 10, 1, 150),
+    ('Zamek', 'Gryf', 25, 0, 240),
+    ('Zamek', 'Królewski Gryf', 25, 1, 270),
+    ('Zamek', 'Szermierz', 35, 0, 300),
+    ('Zamek', 'Krzyżowiec', 35, 1, 400),
+    ('Zamek', 'Mnich', 30, 0, 400),
+    ('Zamek', 'Kapłan', 30, 1, 450),
+    ('Zamek', 'Kawalerzysta', 100, 0, 1000),
+    ('Zamek', 'Czempion', 100, 1, 1200),
+    ('Zamek', 'Anioł', 200, 0, 3000),
+    ('Zamek', 'Archanioł', 200, 1, 5000),
+
+    # Bastion
+    ('Bastion', 'Centaur', 8, 0, 70),
+    ('Bastion', 'Kapitan Centaurów', 10, 1, 90),
+    ('Bastion', 'Krasnolud', 20, 0, 130),
+    ('Bastion', 'Krasnoludzki Wojownik', 20, 1, 165),
+    ('Bastion', 'Leśny Elf', 15, 0, 200),
+    ('Bastion', 'Wielki Elf', 15, 1, 225),
+    ('Bastion', 'Pegaz', 30, 0, 350),
+    ('Bastion', 'Srebrny Pegaz', 30, 1, 375),
+    ('Bastion', 'Dendroid', 55, 0, 350),
+    ('Bastion', 'Dendroid Strażnik', 65, 1, 425),
+    ('Bastion', 'Jednorożec', 90, 0, 800),
+    ('Bastion', 'Jednorożec Bitewny', 110, 1, 950),
+    ('Bastion', 'Zielony Smok', 180, 0, 2400),
+    ('Bastion', 'Złoty Smok', 180, 1, 4000),
+
+    # Forteca
+    ('Forteca', 'Gremiln', 4, 0, 40),
+    ('Forteca', 'Mistrz Gremilnów', 4, 1, 50),
+    ('Forteca', 'Kamienny Gargulec', 16, 0, 130),
+    ('Forteca', 'Obsydianowy Gargulec', 16, 1, 160),
+    ('Forteca', 'Kamienny Golem', 30, 0, 300),
+    ('Forteca', 'Żelazny Golem', 35, 1, 350),
+    ('Forteca', 'Mag', 25, 0, 350),
+    ('Forteca', 'Arcymag', 30, 1, 450),
+    ('Forteca', 'Dżin', 40, 0, 550),
+    ('Forteca', 'Mistrz Dżinów', 40, 1, 600),
+    ('Forteca', 'Naga', 110, 0, 1100),
+    ('Forteca', 'Królewska Naga', 110, 1, 1600),
+    ('Forteca', 'Gigant', 150, 0, 2000),
+    ('Forteca', 'Tytan', 300, 1, 5000),
+
+    # Inferno
+    ('Inferno', 'Imp', 4, 0, 50),
+    ('Inferno', 'Chochlik', 4, 1, 60),
+    ('Inferno', 'Gog', 13, 0, 125),
+    ('Inferno', 'Magog', 13, 1, 175),
+    ('Inferno', 'Piekielny Ogar', 25, 0, 200),
+    ('Inferno', 'Cerber', 25, 1, 250),
+    ('Inferno', 'Demon', 35, 0, 250),
+    ('Inferno', 'Rogaty Demon', 40, 1, 270),
+    ('Inferno', 'Diablik', 90, 0, 500),
+    ('Inferno', 'Arcydiablik', 90, 1, 575),
+    ('Inferno', 'Efreet', 90, 0, 900),
+    ('Inferno', 'Sułtański Efreet', 90, 1, 1200),
+    ('Inferno', 'Diabeł', 160, 0, 2700),
+    ('Inferno', 'ArcyDiabeł', 160, 1, 4500),
+
+    # Nekropolia
+    ('Nekropolia', 'Szkielet', 6, 0, 60),
+    ('Nekropolia', 'Szkielet Wojownik', 6, 1, 70),
+    ('Nekropolia', 'Zombie', 15, 0, 100),
+    ('Nekropolia', 'Plugawy Zombie', 20, 1, 125),
+    ('Nekropolia', 'Upiór', 18, 0, 200),
+    ('Nekropolia', 'Zjawa', 18, 1, 230),
+    ('Nekropolia', 'Wampir', 30, 0, 360),
+    ('Nekropolia', 'Wampirzy Lord', 40, 1, 500),
+    ('Nekropolia', 'Lisz', 30, 0, 550),
+    ('Nekropolia', 'Arcylisz', 30, 1, 650),
+    ('Nekropolia', 'Czarny Rycerz', 120, 0, 1200),
+    ('Nekropolia', 'Mroczny Rycerz', 120, 1, 1500),
+    ('Nekropolia', 'Kościany Smok', 150, 0, 1800),
+    ('Nekropolia', 'Upiorny Smok', 150, 1, 3000),
+
+    # Lochy
+    ('Lochy', 'Troglodyta', 5, 0, 50),
+    ('Lochy', 'Piekielny Troglodyta', 6, 1, 65),
+    ('Lochy', 'Harpia', 14, 0, 130),
+    ('Lochy', 'Harpia Wiedźma', 14, 1, 170),
+    ('Lochy', 'Beholder', 22, 0, 260),
+    ('Lochy', 'Złe Oko', 22, 1, 285),
+    ('Lochy', 'Meduza', 25, 0, 300),
+    ('Lochy', 'Meduza Królewska', 30, 1, 330),
+    ('Lochy', 'Minotaur', 50, 0, 500),
+    ('Lochy', 'Minotaur Królewski', 50, 1, 575),
+    ('Lochy', 'Mantikora', 80, 0, 850),
+    ('Lochy', 'Skorpikora', 80, 1, 1050),
+    ('Lochy', 'Czerwony Smok', 180, 0, 2500),
+    ('Lochy', 'Czarny Smok', 300, 1, 4700),
+
+    # Twierdza
+    ('Twierdza', 'Goblin', 5, 0, 40),
+    ('Twierdza', 'Hobgoblin', 5, 1, 50),
+    ('Twierdza', 'Wilczy Jeździec', 10, 0, 100),
+    ('Twierdza', 'Wilczy Grabieżca', 10, 1, 140),
+    ('Twierdza', 'Ork', 15, 0, 150),
+    ('Twierdza', 'Ork Herszt', 20, 1, 190),
+    ('Twierdza', 'Ogr', 40, 0, 300),
+    ('Twierdza', 'Ogr Szaman', 60, 1, 450),
+    ('Twierdza', 'Rok', 60, 0, 600),
+    ('Twierdza', 'Ptak Gromu', 60, 1, 700),
+    ('Twierdza', 'Cyklop', 70, 0, 750),
+    ('Twierdza', 'Król Cyklopów', 70, 1, 1100),
+    ('Twierdza', 'Behemot', 150, 0, 1500),
+    ('Twierdza', 'Pradawny Behemot', 300, 1, 3000),
+
+    # Fort
+    ('Fort', 'Gnol', 6, 0, 50),
+    ('Fort', 'Gnol Grabieżca', 6, 1, 70),
+    ('Fort', 'Jaszczuroczłek', 14, 0, 110),
+    ('Fort', 'Jaszczurzy Wojownik', 15, 1, 140),
+    ('Fort', 'Ważka', 20, 0, 220),
+    ('Fort', 'Ognista Ważka', 20, 1, 280),
+    ('Fort', 'Bazyliszek', 35, 0, 325),
+    ('Fort', 'Większy Bazyliszek', 35, 1, 400),
+    ('Fort', 'Gorgona', 70, 0, 525),
+    ('Fort', 'Potężna Gorgona', 70, 1, 650),
+    ('Fort', 'Wiwerna', 110, 0, 800),
+    ('Fort', 'Wiwerna Królewska', 110, 1, 1200),
+    ('Fort', 'Hydra', 80, 0, 2200),
+    ('Fort', 'Hydra Chaosu', 100, 1, 3500),
+
+    # Wrota Żywiołów
+    ('Wrota Żywiołów', 'Wróżka', 3, 0, 25),
+    ('Wrota Żywiołów', 'Duszek', 3, 1, 30),
+    ('Wrota Żywiołów', 'Żywiołak Powietrza', 25, 0, 250),
+    ('Wrota Żywiołów', 'Żywiołak Burzy', 25, 1, 275),
+    ('Wrota Żywiołów', 'Żywiołak Wody', 30, 0, 300),
+    ('Wrota Żywiołów', 'Żywiołak Lodu', 30, 1, 325),
+    ('Wrota Żywiołów', 'Żywiołak Ognia', 35, 0, 350),
+    ('Wrota Żywiołów', 'Żywiołak Energii', 35, 1, 400),
+    ('Wrota Żywiołów', 'Żywiołak Ziemi', 40, 0, 400),
+    ('Wrota Żywiołów', 'Żywiołak Magmy', 40, 1, 450),
+    ('Wrota Żywiołów', 'Żywiołak Psychiczny', 75, 0, 750),
+    ('Wrota Żywiołów', 'Żywiołak Magii', 75, 1, 850),
+    ('Wrota Żywiołów', 'Ognisty Ptak', 150, 0, 2000),
+    ('Wrota Żywiołów', 'Feniks', 200, 1, 2000),
+
+    # Przystań (Cove)
+    ('Przystań', 'Nimfa', 15, 0, 130),
+    ('Przystań', 'Okeanida', 16, 1, 150),
+    ('Przystań', 'Mat', 20, 0, 200),
+    ('Przystań', 'Bosman', 20, 1, 250),
+    ('Przystań', 'Pirat', 40, 0, 325),
+    ('Przystań', 'Korsarz', 40, 1, 425),
+    ('Przystań', 'Ptak Morski', 45, 0, 475),
+    ('Przystań', 'Ayssyda', 45, 1, 550),
+    ('Przystań', 'Wiedźma Morska', 50, 0, 600),
+    ('Przystań', 'Czarodziejka', 50, 1, 700),
+    ('Przystań', 'Nix', 100, 0, 1100),
+    ('Przystań', 'Nix Wojownik', 110, 1, 1300),
+    ('Przystań', 'Wąż Morski', 280, 0, 2800),
+    ('Przystań', 'Haspid', 280, 1, 5000),
+
+    # Fabryka (Factory)
+    ('Fabryka', 'Niziołek (fabryka)', 12, 0, 60),
+    ('Fabryka', 'Niziołek Grenadier', 12, 1, 80),
+    ('Fabryka', 'Mechanik', 30, 0, 250),
+    ('Fabryka', 'Inżynier', 30, 1, 300),
+    ('Fabryka', 'Pancernik', 45, 0, 400),
+    ('Fabryka', 'Pancernik Hetman', 45, 1, 450),
+    ('Fabryka', 'Automat', 120, 0, 1500),
+    ('Fabryka', 'Strażnik Automat', 120, 1, 2000),
+    ('Fabryka', 'Czerw Pustyni', 100, 0, 900),
+    ('Fabryka', 'Olgoj-chorchoj', 100, 1, 1300),
+    ('Fabryka', 'Rewolwerowiec', 110, 0, 1200),
+    ('Fabryka', 'Łowca Nagród', 110, 1, 1700),
+    ('Fabryka', 'Kuroliszek', 250, 0, 2500),
+    ('Fabryka', 'Karmazynowy Kuroliszek', 250, 1, 4000),
+
+    # Neutralne
+    ('Neutralne', 'Chłop', 1, 0, 10),
+    ('Neutralne', 'Niziołek', 4, 0, 20), 
+    ('Neutralne', 'Duch', 8, 0, 0), # Special
+    ('Neutralne', 'Zbir', 10, 0, 0), # Special
+    ('Neutralne', 'Bandyta', 10, 0, 0), # Special
+    ('Neutralne', 'Dzik', 15, 0, 0), # Special
+    ('Neutralne', 'Koczownik', 30, 0, 0), # Special
+    ('Neutralne', 'Mumia', 30, 0, 0), # Special
+    ('Neutralne', 'Zaklinacz', 30, 0, 0), # Special
+    ('Neutralne', 'Troll', 40, 0, 0), # Special
+    ('Neutralne', 'Rdzawy Smok', 750, 0, 0), # Special
+    ('Neutralne', 'Kryształowy Smok', 800, 0, 0), # Special
+    ('Neutralne', 'Czarodziejski Smok', 1000, 0, 0), # Special
+    ('Neutralne', 'Lazurowy Smok', 1000, 0, 0) # Special
+]
+
+ARTIFACT_LIST = [
+    ('Vial of Lifeblood', 1),
+    ('Ring of Vitality', 1),
+    ('Ring of Life', 1),
+    ('Elixir of Life', 2),
+]
+
+SCHEMA_DDL = [
+    UNITS_DDL, ARTIFACTS_DDL, GAMES_DDL, GAME_ARTIFACTS_DDL, LOGS_DDL,
+    GAME_UNIT_TOTALS_DDL, *GAME_UNIT_TOTALS_TRIGGERS_DDL, SCHEMA_MIGRATIONS_DDL,
+    *(statement for _, statements in MIGRATIONS for statement in statements),
+    SCHEMA_VERSION_DDL
+]
+
+_catalog = None
+_catalog_stats = {"hits": 0, "misses": 0}
+_game_contexts = {}
 
 def create_table_units():
     """Creates the 'units' table if it doesn't exist."""
-    with engine.connect() as con:
-        con.execute(text("""
-            CREATE TABLE IF NOT EXISTS units (
-                unit_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                faction TEXT NOT NULL,
-                unit_name TEXT NOT NULL UNIQUE,
-                hp FLOAT NOT NULL, 
-                is_upgraded BOOLEAN NOT NULL,
-                gold_cost INTEGER NOT NULL DEFAULT 0
-            );
-        """))
-        con.commit()
+    with unit_of_work() as con:
+        con.execute(text(UNITS_DDL))
 
 def create_table_artifacts():
     """Creates the 'artifacts' table if it doesn't exist."""
-    with engine.connect() as con:
-        con.execute(text("""
-            CREATE TABLE IF NOT EXISTS artifacts (
-                artifact_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                hp_bonus INTEGER NOT NULL DEFAULT 0
-            );
-        """))
-        con.commit()
+    with unit_of_work() as con:
+        con.execute(text(ARTIFACTS_DDL))
 
 def create_table_games():
     """
     Creates the 'games' table if it doesn't exist.
     This table stores game-specific stats like Pit Lord count and First Aid level.
     """
-    with engine.connect() as con:
-        con.execute(text("""
-            CREATE TABLE IF NOT EXISTS games (
-                game_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                created_at DATETIME NOT NULL,
-                pit_lord_count INTEGER NOT NULL DEFAULT 0,
-                first_aid_level INTEGER NOT NULL DEFAULT 0
-            );
-        """))
-        con.commit()
+    with unit_of_work() as con:
+        con.execute(text(GAMES_DDL))
 
 def create_table_game_artifacts():
     """Creates the 'game_artifacts' junction table if it doesn't exist."""
-    with engine.connect() as con:
-        con.execute(text("""
-            CREATE TABLE IF NOT EXISTS game_artifacts (
-                game_id_fk INTEGER NOT NULL,
-                artifact_id_fk INTEGER NOT NULL,
-                FOREIGN KEY (game_id_fk) REFERENCES games (game_id) ON DELETE CASCADE,
-                FOREIGN KEY (artifact_id_fk) REFERENCES artifacts (artifact_id) ON DELETE CASCADE,
-                PRIMARY KEY (game_id_fk, artifact_id_fk)
-            );
-        """))
-        con.commit()
+    with unit_of_work() as con:
+        con.execute(text(GAME_ARTIFACTS_DDL))
 
 def create_table_logs():
     """Creates the 'calculation_logs' table if it doesn't exist."""
-    with engine.connect() as con:
-        con.execute(text("""
-            CREATE TABLE IF NOT EXISTS calculation_logs (
-                log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                game_id_fk INTEGER NOT NULL,
-                timestamp DATETIME NOT NULL,
-                unit_name TEXT NOT NULL,
-                unit_hp_base FLOAT NOT NULL,
-                unit_hp_modified FLOAT NOT NULL,
-                unit_count_input INTEGER NOT NULL,
-                pit_lord_input INTEGER NOT NULL,
-                demons_gained FLOAT NOT NULL,
-                wasted_hp FLOAT NOT NULL,
-                FOREIGN KEY (game_id_fk) REFERENCES games (game_id)
-                    ON DELETE CASCADE
-            );
+    with unit_of_work() as con:
+        con.execute(text(LOGS_DDL))
+
+def create_table_game_unit_totals():
+    """
+    Creates the 'game_unit_totals' summary table and the triggers that keep it
+    in sync with 'calculation_logs'. Backfills it when it is created on an
+    existing database.
+    """
+    with unit_of_work() as con:
+        exists = con.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'game_unit_totals'"
+        )).scalar()
+        con.execute(text(GAME_UNIT_TOTALS_DDL))
+        for trigger_ddl in GAME_UNIT_TOTALS_TRIGGERS_DDL:
+            con.execute(text(trigger_ddl))
+        if not exists:
+            rebuild_game_unit_totals()
+
+def rebuild_game_unit_totals() -> int:
+    """
+    Recomputes 'game_unit_totals' from scratch out of 'calculation_logs'.
+    Returns the number of (game, unit) rows written.
+    """
+    flush_logs()
+    with unit_of_work() as con:
+        con.execute(text("DELETE FROM game_unit_totals"))
+        result = con.execute(text("""
+            INSERT INTO game_unit_totals (game_id_fk, unit_name, total_units_ground, total_demons_gained, total_hp_wasted, log_count)
+            SELECT game_id_fk, unit_name, SUM(unit_count_input), SUM(demons_gained), SUM(wasted_hp), COUNT(*)
+            FROM calculation_logs
+            GROUP BY game_id_fk, unit_name
         """))
-        con.commit()
+        return result.rowcount
+
+def apply_migrations() -> list:
+    """
+    Applies every migration from MIGRATIONS that this database hasn't seen yet.
+    Returns the names of the migrations that were applied.
+    """
+    applied = []
+    with unit_of_work() as con:
+        con.execute(text(SCHEMA_MIGRATIONS_DDL))
+        done = {row[0] for row in con.execute(text("SELECT name FROM schema_migrations")).fetchall()}
+        for name, statements in MIGRATIONS:
+            if name in done:
+                continue
+            for statement in statements:
+                con.execute(text(statement))
+            con.execute(
+                text("INSERT INTO schema_migrations (name, applied_at) VALUES (:name, :applied_at)"),
+                {"name": name, "applied_at": datetime.datetime.now()}
+            )
+            applied.append(name)
+    return applied
 
 def import_units():
     """
     Imports the master list of units into the 'units' table.
     Now includes gold_cost.
     """
-    unit_list = [
-            # Faction, Name, HP, IsUpgraded, GoldCost
-            # Zamek
-            ('Zamek', 'Pikinier', 10, 0, 60),
-            ('Zamek', 'Halabardnik', 10, 1, 75),
-            ('Zamek', 'Łucznik', 10, 0, 100),
-            ('Zamek', 'Strzelec', 10, 1, 150),
-            ('Zamek', 'Gryf', 25, 0, 240),
-            ('Zamek', 'Królewski Gryf', 25, 1, 270),
-            ('Zamek', 'Szermierz', 35, 0, 300),
-            ('Zamek', 'Krzyżowiec', 35, 1, 400),
-            ('Zamek', 'Mnich', 30, 0, 400),
-            ('Zamek', 'Kapłan', 30, 1, 450),
-            ('Zamek', 'Kawalerzysta', 100, 0, 1000),
-            ('Zamek', 'Czempion', 100, 1, 1200),
-            ('Zamek', 'Anioł', 200, 0, 3000),
-            ('Zamek', 'Archanioł', 200, 1, 5000),
-
-            # Bastion
-            ('Bastion', 'Centaur', 8, 0, 70),
-            ('Bastion', 'Kapitan Centaurów', 10, 1, 90),
-            ('Bastion', 'Krasnolud', 20, 0, 130),
-            ('Bastion', 'Krasnoludzki Wojownik', 20, 1, 165),
-            ('Bastion', 'Leśny Elf', 15, 0, 200),
-            ('Bastion', 'Wielki Elf', 15, 1, 225),
-            ('Bastion', 'Pegaz', 30, 0, 350),
-            ('Bastion', 'Srebrny Pegaz', 30, 1, 375),
-            ('Bastion', 'Dendroid', 55, 0, 350),
-            ('Bastion', 'Dendroid Strażnik', 65, 1, 425),
-            ('Bastion', 'Jednorożec', 90, 0, 800),
-            ('Bastion', 'Jednorożec Bitewny', 110, 1, 950),
-            ('Bastion', 'Zielony Smok', 180, 0, 2400),
-            ('Bastion', 'Złoty Smok', 180, 1, 4000),
-
-            # Forteca
-            ('Forteca', 'Gremiln', 4, 0, 40),
-            ('Forteca', 'Mistrz Gremilnów', 4, 1, 50),
-            ('Forteca', 'Kamienny Gargulec', 16, 0, 130),
-            ('Forteca', 'Obsydianowy Gargulec', 16, 1, 160),
-            ('Forteca', 'Kamienny Golem', 30, 0, 300),
-            ('Forteca', 'Żelazny Golem', 35, 1, 350),
-            ('Forteca', 'Mag', 25, 0, 350),
-            ('Forteca', 'Arcymag', 30, 1, 450),
-            ('Forteca', 'Dżin', 40, 0, 550),
-            ('Forteca', 'Mistrz Dżinów', 40, 1, 600),
-            ('Forteca', 'Naga', 110, 0, 1100),
-            ('Forteca', 'Królewska Naga', 110, 1, 1600),
-            ('Forteca', 'Gigant', 150, 0, 2000),
-            ('Forteca', 'Tytan', 300, 1, 5000),
-
-            # Inferno
-            ('Inferno', 'Imp', 4, 0, 50),
-            ('Inferno', 'Chochlik', 4, 1, 60),
-            ('Inferno', 'Gog', 13, 0, 125),
-            ('Inferno', 'Magog', 13, 1, 175),
-            ('Inferno', 'Piekielny Ogar', 25, 0, 200),
-            ('Inferno', 'Cerber', 25, 1, 250),
-            ('Inferno', 'Demon', 35, 0, 250),
-            ('Inferno', 'Rogaty Demon', 40, 1, 270),
-            ('Inferno', 'Diablik', 90, 0, 500),
-            ('Inferno', 'Arcydiablik', 90, 1, 575),
-            ('Inferno', 'Efreet', 90, 0, 900),
-            ('Inferno', 'Sułtański Efreet', 90, 1, 1200),
-            ('Inferno', 'Diabeł', 160, 0, 2700),
-            ('Inferno', 'ArcyDiabeł', 160, 1, 4500),
-
-            # Nekropolia
-            ('Nekropolia', 'Szkielet', 6, 0, 60),
-            ('Nekropolia', 'Szkielet Wojownik', 6, 1, 70),
-            ('Nekropolia', 'Zombie', 15, 0, 100),
-            ('Nekropolia', 'Plugawy Zombie', 20, 1, 125),
-            ('Nekropolia', 'Upiór', 18, 0, 200),
-            ('Nekropolia', 'Zjawa', 18, 1, 230),
-            ('Nekropolia', 'Wampir', 30, 0, 360),
-            ('Nekropolia', 'Wampirzy Lord', 40, 1, 500),
-            ('Nekropolia', 'Lisz', 30, 0, 550),
-            ('Nekropolia', 'Arcylisz', 30, 1, 650),
-            ('Nekropolia', 'Czarny Rycerz', 120, 0, 1200),
-            ('Nekropolia', 'Mroczny Rycerz', 120, 1, 1500),
-            ('Nekropolia', 'Kościany Smok', 150, 0, 1800),
-            ('Nekropolia', 'Upiorny Smok', 150, 1, 3000),
-
-            # Lochy
-            ('Lochy', 'Troglodyta', 5, 0, 50),
-            ('Lochy', 'Piekielny Troglodyta', 6, 1, 65),
-            ('Lochy', 'Harpia', 14, 0, 130),
-            ('Lochy', 'Harpia Wiedźma', 14, 1, 170),
-            ('Lochy', 'Beholder', 22, 0, 260),
-            ('Lochy', 'Złe Oko', 22, 1, 285),
-            ('Lochy', 'Meduza', 25, 0, 300),
-            ('Lochy', 'Meduza Królewska', 30, 1, 330),
-            ('Lochy', 'Minotaur', 50, 0, 500),
-            ('Lochy', 'Minotaur Królewski', 50, 1, 575),
-            ('Lochy', 'Mantikora', 80, 0, 850),
-            ('Lochy', 'Skorpikora', 80, 1, 1050),
-            ('Lochy', 'Czerwony Smok', 180, 0, 2500),
-            ('Lochy', 'Czarny Smok', 300, 1, 4700),
-
-            # Twierdza
-            ('Twierdza', 'Goblin', 5, 0, 40),
-            ('Twierdza', 'Hobgoblin', 5, 1, 50),
-            ('Twierdza', 'Wilczy Jeździec', 10, 0, 100),
-            ('Twierdza', 'Wilczy Grabieżca', 10, 1, 140),
-            ('Twierdza', 'Ork', 15, 0, 150),
-            ('Twierdza', 'Ork Herszt', 20, 1, 190),
-            ('Twierdza', 'Ogr', 40, 0, 300),
-            ('Twierdza', 'Ogr Szaman', 60, 1, 450),
-            ('Twierdza', 'Rok', 60, 0, 600),
-            ('Twierdza', 'Ptak Gromu', 60, 1, 700),
-            ('Twierdza', 'Cyklop', 70, 0, 750),
-            ('Twierdza', 'Król Cyklopów', 70, 1, 1100),
-            ('Twierdza', 'Behemot', 150, 0, 1500),
-            ('Twierdza', 'Pradawny Behemot', 300, 1, 3000),
-
-            # Fort
-            ('Fort', 'Gnol', 6, 0, 50),
-            ('Fort', 'Gnol Grabieżca', 6, 1, 70),
-            ('Fort', 'Jaszczuroczłek', 14, 0, 110),
-            ('Fort', 'Jaszczurzy Wojownik', 15, 1, 140),
-            ('Fort', 'Ważka', 20, 0, 220),
-            ('Fort', 'Ognista Ważka', 20, 1, 280),
-            ('Fort', 'Bazyliszek', 35, 0, 325),
-            ('Fort', 'Większy Bazyliszek', 35, 1, 400),
-            ('Fort', 'Gorgona', 70, 0, 525),
-            ('Fort', 'Potężna Gorgona', 70, 1, 650),
-            ('Fort', 'Wiwerna', 110, 0, 800),
-            ('Fort', 'Wiwerna Królewska', 110, 1, 1200),
-            ('Fort', 'Hydra', 80, 0, 2200),
-            ('Fort', 'Hydra Chaosu', 100, 1, 3500),
-
-            # Wrota Żywiołów
-            ('Wrota Żywiołów', 'Wróżka', 3, 0, 25),
-            ('Wrota Żywiołów', 'Duszek', 3, 1, 30),
-            ('Wrota Żywiołów', 'Żywiołak Powietrza', 25, 0, 250),
-            ('Wrota Żywiołów', 'Żywiołak Burzy', 25, 1, 275),
-            ('Wrota Żywiołów', 'Żywiołak Wody', 30, 0, 300),
-            ('Wrota Żywiołów', 'Żywiołak Lodu', 30, 1, 325),
-            ('Wrota Żywiołów', 'Żywiołak Ognia', 35, 0, 350),
-            ('Wrota Żywiołów', 'Żywiołak Energii', 35, 1, 400),
-            ('Wrota Żywiołów', 'Żywiołak Ziemi', 40, 0, 400),
-            ('Wrota Żywiołów', 'Żywiołak Magmy', 40, 1, 450),
-            ('Wrota Żywiołów', 'Żywiołak Psychiczny', 75, 0, 750),
-            ('Wrota Żywiołów', 'Żywiołak Magii', 75, 1, 850),
-            ('Wrota Żywiołów', 'Ognisty Ptak', 150, 0, 2000),
-            ('Wrota Żywiołów', 'Feniks', 200, 1, 2000),
-
-            # Przystań (Cove)
-            ('Przystań', 'Nimfa', 15, 0, 130),
-            ('Przystań', 'Okeanida', 16, 1, 150),
-            ('Przystań', 'Mat', 20, 0, 200),
-            ('Przystań', 'Bosman', 20, 1, 250),
-            ('Przystań', 'Pirat', 40, 0, 325),
-            ('Przystań', 'Korsarz', 40, 1, 425),
-            ('Przystań', 'Ptak Morski', 45, 0, 475),
-            ('Przystań', 'Ayssyda', 45, 1, 550),
-            ('Przystań', 'Wiedźma Morska', 50, 0, 600),
-            ('Przystań', 'Czarodziejka', 50, 1, 700),
-            ('Przystań', 'Nix', 100, 0, 1100),
-            ('Przystań', 'Nix Wojownik', 110, 1, 1300),
-            ('Przystań', 'Wąż Morski', 280, 0, 2800),
-            ('Przystań', 'Haspid', 280, 1, 5000),
-
-            # Fabryka (Factory)
-            ('Fabryka', 'Niziołek (fabryka)', 12, 0, 60),
-            ('Fabryka', 'Niziołek Grenadier', 12, 1, 80),
-            ('Fabryka', 'Mechanik', 30, 0, 250),
-            ('Fabryka', 'Inżynier', 30, 1, 300),
-            ('Fabryka', 'Pancernik', 45, 0, 400),
-            ('Fabryka', 'Pancernik Hetman', 45, 1, 450),
-            ('Fabryka', 'Automat', 120, 0, 1500),
-            ('Fabryka', 'Strażnik Automat', 120, 1, 2000),
-            ('Fabryka', 'Czerw Pustyni', 100, 0, 900),
-            ('Fabryka', 'Olgoj-chorchoj', 100, 1, 1300),
-            ('Fabryka', 'Rewolwerowiec', 110, 0, 1200),
-            ('Fabryka', 'Łowca Nagród', 110, 1, 1700),
-            ('Fabryka', 'Kuroliszek', 250, 0, 2500),
-            ('Fabryka', 'Karmazynowy Kuroliszek', 250, 1, 4000),
-
-            # Neutralne
-            ('Neutralne', 'Chłop', 1, 0, 10),
-            ('Neutralne', 'Niziołek', 4, 0, 20), 
-            ('Neutralne', 'Duch', 8, 0, 0), # Special
-            ('Neutralne', 'Zbir', 10, 0, 0), # Special
-            ('Neutralne', 'Bandyta', 10, 0, 0), # Special
-            ('Neutralne', 'Dzik', 15, 0, 0), # Special
-            ('Neutralne', 'Koczownik', 30, 0, 0), # Special
-            ('Neutralne', 'Mumia', 30, 0, 0), # Special
-            ('Neutralne', 'Zaklinacz', 30, 0, 0), # Special
-            ('Neutralne', 'Troll', 40, 0, 0), # Special
-            ('Neutralne', 'Rdzawy Smok', 750, 0, 0), # Special
-            ('Neutralne', 'Kryształowy Smok', 800, 0, 0), # Special
-            ('Neutralne', 'Czarodziejski Smok', 1000, 0, 0), # Special
-            ('Neutralne', 'Lazurowy Smok', 1000, 0, 0) # Special
-]
     query = text("""
         INSERT INTO units (faction, unit_name, hp, is_upgraded, gold_cost) 
         VALUES (:faction, :unit_name, :hp, :is_upgraded, :gold_cost)
@@ -294,7 +563,7 @@ def import_units():
     """)
 
     data_to_insert = []
-    for item in unit_list:
+    for item in UNIT_LIST:
         data_to_insert.append({
             "faction": item[0],
             "unit_name": item[1],
@@ -304,24 +573,19 @@ def import_units():
         })
 
     try:
-        with engine.connect() as con:
+        with unit_of_work() as con:
             con.execute(query, data_to_insert)
-            con.commit()
     except Exception as e:
         print(f"      └─ [✖] Error inserting units: {e}")
+        raise
+    finally:
+        invalidate_catalog()
 
 def import_artifacts():
     """
     Imports HP-boosting artifacts (master list) into the 'artifacts' table.
     """
-    artifact_list = [
-        ('Vial of Lifeblood', 1),
-        ('Ring of Vitality', 1),
-        ('Ring of Life', 1),
-        ('Elixir of Life', 2),
-    ]
-
-    if not artifact_list:
+    if not ARTIFACT_LIST:
         return
 
     query = text("""
@@ -331,53 +595,156 @@ def import_artifacts():
     """)
     
     data_to_insert = []
-    for item in artifact_list:
+    for item in ARTIFACT_LIST:
         data_to_insert.append({
             "name": item[0],
             "hp_bonus": item[1]
         })
 
     try:
-        with engine.connect() as con:
+        with unit_of_work() as con:
             con.execute(query, data_to_insert)
-            con.commit()
     except Exception as e:
         print(f"      └─ [✖] Error inserting artifacts: {e}")
+        raise
+    finally:
+        invalidate_catalog()
+
+def invalidate_catalog():
+    """Drops the in-memory units/artifacts catalog so the next read reloads it."""
+    global _catalog
+    _catalog = None
+
+def get_catalog_stats() -> dict:
+    """Returns the hit/miss counters of the catalog cache."""
+    return dict(_catalog_stats)
+
+def _get_catalog() -> dict:
+    """
+    Returns the static units/artifacts catalog, loading it with a single
+    round-trip on first use.
+    """
+    global _catalog
+    if _catalog is not None:
+        _catalog_stats["hits"] += 1
+        return _catalog
+
+    _catalog_stats["misses"] += 1
+    with unit_of_work() as con:
+        unit_rows = con.execute(text("""
+            SELECT unit_name, faction, hp, is_upgraded, gold_cost FROM units
+            ORDER BY hp, unit_id
+        """)).fetchall()
+        artifact_rows = con.execute(text("SELECT * FROM artifacts ORDER BY hp_bonus, name")).fetchall()
+
+    units_by_name = {}
+    units_by_faction = {}
+    for unit_name, faction, hp, is_upgraded, gold_cost in unit_rows:
+        units_by_name[unit_name] = (unit_name, faction, hp, bool(is_upgraded), gold_cost)
+        units_by_faction.setdefault((faction, bool(is_upgraded)), []).append((unit_name, hp, gold_cost))
+
+    _catalog = {
+        "factions": sorted({faction for faction, _ in units_by_faction}),
+        "units_by_faction": units_by_faction,
+        "units_by_name": units_by_name,
+        "artifacts": [dict(row._mapping) for row in artifact_rows],
+    }
+    return _catalog
 
 def get_factions() -> list:
     """Fetches a unique, sorted list of factions."""
-    with engine.connect() as con:
-        query = text("SELECT DISTINCT faction FROM units ORDER BY faction")
-        result = con.execute(query)
-        factions = [row[0] for row in result.fetchall()]
-        return factions
+    return list(_get_catalog()["factions"])
 
 def get_units_by_faction(faction: str, is_upgraded: bool) -> list:
-    """Fetches units for a specific faction and upgrade status."""
-    with engine.connect() as con:
-        query = text("""
-            SELECT unit_name, hp, gold_cost FROM units 
-            WHERE faction = :faction AND is_upgraded = :is_upgraded
-            ORDER BY hp
-        """)
-        params = {"faction": faction, "is_upgraded": is_upgraded}
-        result = con.execute(query, params)
-        return result.fetchall()
+    """Fetches units for a specific faction and upgrade status, sorted by HP."""
+    return list(_get_catalog()["units_by_faction"].get((faction, bool(is_upgraded)), []))
 
 def get_unit_hp(unit_name: str) -> float:
     """Gets the HP for a single, specific unit."""
-    with engine.connect() as con:
-        query = text("SELECT hp FROM units WHERE unit_name = :unit_name")
-        params = {"unit_name": unit_name}
-        result = con.execute(query, params).fetchone()
-        return result[0] if result else 0.0
+    unit = _get_catalog()["units_by_name"].get(unit_name)
+    return unit[2] if unit else 0.0
 
-def initialize_database():
+def get_unit(unit_name: str):
+    """Gets a single unit's catalog row as a dictionary, or None if it doesn't exist."""
+    unit = _get_catalog()["units_by_name"].get(unit_name)
+    if unit is None:
+        return None
+    return dict(zip(("unit_name", "faction", "hp", "is_upgraded", "gold_cost"), unit))
+
+def get_all_unit_details() -> list:
+    """Fetches every unit in the catalog as a dictionary (name, faction, hp, upgrade flag, gold cost)."""
+    return [
+        dict(zip(("unit_name", "faction", "hp", "is_upgraded", "gold_cost"), unit))
+        for unit in _get_catalog()["units_by_name"].values()
+    ]
+
+def get_all_units() -> list:
+    """Fetches (unit_name, hp) for every unit in the catalog."""
+    return [(unit[0], unit[2]) for unit in _get_catalog()["units_by_name"].values()]
+
+def get_perfect_stack_index() -> dict:
+    """
+    Returns the perfect stack of every catalog unit x First Aid level x artifact bonus
+    combination, {(unit_name, fa_level, artifact_bonus): (units, hp_hundredths, pit_lords)}.
+    Built from the catalog on first use and dropped with it.
+    """
+    catalog = _get_catalog()
+    index = catalog.get("perfect_stacks")
+    if index is None:
+        from src.core import build_perfect_stack_index
+        index = catalog["perfect_stacks"] = build_perfect_stack_index(
+            get_all_units(), [art["hp_bonus"] for art in catalog["artifacts"]]
+        )
+    return index
+
+def schema_fingerprint() -> str:
+    """Hashes the DDL and the seed lists, so any change to them forces a re-initialization."""
+    digest = hashlib.sha256()
+    for ddl in SCHEMA_DDL:
+        digest.update(ddl.encode("utf-8"))
+    digest.update(repr(UNIT_LIST).encode("utf-8"))
+    digest.update(repr(ARTIFACT_LIST).encode("utf-8"))
+    return digest.hexdigest()
+
+def get_stored_fingerprint():
+    """Returns the fingerprint saved by the last initialization, or None for a fresh database."""
+    from sqlalchemy.exc import OperationalError
+
+    try:
+        with unit_of_work() as con:
+            return con.execute(text("SELECT fingerprint FROM schema_version WHERE id = 1")).scalar()
+    except OperationalError:
+        return None
+
+def create_table_schema_version():
+    """Creates the 'schema_version' table if it doesn't exist."""
+    with unit_of_work() as con:
+        con.execute(text(SCHEMA_VERSION_DDL))
+
+def save_fingerprint(fingerprint: str):
+    """Stores the fingerprint of the schema and seed data that was just applied."""
+    with unit_of_work() as con:
+        con.execute(text("""
+            INSERT INTO schema_version (id, fingerprint, updated_at)
+            VALUES (1, :fingerprint, :updated_at)
+            ON CONFLICT(id) DO UPDATE SET
+                fingerprint = excluded.fingerprint,
+                updated_at = excluded.updated_at
+        """), {"fingerprint": fingerprint, "updated_at": datetime.datetime.now()})
+
+def initialize_database(force: bool = False):
     """
     Runs the full setup: creates all tables (if they don't exist) 
     and populates them with data (if missing).
+    Skipped entirely when the stored schema fingerprint is up to date.
     Shows a progress bar during this process.
     """
+    fingerprint = schema_fingerprint()
+    if not force and get_stored_fingerprint() == fingerprint:
+        return
+
+    from tqdm import tqdm
+
     tasks = [
         (create_table_units, "Creating 'units' table"),
         (import_units, "Importing units"),
@@ -385,17 +752,20 @@ def initialize_database():
         (import_artifacts, "Importing artifacts"),
         (create_table_games, "Creating 'games' table"),
         (create_table_game_artifacts, "Creating 'game_artifacts' table"),
-        (create_table_logs, "Creating 'calculation_logs' table")
+        (create_table_logs, "Creating 'calculation_logs' table"),
+        (create_table_game_unit_totals, "Creating 'game_unit_totals' table"),
+        (apply_migrations, "Applying schema migrations"),
+        (create_table_schema_version, "Creating 'schema_version' table")
     ]
 
     print("  Checking and initializing database...")
     
-    with tqdm(total=len(tasks), desc="Initialization progress", unit="step") as pbar:
+    with unit_of_work(), tqdm(total=len(tasks), desc="Initialization progress", unit="step") as pbar:
         for func, description in tasks:
             pbar.set_description(f"Progress: {description}")
             func()
             pbar.update(1)
-
+        save_fingerprint(fingerprint)
     print("  └─ [✓] Database is ready.")
 
 def get_or_create_game(game_name: str) -> dict:
@@ -403,7 +773,7 @@ def get_or_create_game(game_name: str) -> dict:
     Tries to find a game by name. If it doesn't exist, creates it.
     Returns the full game row as a dictionary.
     """
-    with engine.connect() as con:
+    with unit_of_work() as con:
         query = text("SELECT * FROM games WHERE name = :name")
         result = con.execute(query, {"name": game_name}).fetchone()
         
@@ -417,40 +787,36 @@ def get_or_create_game(game_name: str) -> dict:
             """)
             params = {"name": game_name, "created_at": datetime.datetime.now()}
             new_result = con.execute(insert_query, params).fetchone()
-            con.commit()
             return dict(new_result._mapping)
 
 def update_game_stats(game_id: int, pit_lords: int, first_aid: int):
     """Updates the Pit Lord count and First Aid level for a game."""
-    with engine.connect() as con:
+    with unit_of_work() as con:
         query = text("""
             UPDATE games 
             SET pit_lord_count = :pit_lords, first_aid_level = :first_aid
             WHERE game_id = :game_id
         """)
         con.execute(query, {"pit_lords": pit_lords, "first_aid": first_aid, "game_id": game_id})
-        con.commit()
+    invalidate_game_context(game_id)
 
 def get_game_artifacts(game_id: int) -> list:
     """Fetches a list of artifact_ids that the game currently has."""
-    with engine.connect() as con:
+    with unit_of_work() as con:
         query = text("SELECT artifact_id_fk FROM game_artifacts WHERE game_id_fk = :game_id")
         result = con.execute(query, {"game_id": game_id})
         return [row[0] for row in result.fetchall()]
 
 def get_all_artifacts() -> list:
     """Fetches all artifacts from the master list."""
-    with engine.connect() as con:
-        query = text("SELECT * FROM artifacts ORDER BY hp_bonus, name")
-        result = con.execute(query)
-        return [dict(row._mapping) for row in result.fetchall()]
+    return [dict(artifact) for artifact in _get_catalog()["artifacts"]]
 
 def set_game_artifacts(game_id: int, artifact_ids: list):
     """
     Sets the complete list of artifacts for a game.
     Deletes old ones, inserts new ones.
     """
-    with engine.connect() as con:
+    with unit_of_work() as con:
         con.execute(text("DELETE FROM game_artifacts WHERE game_id_fk = :game_id"), {"game_id": game_id})
         
         if artifact_ids:
@@ -459,12 +825,11 @@ def set_game_artifacts(game_id: int, artifact_ids: list):
                 INSERT INTO game_artifacts (game_id_fk, artifact_id_fk)
                 VALUES (:game_id_fk, :artifact_id_fk)
             """), data_to_insert)
-        
-        con.commit()
+    invalidate_game_context(game_id)
 
 def get_game_hp_bonus(game_id: int) -> int:
     """Calculates the total HP bonus from all of a game's artifacts."""
-    with engine.connect() as con:
+    with unit_of_work() as con:
         query = text("""
             SELECT SUM(a.hp_bonus)
             FROM artifacts a
@@ -474,9 +839,44 @@ def get_game_hp_bonus(game_id: int) -> int:
         result = con.execute(query, {"game_id": game_id}).scalar()
         return result or 0
 
-def log_calculation(game_id: int, unit_name: str, base_hp: float, mod_hp: float, count: int, pit_lords: int, demons: float, waste: float):
-    """Logs a single farming calculation to the database."""
-    with engine.connect() as con:
+def get_game_context(game_id: int):
+    """
+    Returns the game's GameContext (Pit Lords, First Aid level, artifact HP bonus),
+    or None if the game doesn't exist. It is loaded with one query and cached until
+    update_game_stats, set_game_artifacts or delete_game changes the game.
+    """
+    context = _game_contexts.get(game_id)
+    if context is not None:
+        return context
+
+    with unit_of_work() as con:
+        row = con.execute(text("""
+            SELECT g.game_id, g.pit_lord_count, g.first_aid_level, COALESCE(SUM(a.hp_bonus), 0)
+            FROM games g
+            LEFT JOIN game_artifacts ga ON ga.game_id_fk = g.game_id
+            LEFT JOIN artifacts a ON a.artifact_id = ga.artifact_id_fk
+            WHERE g.game_id = :game_id
+            GROUP BY g.game_id
+        """), {"game_id": game_id}).fetchone()
+    if row is None:
+        return None
+
+    from src.core import GameContext
+    context = _game_contexts[game_id] = GameContext(*row)
+    return context
+
+def invalidate_game_context(game_id: int = None):
+    """Drops one game's cached GameContext (or all of them) so the next read reloads it."""
+    if game_id is None:
+        _game_contexts.clear()
+    else:
+        _game_contexts.pop(game_id, None)
+
+def insert_calculation_logs(rows: list):
+    """Inserts many calculation_logs rows in a single transaction."""
+    if not rows:
+        return
+    with unit_of_work() as con:
         query = text("""
             INSERT INTO calculation_logs (
                 game_id_fk, timestamp, unit_name, unit_hp_base, unit_hp_modified,
@@ -486,63 +886,195 @@ def log_calculation(game_id: int, unit_name: str, base_hp: float, mod_hp: float,
                 :unit_count_input, :pit_lord_input, :demons_gained, :wasted_hp
             )
         """)
-        params = {
-            "game_id_fk": game_id,
-            "timestamp": datetime.datetime.now(),
-            "unit_name": unit_name,
-            "unit_hp_base": base_hp,
-            "unit_hp_modified": mod_hp,
-            "unit_count_input": count,
-            "pit_lord_input": pit_lords,
-            "demons_gained": demons,
-            "wasted_hp": waste
-        }
-        con.execute(query, params)
-        con.commit()
+        con.execute(query, rows)
+
+def insert_imported_logs(rows: list) -> int:
+    """
+    Inserts imported calculation_logs rows in a single executemany, skipping rows
+    whose content_hash is already stored. Each row is a tuple of
+    (game_id_fk, timestamp, unit_name, unit_hp_base, unit_hp_modified,
+     unit_count_input, pit_lord_input, demons_gained, wasted_hp, content_hash).
+
+    The per-row game_unit_totals trigger is dropped for the duration of the
+    transaction and the new rows are added to the totals in one grouped upsert.
+    Returns the number of rows actually inserted.
+    """
+    if not rows:
+        return 0
+    insert_trigger = next(ddl for ddl in GAME_UNIT_TOTALS_TRIGGERS_DDL if "trg_calculation_logs_insert_totals" in ddl)
+    with unit_of_work() as con:
+        last_log_id = con.execute(text("SELECT COALESCE(MAX(log_id), 0) FROM calculation_logs")).scalar()
+        con.execute(text("DROP TRIGGER IF EXISTS trg_calculation_logs_insert_totals"))
+        inserted = con.exec_driver_sql("""
+            INSERT OR IGNORE INTO calculation_logs (
+                game_id_fk, timestamp, unit_name, unit_hp_base, unit_hp_modified,
+                unit_count_input, pit_lord_input, demons_gained, wasted_hp, content_hash
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows).rowcount
+        con.execute(text("""
+            INSERT INTO game_unit_totals (game_id_fk, unit_name, total_units_ground, total_demons_gained, total_hp_wasted, log_count)
+            SELECT game_id_fk, unit_name, SUM(unit_count_input), SUM(demons_gained), SUM(wasted_hp), COUNT(*)
+            FROM calculation_logs NOT INDEXED  -- read only the new rows by rowid, not the whole (game, unit) index
+            WHERE log_id > :last_log_id
+            GROUP BY game_id_fk, unit_name
+            ON CONFLICT(game_id_fk, unit_name) DO UPDATE SET
+                total_units_ground = total_units_ground + excluded.total_units_ground,
+                total_demons_gained = total_demons_gained + excluded.total_demons_gained,
+                total_hp_wasted = total_hp_wasted + excluded.total_hp_wasted,
+                log_count = log_count + excluded.log_count
+        """), {"last_log_id": last_log_id})
+        con.execute(text(insert_trigger))
+        return inserted
+
+def get_log_writer():
+    """Returns the background calculation_logs writer, starting it on first use."""
+    global _log_writer
+    if _log_writer is None:
+        from src.log_writer import LogWriter
+        _log_writer = LogWriter(insert_calculation_logs, on_thread_exit=close_connection)
+    return _log_writer
+
+def flush_logs() -> bool:
+    """
+    Blocks until every queued calculation log has been written. Returns False if
+    a write failed and some logs are still queued for a retry.
+    """
+    if _log_writer is not None:
+        return _log_writer.flush()
+    return True
+
+def shutdown_log_writer():
+    """Writes the queued calculation logs and stops the writer thread."""
+    global _log_writer
+    if _log_writer is not None:
+        _log_writer.close()
+        _log_writer = None
+
+atexit.register(shutdown_log_writer)
+
+def log_calculation(game_id: int, unit_name: str, base_hp: float, mod_hp: float, count: int, pit_lords: int, demons: float, waste: float):
+    """
+    Queues a single farming calculation for the background log writer.
+    The row is written within a second, or on flush_logs()/exit.
+    """
+    params = {
+        "game_id_fk": game_id,
+        "timestamp": datetime.datetime.now(),
+        "unit_name": unit_name,
+        "unit_hp_base": base_hp,
+        "unit_hp_modified": mod_hp,
+        "unit_count_input": count,
+        "pit_lord_input": pit_lords,
+        "demons_gained": demons,
+        "wasted_hp": waste
+    }
+    get_log_writer().submit(params)
 
 def get_game_log_summary(game_id: int) -> list:
     """
-    Fetches all logs for a game and groups them by unit name,
-    summing up the totals.
+    Fetches the per-unit totals of a game's logs from the
+    incrementally maintained 'game_unit_totals' table.
     """
-    with engine.connect() as con:
+    flush_logs()
+    with unit_of_work() as con:
         query = text("""
-            SELECT
-                unit_name,
-                SUM(unit_count_input) AS total_units_ground,
-                SUM(demons_gained) AS total_demons_gained,
-                SUM(wasted_hp) AS total_hp_wasted
-            FROM calculation_logs
-            WHERE game_id_fk = :game_id
-            GROUP BY unit_name
+            SELECT unit_name, total_units_ground, total_demons_gained, ROUND(total_hp_wasted, 2) AS total_hp_wasted
+            FROM game_unit_totals
+            WHERE game_id_fk = :game_id AND log_count > 0
             ORDER BY total_demons_gained DESC
         """)
         result = con.execute(query, {"game_id": game_id})
         return [dict(row._mapping) for row in result.fetchall()]
 
-def get_all_games() -> list:
-    """Fetches all existing games, ordered by name."""
-    with engine.connect() as con:
-        query = text("SELECT game_id, name, created_at FROM games ORDER BY name")
-        rows = con.execute(query).fetchall()
-        
-        games_list = []
-        for row in rows:
-            game_data = dict(row._mapping)
-            
-            if isinstance(game_data['created_at'], str):
-                try:
-                    game_data['created_at'] = datetime.datetime.fromisoformat(game_data['created_at'])
-                except ValueError:
-                    game_data['created_at'] = datetime.datetime.strptime(game_data['created_at'], '%Y-%m-%d %H:%M:%S')
-            
-            games_list.append(game_data)
-            
-        return games_list
+def iter_calculation_logs(after_log_id: int = 0, chunk_size: int = 50_000):
+    """
+    Streams calculation_logs rows with log_id > after_log_id in log_id order,
+    as lists of up to chunk_size row tuples, without loading the table into memory.
+    All chunks come from one read transaction, so they form a consistent snapshot.
+    """
+    flush_logs()
+    with unit_of_work() as con:
+        result = con.execution_options(stream_results=True).execute(text("""
+            SELECT log_id, game_id_fk, timestamp, unit_name, unit_hp_base, unit_hp_modified,
+                   unit_count_input, pit_lord_input, demons_gained, wasted_hp
+            FROM calculation_logs
+            WHERE log_id > :after_log_id
+            ORDER BY log_id
+        """), {"after_log_id": after_log_id})
+        while True:
+            rows = result.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+
+def read_game_logs_frames(game_id: int, chunk_size: int = 100_000):
+    """
+    Yields a game's calculation_logs joined with the unit's gold_cost as pandas
+    DataFrames of up to chunk_size rows, in log_id order. Custom units get gold_cost 0.
+    """
+    import pandas as pd
+
+    flush_logs()
+    with unit_of_work() as con:
+        query = text("""
+            SELECT l.log_id, l.timestamp, l.unit_name, l.unit_hp_modified, l.unit_count_input,
+                   l.pit_lord_input, l.demons_gained, l.wasted_hp, COALESCE(u.gold_cost, 0) AS gold_cost
+            FROM calculation_logs l
+            LEFT JOIN units u ON u.unit_name = l.unit_name
+            WHERE l.game_id_fk = :game_id
+            ORDER BY l.log_id
+        """)
+        yield from pd.read_sql(query, con, params={"game_id": game_id}, chunksize=chunk_size)
+
+def _fold_ascii(value: str) -> str:
+    """Lowercases ASCII letters only, matching SQLite's NOCASE collation."""
+    return "".join(char.lower() if char.isascii() else char for char in value)
+
+def _nocase_prefix_bound(prefix: str) -> str:
+    """
+    Smallest string that sorts after every string starting with `prefix` under NOCASE.
+    `prefix` must already be folded; folded names contain no ASCII capitals, so the
+    character after '@' is '[' ('A' would compare as 'a' and let '[', '_' etc. through).
+    """
+    last = chr(ord(prefix[-1]) + 1)
+    if "A" <= last <= "Z":
+        last = "["
+    return prefix[:-1] + last
+
+def get_games_page(name_prefix: str = "", after: tuple = None, limit: int = 20) -> list:
+    """
+    Returns one page of games ordered by name (case-insensitive), without reading the rest.
+
+    Args:
+        name_prefix: only games whose name starts with it (case-insensitive for ASCII).
+        after: keyset cursor, the (name, game_id) of the previous page's last game.
+
+    Each game is {"game_id", "name", "created_on"} with created_on as 'YYYY-MM-DD'.
+    The prefix filter is a half-open name range, so it is served by idx_games_name_nocase.
+    """
+    conditions, params = [], {"limit": limit}
+    if name_prefix:
+        low = _fold_ascii(name_prefix)
+        conditions.append("name >= :low COLLATE NOCASE AND name < :high COLLATE NOCASE")
+        params.update(low=low, high=_nocase_prefix_bound(low))
+    if after is not None:
+        conditions.append("(name COLLATE NOCASE, game_id) > (:after_name, :after_id)")
+        params.update(after_name=after[0], after_id=after[1])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    with unit_of_work() as con:
+        rows = con.execute(text(f"""
+            SELECT game_id, name, date(created_at) AS created_on
+            FROM games INDEXED BY idx_games_name_nocase
+            {where}
+            ORDER BY name COLLATE NOCASE, game_id
+            LIMIT :limit
+        """), params).fetchall()
+        return [dict(row._mapping) for row in rows]
 
 def delete_game(game_id: int):
     """Deletes a game and all its associated logs/artifacts."""
-    with engine.connect() as con:
+    with unit_of_work() as con:
         query = text("DELETE FROM games WHERE game_id = :game_id")
         con.execute(query, {"game_id": game_id})
-        con.commit()
\ No newline at end of file
+    invalidate_game_context(game_id)
@@ -0,0 +1,153 @@
+"""
+Columnar export of calculation_logs (Parquet or Arrow IPC), partitioned by game.
+
+Rows are streamed out of SQLite in log_id order with db.iter_calculation_logs
+(a streaming cursor read with fetchmany), so memory use depends on the flush size,
+not on the table size. Buffered rows are split by game and written as one file
+per game under a Hive-style directory:
+
+    <out>/game_id=<id>/part-<first log_id>-<last log_id>.parquet
+
+The highest exported log_id is kept in <out>/_export_state.json after every
+flush. An incremental export starts right after it, so analytics jobs can read
+the files and only touch the live database for new rows.
+
+pyarrow is an optional dependency; it is imported only when an export runs.
+"""
+import datetime
+import json
+from pathlib import Path
+
+import src.db as db
+
+STATE_FILE_NAME = "_export_state.json"
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Exporting logs needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _schema(pa):
+    return pa.schema([
+        ("log_id", pa.int64()),
+        ("game_id_fk", pa.int64()),
+        ("timestamp", pa.timestamp("us")),
+        ("unit_name", pa.string()),
+        ("unit_hp_base", pa.float64()),
+        ("unit_hp_modified", pa.float64()),
+        ("unit_count_input", pa.int64()),
+        ("pit_lord_input", pa.int64()),
+        ("demons_gained", pa.float64()),
+        ("wasted_hp", pa.float64()),
+    ])
+
+
+def read_state(out_dir) -> dict:
+    """Returns the export state ({"last_log_id": ...}), or an empty state for a fresh directory."""
+    path = Path(out_dir) / STATE_FILE_NAME
+    if not path.exists():
+        return {"last_log_id": 0}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_state(out_dir: Path, last_log_id: int, rows: int):
+    state = {
+        "last_log_id": last_log_id,
+        "rows_in_last_run": rows,
+        "exported_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    tmp_path = out_dir / f"{STATE_FILE_NAME}.tmp"
+    tmp_path.write_text(json.dumps(state, indent=2) + "\n", encoding="utf-8")
+    tmp_path.replace(out_dir / STATE_FILE_NAME)
+
+
+def _to_table(pa, rows: list):
+    """Builds an Arrow table from row tuples (column by column)."""
+    schema = _schema(pa)
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.name == "timestamp":
+            # SQLite returns DATETIME values as 'YYYY-MM-DD HH:MM:SS[.ffffff]' text.
+            arrays.append(pa.array(values, pa.string()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _write_partitions(pa, table, out_dir: Path, fmt: str) -> int:
+    """Writes one file per game found in the table; returns the number of files."""
+    import numpy as np
+
+    table = table.sort_by([("game_id_fk", "ascending"), ("log_id", "ascending")])
+    game_ids = table["game_id_fk"].to_numpy()
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(game_ids)) + 1, [len(game_ids)]))
+
+    for start, stop in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        part = table.slice(start, stop - start)
+        log_ids = part["log_id"]
+        partition_dir = out_dir / f"game_id={game_ids[start]}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        path = partition_dir / f"part-{log_ids[0].as_py():012d}-{log_ids[-1].as_py():012d}{FORMATS[fmt]}"
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            pq.write_table(part, path)
+        else:
+            import pyarrow.feather as feather
+            feather.write_feather(part, path)
+    return len(bounds) - 1
+
+
+def export_logs(out_dir, incremental: bool = False, fmt: str = "parquet",
+                chunk_size: int = 50_000, rows_per_flush: int = 1_000_000) -> dict:
+    """
+    Exports calculation_logs to `out_dir`.
+
+    A full export needs a directory without a previous export; incremental=True
+    continues after the last exported log_id. Rows are fetched chunk_size at a
+    time and buffered as Arrow tables up to rows_per_flush, so each game gets
+    one file per flush instead of one per fetched chunk.
+
+    Returns:
+        {"rows", "files", "first_log_id", "last_log_id"} for this run.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    pa = _require_pyarrow()
+
+    out_dir = Path(out_dir)
+    state_path = out_dir / STATE_FILE_NAME
+    if not incremental and state_path.exists():
+        raise FileExistsError(f"{out_dir} already holds an export; use incremental mode or another directory")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    after_log_id = read_state(out_dir)["last_log_id"] if incremental else 0
+    rows = files = 0
+    first_log_id = last_log_id = None
+    buffered, buffered_rows = [], 0
+
+    def flush():
+        nonlocal files, buffered, buffered_rows
+        if buffered:
+            files += _write_partitions(pa, pa.concat_tables(buffered), out_dir, fmt)
+            _write_state(out_dir, last_log_id, rows)
+        buffered, buffered_rows = [], 0
+
+    for chunk in db.iter_calculation_logs(after_log_id, chunk_size):
+        buffered.append(_to_table(pa, chunk))
+        buffered_rows += len(chunk)
+        rows += len(chunk)
+        first_log_id = chunk[0][0] if first_log_id is None else first_log_id
+        last_log_id = chunk[-1][0]
+        if buffered_rows >= rows_per_flush:
+            flush()
+    flush()
+
+    if last_log_id is None:
+        _write_state(out_dir, after_log_id, 0)
+    return {"rows": rows, "files": files, "first_log_id": first_log_id, "last_log_id": last_log_id or after_log_id}
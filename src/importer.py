@@ -0,0 +1,169 @@
+"""
+Bulk import of calculation logs from session files (CSV/JSONL), for many games at once.
+
+Each input row is one recorded calculation:
+    game                 game name (created if it doesn't exist yet)
+    timestamp            when it happened, ISO 8601 ('2025-03-01 18:20:05') or Unix seconds;
+                         stored in UTC (ISO times without an offset are taken as UTC)
+    unit_name or hp      the unit sacrificed (catalog name or base HP)
+    count                number of units
+    pit_lords            number of Pit Lords (default: the game's saved count)
+    first_aid            First Aid level 0-3 (default: the game's saved level)
+    artifacts            total HP bonus as an integer, or artifact names separated by ';'
+                         (default: the game's saved artifacts)
+
+demons_gained and wasted_hp are never read from the file: they are recomputed
+with the vectorized core for every chunk. Each chunk is written with one
+executemany in its own transaction, and every row carries a content hash of
+its inputs, so importing the same file twice (or resuming an interrupted
+import) skips the rows that are already stored.
+"""
+import datetime
+import hashlib
+import sys
+import time
+
+import src.core
+import src.db as db
+from src.batch import BatchInputError, Resolver, check_int64_range, chunks, read_rows
+
+
+def _parse_timestamp(value) -> str:
+    """
+    Normalizes a timestamp to naive UTC, as the text sqlite3 stores for datetime values.
+    Nothing depends on the local timezone, so a file hashes the same on every machine.
+    """
+    if value in (None, ""):
+        raise BatchInputError("row needs a 'timestamp'")
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = float(value)  # CSV cells are always text, Unix seconds included
+        except ValueError:
+            pass
+    if isinstance(value, (int, float)):
+        try:
+            stamp = datetime.datetime.fromtimestamp(value, datetime.timezone.utc).replace(tzinfo=None)
+        except (OverflowError, OSError, ValueError):
+            raise BatchInputError(f"timestamp out of range: {value!r}") from None
+    else:
+        stamp = datetime.datetime.fromisoformat(str(value))
+        if stamp.tzinfo is not None:
+            stamp = stamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return stamp.isoformat(sep=" ")
+
+
+def content_hash(game_name: str, timestamp: str, unit_name: str, base_hp: float,
+                 first_aid: int, bonus: int, count: int, pit_lords: int) -> bytes:
+    """Hash of a log's inputs; the same calculation imported twice gets the same hash."""
+    key = f"{game_name}\x1f{timestamp}\x1f{unit_name}\x1f{base_hp!r}\x1f{first_aid}\x1f{bonus}\x1f{count}\x1f{pit_lords}"
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+class _GameResolver:
+    """Maps game names to (game_id, pit_lords, first_aid, artifact_bonus), creating missing games once."""
+
+    def __init__(self):
+        self._games = {}
+
+    def __call__(self, game_name) -> tuple:
+        game = self._games.get(game_name)
+        if game is None:
+            if not game_name or not str(game_name).strip():
+                raise BatchInputError("row needs a 'game'")
+            context = db.get_game_context(db.get_or_create_game(str(game_name).strip())["game_id"])
+            game = (context.game_id, context.pit_lord_count, context.first_aid_level, context.artifact_bonus)
+            self._games[game_name] = game
+        return game
+
+    def __len__(self):
+        return len(self._games)
+
+
+def _parse_chunk(chunk: list, games: _GameResolver, resolver: Resolver, units: dict, errors) -> list:
+    """
+    Turns (line_number, row) pairs into (game_id, timestamp, unit_name, base_hp, first_aid, bonus,
+    count, pit_lords, hash) tuples. `units` memoizes resolved (unit_name, hp) pairs across chunks.
+    """
+    parsed = []
+    for line_number, row in chunk:
+        try:
+            if isinstance(row, BatchInputError):
+                raise row
+            game_name = row.get("game")
+            game_id, game_lords, game_first_aid, game_bonus = games(game_name)
+            timestamp = _parse_timestamp(row.get("timestamp"))
+            unit_key = (row.get("unit_name"), row.get("hp"))
+            unit = units.get(unit_key)
+            if unit is None:
+                unit = units[unit_key] = resolver.unit(row)
+            unit_name, base_hp, _ = unit
+
+            first_aid = row.get("first_aid")
+            first_aid = game_first_aid if first_aid in (None, "") else int(first_aid)
+            if first_aid not in src.core.FIRST_AID_LEVELS:
+                raise BatchInputError(f"first_aid must be one of {src.core.FIRST_AID_LEVELS}")
+            artifacts = row.get("artifacts")
+            bonus = game_bonus if artifacts in (None, "") else resolver.artifact_bonus(artifacts)
+            pit_lords = row.get("pit_lords")
+            pit_lords = game_lords if pit_lords in (None, "") else int(pit_lords)
+            count = int(row["count"])
+            if count < 0 or pit_lords < 0:
+                raise BatchInputError("count and pit_lords must not be negative")
+            check_int64_range(src.core.modified_hp_hundredths(base_hp, bonus, first_aid), count, pit_lords)
+        except (BatchInputError, KeyError, TypeError, ValueError, OverflowError) as e:
+            errors.write(f"line {line_number}: skipped ({e})\n")
+            continue
+        parsed.append((
+            game_id, timestamp, unit_name, base_hp, first_aid, bonus, count, pit_lords,
+            content_hash(str(game_name).strip(), timestamp, unit_name, base_hp, first_aid, bonus, count, pit_lords),
+        ))
+    return parsed
+
+
+def _log_rows(parsed: list) -> list:
+    """Recomputes modified HP, demons and waste for a parsed chunk and returns insert_imported_logs rows."""
+    import numpy as np
+
+    game_ids, timestamps, unit_names, base_hp, first_aid, bonus, counts, pit_lords, hashes = zip(*parsed)
+    unit_hp = src.core.modified_hp_batch(
+        np.array(base_hp, dtype=np.float64), np.array(bonus, dtype=np.int64), np.array(first_aid, dtype=np.int64)
+    )
+    results = src.core.calculate_demon_farm_batch(unit_hp, counts, pit_lords)
+    return list(zip(
+        game_ids, timestamps, unit_names, base_hp, results["unit_hp"].tolist(), counts, pit_lords,
+        results["actual_demons_gained"].tolist(), results["wasted_hp"].tolist(), hashes
+    ))
+
+
+def import_logs(input_stream, input_format: str = "csv", chunk_size: int = 50_000, errors=sys.stderr) -> dict:
+    """
+    Streams session rows from input_stream into calculation_logs.
+
+    Returns:
+        {"rows", "inserted", "duplicates", "skipped", "games", "seconds"}, where
+        duplicates are valid rows whose content hash was already stored and
+        skipped are rows that could not be parsed or resolved.
+    """
+    started = time.perf_counter()
+    games = _GameResolver()
+    resolver = Resolver()
+    units = {}
+    rows = inserted = valid = 0
+
+    for chunk in chunks(read_rows(input_stream, input_format), chunk_size):
+        parsed = _parse_chunk(chunk, games, resolver, units, errors)
+        rows += len(chunk)
+        if not parsed:
+            continue
+        valid += len(parsed)
+        inserted += db.insert_imported_logs(_log_rows(parsed))
+
+    return {
+        "rows": rows,
+        "inserted": inserted,
+        "duplicates": valid - inserted,
+        "skipped": rows - valid,
+        "games": len(games),
+        "seconds": time.perf_counter() - started,
+    }
@@ -1,3 +1,4 @@
+import math
 import questionary
 from rich.console import Console
 
@@ -25,9 +26,12 @@ def get_float_input(prompt: str) -> float:
     while True:
         answer = questionary.text(prompt).ask()
         try:
-            return float(answer)
+            value = float(answer)
+            if math.isfinite(value):
+                return value
         except (ValueError, TypeError):
-            console.print("[bold red]Error: Please enter a valid number.[/bold red]")
+            pass
+        console.print("[bold red]Error: Please enter a valid number.[/bold red]")
 
 def get_choice_from_map(options_map: dict):
     """Gets a user's choice from a dictionary map using questionary."""
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class _Flush:
+    """A flush() request; `pending` tells whether rows were still unwritten when it was handled."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.pending = True
+
+
+class LogWriter:
+    """
+    Buffers log rows in memory and writes them in batches from a background thread.
+    A batch is flushed when it reaches `flush_size` rows, when `flush_interval`
+    seconds have passed since its first row, on flush() and on close().
+
+    A batch that fails to write is kept and retried on the next flush (at the
+    latest `flush_interval` seconds later). After `max_attempts` failures its rows
+    are written one at a time, so only the rows that fail on their own are lost.
+    """
+
+    def __init__(self, write_rows, flush_size: int = 200, flush_interval: float = 1.0, on_thread_exit=None,
+                 max_attempts: int = 3):
+        self._write_rows = write_rows
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._on_thread_exit = on_thread_exit
+        self._max_attempts = max_attempts
+        self._failures = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, row: dict):
+        """Queues a row for writing. Never blocks on disk."""
+        if self._closed:
+            raise RuntimeError("LogWriter is closed.")
+        self._queue.put(row)
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Blocks until every row submitted so far has been written. Returns False if
+        some are still pending: the write failed (the rows are kept for a retry)
+        or the timeout expired first.
+        """
+        if self._closed:
+            return True
+        request = _Flush()
+        self._queue.put(request)
+        return request.done.wait(timeout) and not request.pending
+
+    def close(self):
+        """Writes the remaining rows and stops the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _write(self, batch: list):
+        """Writes and clears the batch; on failure leaves it in place for a retry."""
+        if not batch:
+            return
+        try:
+            self._write_rows(batch)
+        except Exception as e:
+            self._failures += 1
+            if self._failures < self._max_attempts:
+                print(f"      └─ [✖] Error writing {len(batch)} calculation logs, will retry: {e}")
+                return
+            self._write_one_by_one(batch)
+        self._failures = 0
+        batch.clear()
+
+    def _write_one_by_one(self, batch: list):
+        """Last resort for a batch that keeps failing: keeps every row that can be written."""
+        dropped, error = 0, None
+        for row in batch:
+            try:
+                self._write_rows([row])
+            except Exception as e:
+                dropped, error = dropped + 1, e
+        if dropped:
+            print(f"      └─ [✖] Dropped {dropped} of {len(batch)} calculation logs that could not be written: {error}")
+
+    def _retry_deadline(self, batch: list):
+        """None after a successful write; otherwise when to retry the rows still in `batch`."""
+        return time.monotonic() + self._flush_interval if batch else None
+
+    def _run(self):
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    self._write(batch)
+                    deadline = self._retry_deadline(batch)
+                    continue
+
+                if item is _STOP:
+                    while batch:
+                        self._write(batch)
+                    return
+                if isinstance(item, _Flush):
+                    self._write(batch)
+                    deadline = self._retry_deadline(batch)
+                    item.pending = bool(batch)
+                    item.done.set()
+                    continue
+
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self._flush_interval
+                if len(batch) >= self._flush_size:
+                    self._write(batch)
+                    deadline = self._retry_deadline(batch)
+        finally:
+            if self._on_thread_exit is not None:
+                self._on_thread_exit()
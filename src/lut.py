@@ -0,0 +1,236 @@
+"""
+Precomputed lookup table (LUT) of farm and reverse results, memory-mapped from disk.
+
+Every result of calculate_demon_farm/calculate_reverse_farm is determined by the
+modified HP (in hundredths) and the unit count or target demons; Pit Lords and gold
+cost only enter through trivial arithmetic. `main.py build-lut` tabulates every
+HP reachable from the catalog (units x First Aid levels x artifact bonuses) into
+one .npy file with a fixed struct dtype, one row per HP value.
+
+At runtime the file is opened with np.load(mmap_mode='r'), so it costs nothing
+to open and the pages are shared between processes. Each path is opened once per
+process. Lookups outside the table, or when the file is missing, truncated or
+not a LUT, fall back to live computation in src.core.
+
+In-process the integer core is faster than a scalar lookup (about 0.6 us vs 1.7 us
+per call), so the interactive calculator does not use this module. The sweep and
+batch farm paths do: perfect_stack_batch() gathers whole columns of perfect stacks
+about ten times faster than the np.gcd it replaces. numpy is imported only when a
+table is built or opened.
+"""
+import os
+
+import src.core
+from src.config import DEMON_HP, HP_SCALE, LUT_FILE_PATH, LUT_MAX_COUNT, LUT_MAX_DEMONS, PIT_LORD_GRIND_RATE
+
+# Resolved path -> (table, rows, columns), or None when the path has no usable table.
+# rows maps HP hundredths to a table row (-1 if not tabulated).
+_tables = {}
+
+
+def lut_dtype(max_count: int, max_demons: int):
+    """Row layout: farm fields indexed by unit count, reverse fields by target demons."""
+    import numpy as np
+
+    return np.dtype([
+        ("hp_hundredths", "<i4"),
+        ("perfect_units", "<i4"),
+        ("farm_wasted_hundredths", "<i2", (max_count + 1,)),
+        ("farm_pit_lords", "<i4", (max_count + 1,)),
+        ("reverse_units", "<i4", (max_demons + 1,)),
+        ("reverse_pit_lords", "<i4", (max_demons + 1,)),
+        ("reverse_wasted_hundredths", "<i2", (max_demons + 1,)),
+    ])
+
+
+def catalog_hp_hundredths():
+    """Every distinct modified HP (in hundredths) reachable with catalog units, First Aid and artifacts."""
+    import numpy as np
+
+    import src.db as db
+
+    bonuses = src.core.artifact_bonus_combinations([art["hp_bonus"] for art in db.get_all_artifacts()])
+    return np.array(sorted({
+        src.core.modified_hp_hundredths(base_hp, bonus, fa_level)
+        for _, base_hp in db.get_all_units()
+        for bonus in bonuses
+        for fa_level in src.core.FIRST_AID_LEVELS
+    }), dtype=np.int64)
+
+
+def build_table(hp_hundredths, max_count: int = LUT_MAX_COUNT, max_demons: int = LUT_MAX_DEMONS):
+    """Computes the LUT rows for the given HP values (in hundredths)."""
+    import numpy as np
+
+    hp = np.asarray(hp_hundredths, dtype=np.int64)[:, None]
+    table = np.zeros(len(hp), dtype=lut_dtype(max_count, max_demons))
+    table["hp_hundredths"] = hp[:, 0]
+    table["perfect_units"] = src.core.DEMON_HP_HUNDREDTHS // np.gcd(hp[:, 0], src.core.DEMON_HP_HUNDREDTHS)
+
+    pool = np.arange(max_count + 1) * hp
+    table["farm_wasted_hundredths"] = pool % src.core.DEMON_HP_HUNDREDTHS
+    table["farm_pit_lords"] = -(-pool // src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS)
+
+    units = -(-(np.arange(max_demons + 1) * src.core.DEMON_HP_HUNDREDTHS) // hp)
+    pool = units * hp
+    table["reverse_units"] = units
+    table["reverse_pit_lords"] = -(-pool // src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS)
+    table["reverse_wasted_hundredths"] = pool % src.core.DEMON_HP_HUNDREDTHS
+    return table
+
+
+def build_lut(path=LUT_FILE_PATH, max_count: int = LUT_MAX_COUNT, max_demons: int = LUT_MAX_DEMONS) -> int:
+    """
+    Writes the LUT for the whole catalog to `path` (atomically) and returns the number of HP rows.
+    """
+    import numpy as np
+
+    hp_hundredths = catalog_hp_hundredths()
+    hp_hundredths = hp_hundredths[hp_hundredths > 0]
+    table = build_table(hp_hundredths, max_count, max_demons)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    reset_lut()
+    return len(table)
+
+
+def reset_lut():
+    """Forgets every opened table, so the next lookup reopens the files."""
+    _tables.clear()
+
+
+def _open(path):
+    """Returns the cached (table, rows, columns) for `path`, opening it on first use."""
+    key = os.path.realpath(path)
+    if key not in _tables:
+        _tables[key] = _read(key)
+    return _tables[key]
+
+
+def _read(path):
+    import numpy as np
+
+    try:
+        table = np.load(path, mmap_mode="r")
+    except (OSError, ValueError, EOFError):
+        return None  # missing, truncated or not a .npy file
+    if table.ndim != 1 or not set(lut_dtype(0, 0).names) <= set(table.dtype.names or ()):
+        return None  # not a LUT, or written by an older build-lut (HP in tenths); rebuild it
+
+    hp_hundredths = np.asarray(table["hp_hundredths"], dtype=np.int64)
+    tabulated = hp_hundredths >= 0
+    rows = np.full(int(hp_hundredths.max(initial=-1)) + 1, -1, dtype=np.int64)
+    rows[hp_hundredths[tabulated]] = np.flatnonzero(tabulated)
+    # Plain 2-D views per field: indexing them is much cheaper than going through records.
+    columns = {name: table[name] for name in table.dtype.names}
+    return table, rows, columns
+
+
+def load_lut(path=LUT_FILE_PATH):
+    """Returns the memory-mapped table at `path`, or None if there is no usable table there."""
+    opened = _open(path)
+    return None if opened is None else opened[0]
+
+
+def _lookup(hp_hundredths, path=LUT_FILE_PATH):
+    """Returns (row, columns) for an HP value, or None if it is not tabulated in the table at `path`."""
+    opened = _open(path)
+    if opened is None or hp_hundredths is None:
+        return None
+    _, rows, columns = opened
+    if not 0 <= hp_hundredths < len(rows) or rows[hp_hundredths] < 0:
+        return None
+    return int(rows[hp_hundredths]), columns
+
+
+def perfect_stack_batch(unit_hp, path=LUT_FILE_PATH) -> tuple:
+    """
+    Per-row (units, hp_hundredths, pit_lords) perfect stacks for calculate_demon_farm_batch.
+    HP values tabulated at `path` are read from the table; the rest are computed.
+    """
+    import numpy as np
+
+    unit_hp = np.asarray(unit_hp, dtype=np.float64)
+    if not np.all(np.abs(unit_hp) * HP_SCALE < np.iinfo(np.int64).max):
+        raise ValueError("unit_hp must be finite and fit in int64 hundredths")
+    hp_hundredths = np.rint(unit_hp * HP_SCALE).astype(np.int64)
+
+    units = np.zeros(hp_hundredths.shape, dtype=np.int64)
+    missing = np.ones(hp_hundredths.shape, dtype=bool)
+    opened = _open(path)
+    if opened is not None and len(opened[0]):
+        _, rows, columns = opened
+        inside = (hp_hundredths >= 0) & (hp_hundredths < len(rows))
+        row = np.where(inside, rows[np.where(inside, hp_hundredths, 0)], -1)
+        missing = row < 0
+        units = columns["perfect_units"][row].astype(np.int64)
+    units[missing] = src.core.DEMON_HP_HUNDREDTHS // np.gcd(hp_hundredths[missing], src.core.DEMON_HP_HUNDREDTHS)
+
+    pool = units * hp_hundredths
+    return units, pool, -(-pool // src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS)
+
+
+def calculate_demon_farm(unit_hp: float, unit_count: int, pit_lord_count: int, perfect_stack: tuple = None,
+                         lut_path=LUT_FILE_PATH) -> src.core.FarmResult:
+    """Drop-in for src.core.calculate_demon_farm that reads from the LUT when possible."""
+    try:
+        hp_hundredths = src.core.to_hundredths(unit_hp)
+    except (ValueError, OverflowError):
+        hp_hundredths = None
+    found = _lookup(hp_hundredths, lut_path)
+    if found is None or not 0 <= unit_count < found[1]["farm_pit_lords"].shape[1]:
+        return src.core.calculate_demon_farm(unit_hp, unit_count, pit_lord_count, perfect_stack)
+    row, columns = found
+
+    pool = unit_count * hp_hundredths
+    perfect_units = int(columns["perfect_units"][row])
+    perfect_pool = perfect_units * hp_hundredths
+    max_demons_from_hp = pool / src.core.DEMON_HP_HUNDREDTHS
+    max_demons_from_lords = (pit_lord_count * PIT_LORD_GRIND_RATE) / DEMON_HP
+    return src.core.FarmResult(
+        hp_hundredths / HP_SCALE,  # unit_hp
+        unit_count,
+        pit_lord_count,
+        pool / HP_SCALE,  # total_hp_pool
+        max_demons_from_hp,
+        max_demons_from_lords,
+        min(max_demons_from_hp, max_demons_from_lords),  # actual_demons_gained
+        int(columns["farm_pit_lords"][row, unit_count]),  # needed_pit_lords
+        int(columns["farm_wasted_hundredths"][row, unit_count]) / HP_SCALE,  # wasted_hp
+        perfect_units,  # perfect_grind_units
+        perfect_pool / HP_SCALE,  # perfect_grind_hp
+        -(-perfect_pool // src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS),  # perfect_grind_lords
+    )
+
+
+def calculate_reverse_farm(target_demons: int, unit_hp: float, unit_gold_cost: int, lut_path=LUT_FILE_PATH):
+    """Drop-in for src.core.calculate_reverse_farm that reads from the LUT when possible."""
+    try:
+        hp_hundredths = src.core.to_hundredths(unit_hp)
+    except (ValueError, OverflowError):
+        hp_hundredths = None
+    found = _lookup(hp_hundredths, lut_path)
+    if found is None or not 0 <= target_demons < found[1]["reverse_units"].shape[1]:
+        return src.core.calculate_reverse_farm(target_demons, unit_hp, unit_gold_cost)
+    row, columns = found
+
+    needed_units = int(columns["reverse_units"][row, target_demons])
+    pool = needed_units * hp_hundredths
+    actual_demons_yield = pool / src.core.DEMON_HP_HUNDREDTHS
+    total_gold_cost = needed_units * unit_gold_cost if unit_gold_cost > 0 else 0
+    gold_per_demon = total_gold_cost / actual_demons_yield if actual_demons_yield > 0 and total_gold_cost > 0 else 0
+    return src.core.ReverseResult(
+        target_demons,
+        hp_hundredths / HP_SCALE,  # unit_hp
+        unit_gold_cost,
+        needed_units,
+        int(columns["reverse_pit_lords"][row, target_demons]),  # needed_pit_lords
+        pool / HP_SCALE,  # actual_hp_pool
+        actual_demons_yield,
+        int(columns["reverse_wasted_hundredths"][row, target_demons]) / HP_SCALE,  # wasted_hp
+        total_gold_cost,
+        gold_per_demon,
+    )
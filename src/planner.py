@@ -0,0 +1,149 @@
+"""
+Optimal sacrifice planner: the cheapest unit mix that yields at least N demons.
+
+Every unit is sacrificed in whole "perfect stacks" (from the perfect-stack index), so each
+stack's HP is an exact multiple of DEMON_HP and no HP is wasted. Choosing how many
+perfect stacks of each unit to use is then an integer knapsack over the demon
+count, solved with NumPy-vectorized dynamic programming.
+"""
+import numpy as np
+
+import src.core
+from src.config import HP_SCALE
+
+
+def _candidate_items(units: list, fa_level: int, artifact_bonus: int, pit_lord_count, owned, perfect_stacks) -> list:
+    """
+    Builds one knapsack item per usable unit:
+    (unit_name, units_per_block, hp_hundredths_per_block, demons_per_block, gold_per_block, max_blocks or None).
+    """
+    items = []
+    for unit in units:
+        unit_name, base_hp, gold_cost = unit["unit_name"], unit["hp"], unit["gold_cost"]
+        if owned is not None and owned.get(unit_name, 0) <= 0:
+            continue
+        if owned is None and gold_cost <= 0:
+            continue
+
+        block_units, block_hp, _ = src.core.lookup_perfect_stack(perfect_stacks, unit_name, base_hp, fa_level, artifact_bonus)
+        if block_hp <= 0:
+            continue
+
+        max_blocks = None
+        if owned is not None:
+            max_blocks = owned[unit_name] // block_units
+        if pit_lord_count is not None:
+            lord_cap = src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS * pit_lord_count // block_hp
+            max_blocks = lord_cap if max_blocks is None else min(max_blocks, lord_cap)
+        if max_blocks == 0:
+            continue
+
+        items.append((unit_name, block_units, block_hp, block_hp // src.core.DEMON_HP_HUNDREDTHS, block_units * gold_cost, max_blocks))
+    return items
+
+
+def _add_unbounded(dp: np.ndarray, demons: int, cost: int) -> np.ndarray:
+    """dp'[j] = min over k >= 0 of dp[j - k*demons] + k*cost, one residue class per column."""
+    size = len(dp)
+    rows = -(-size // demons)
+    padded = np.full(rows * demons, np.inf)
+    padded[:size] = dp
+    grid = padded.reshape(rows, demons)
+    steps = (np.arange(rows) * cost)[:, None]
+    return (np.minimum.accumulate(grid - steps, axis=0) + steps).ravel()[:size]
+
+
+def _add_once(dp: np.ndarray, demons: int, cost: int) -> np.ndarray:
+    """0/1 knapsack step: dp'[j] = min(dp[j], dp[j - demons] + cost)."""
+    new = dp.copy()
+    if demons < len(dp):
+        np.minimum(new[demons:], dp[:-demons] + cost, out=new[demons:])
+    return new
+
+
+def plan_cheapest_sacrifice(target_demons: int, units: list, fa_level: int = 0, artifact_bonus: int = 0,
+                            pit_lord_count: int = None, owned: dict = None, perfect_stacks: dict = None) -> dict:
+    """
+    Finds the cheapest combination of perfect stacks producing at least `target_demons`.
+
+    Args:
+        units: catalog rows with unit_name, hp and gold_cost (e.g. db.get_all_unit_details()).
+        pit_lord_count: if given, no single stack may need more Pit Lords than this.
+        owned: optional {unit_name: count} limiting the search to stacks the player has.
+        perfect_stacks: the perfect-stack index for `units` (db.get_perfect_stack_index());
+            stacks it does not cover are computed.
+
+    Returns:
+        A dictionary with the chosen stacks and totals, or {"error": ...}.
+    """
+    if target_demons <= 0:
+        return {"error": "Target demons must be positive."}
+
+    items = _candidate_items(units, fa_level, artifact_bonus, pit_lord_count, owned, perfect_stacks)
+    if not items:
+        return {"error": "No unit can be sacrificed with these constraints."}
+
+    size = target_demons + max(item[3] for item in items)
+    dp = np.full(size, np.inf)
+    dp[0] = 0
+    snapshots = [dp]
+    steps = []
+
+    for index, (_, _, _, demons, cost, max_blocks) in enumerate(items):
+        if max_blocks is None:
+            dp = _add_unbounded(dp, demons, cost)
+            steps.append((index, None))
+            snapshots.append(dp)
+            continue
+        remaining, chunk = max_blocks, 1
+        while remaining > 0:
+            blocks = min(chunk, remaining)
+            dp = _add_once(dp, demons * blocks, cost * blocks)
+            steps.append((index, blocks))
+            snapshots.append(dp)
+            remaining -= blocks
+            chunk *= 2
+
+    best_demons = target_demons + int(np.argmin(dp[target_demons:]))
+    if not np.isfinite(dp[best_demons]):
+        return {"error": f"Cannot reach {target_demons} demons with these constraints."}
+
+    blocks_used = [0] * len(items)
+    j = best_demons
+    for step in range(len(steps), 0, -1):
+        index, blocks = steps[step - 1]
+        demons = items[index][3]
+        current, previous = snapshots[step], snapshots[step - 1]
+        if blocks is None:
+            while current[j] != previous[j]:
+                blocks_used[index] += 1
+                j -= demons
+        elif current[j] != previous[j]:
+            blocks_used[index] += blocks
+            j -= demons * blocks
+
+    stacks = []
+    for (unit_name, block_units, block_hp, demons, cost, _), used in zip(items, blocks_used):
+        if used == 0:
+            continue
+        stack_hp = block_hp * used
+        stacks.append({
+            "unit_name": unit_name,
+            "units": block_units * used,
+            "hp": stack_hp / HP_SCALE,
+            "demons": demons * used,
+            "pit_lords": -(-stack_hp // src.core.PIT_LORD_GRIND_RATE_HUNDREDTHS),
+            "gold_cost": cost * used,
+        })
+    stacks.sort(key=lambda stack: stack["demons"], reverse=True)
+
+    total_gold_cost = int(dp[best_demons])
+    return {
+        "target_demons": target_demons,
+        "demons": best_demons,
+        "total_gold_cost": total_gold_cost,
+        "gold_per_demon": total_gold_cost / best_demons,
+        "wasted_hp": 0.0,
+        "max_pit_lords": max(stack["pit_lords"] for stack in stacks),
+        "stacks": stacks,
+    }
@@ -0,0 +1,105 @@
+"""
+Opt-in call timing for the calculators, renderers and db queries the app calls.
+
+Enabled with `python main.py --profile` or the DEMON_CALC_PROFILE=1 environment
+variable. enable() replaces each function listed in PROFILED_FUNCTIONS with a
+thin timing wrapper, in the module the app looks it up from (so the memoized
+calculators bound in src.cli are timed, not the src.core functions they wrap),
+and prints a per-function report (calls, total, p50/p95/p99) to stderr at exit.
+When profiling is off nothing is wrapped, so the normal code path carries no
+overhead at all.
+"""
+import atexit
+import functools
+import importlib
+import inspect
+import os
+import sys
+import time
+
+PROFILE_ENV_VAR = "DEMON_CALC_PROFILE"
+PROFILED_FUNCTIONS = {
+    "src.cli": ("calculate_demon_farm", "calculate_reverse_farm", "_calculate_chart_data"),
+    "src.planner": ("plan_cheapest_sacrifice",),
+    "src.analytics": ("game_analytics",),
+    "src.views": (
+        "display_main_menu", "display_results", "display_unit_selection_table", "display_distribution_chart",
+        "display_game_summary", "display_game_analytics", "display_reverse_results", "display_sacrifice_plan",
+    ),
+    "src.db": (
+        "initialize_database", "get_factions", "get_units_by_faction", "get_all_unit_details", "get_all_artifacts",
+        "get_or_create_game", "update_game_stats", "get_game_artifacts", "set_game_artifacts", "get_game_context",
+        "log_calculation", "flush_logs", "get_game_log_summary", "get_games_page", "delete_game",
+    ),
+}
+
+_timings = {}
+_enabled = False
+
+
+def requested() -> bool:
+    """True if the environment asks for profiling."""
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() not in ("", "0", "false", "no")
+
+
+def _timed(name: str, func):
+    samples = _timings.setdefault(name, [])
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - started)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def enable(functions=PROFILED_FUNCTIONS):
+    """Wraps the listed {module: function names} and registers the exit report. Idempotent."""
+    global _enabled
+    for module_name, names in functions.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            obj = getattr(module, name)
+            if getattr(obj, "__profiled__", False) or inspect.isgeneratorfunction(inspect.unwrap(obj)):
+                continue  # already wrapped, or a context manager whose body would not be timed
+            setattr(module, name, _timed(f"{module_name.rsplit('.', 1)[-1]}.{name}", obj))
+
+    if not _enabled:
+        _enabled = True
+        atexit.register(print_report)
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def get_report() -> list:
+    """Returns (name, calls, total_s, p50_s, p95_s, p99_s) for every called function, slowest total first."""
+    rows = []
+    for name, samples in _timings.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        rows.append((
+            name, len(ordered), sum(ordered),
+            _percentile(ordered, 0.50), _percentile(ordered, 0.95), _percentile(ordered, 0.99),
+        ))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def print_report(stream=None):
+    """Prints the timing table (microseconds per call, milliseconds total)."""
+    stream = stream or sys.stderr
+    rows = get_report()
+    if not rows:
+        return
+    print("--- Profile report ---", file=stream)
+    print(f"  {'function':<36}{'calls':>8}{'total ms':>11}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}", file=stream)
+    for name, calls, total, p50, p95, p99 in rows:
+        print(f"  {name:<36}{calls:>8}{total * 1e3:>11.2f}{p50 * 1e6:>10.1f}{p95 * 1e6:>10.1f}{p99 * 1e6:>10.1f}", file=stream)
@@ -0,0 +1,135 @@
+"""
+Query-plan regression check for src/db.py.
+
+Runs every db function against a scratch database, records each SQL statement
+it sends to SQLite and asks EXPLAIN QUERY PLAN how it will be executed.
+Any statement that plans a full table or index scan is reported, unless it is
+listed verbatim in FULL_SCAN_ALLOWED (queries that read a whole table on purpose).
+"""
+import tempfile
+from pathlib import Path
+
+import src.db as db
+
+_PLANNED_PREFIXES = ("SELECT", "UPDATE", "DELETE", "INSERT")
+
+
+def _normalize(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+# Exact statements (whitespace-normalized) that intentionally read whole tables or indexes.
+FULL_SCAN_ALLOWED = frozenset(_normalize(statement) for statement in (
+    # catalog load
+    "SELECT unit_name, faction, hp, is_upgraded, gold_cost FROM units ORDER BY hp, unit_id",
+    "SELECT * FROM artifacts ORDER BY hp_bonus, name",
+    # schema setup
+    "SELECT name FROM schema_migrations",
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'game_unit_totals'",
+    # rebuild_game_unit_totals
+    """
+    INSERT INTO game_unit_totals (game_id_fk, unit_name, total_units_ground, total_demons_gained, total_hp_wasted, log_count)
+    SELECT game_id_fk, unit_name, SUM(unit_count_input), SUM(demons_gained), SUM(wasted_hp), COUNT(*)
+    FROM calculation_logs
+    GROUP BY game_id_fk, unit_name
+    """,
+    # get_games_page, first unfiltered page: an index scan stopped by LIMIT
+    """
+    SELECT game_id, name, date(created_at) AS created_on
+    FROM games INDEXED BY idx_games_name_nocase
+    ORDER BY name COLLATE NOCASE, game_id
+    LIMIT ?
+    """,
+))
+
+
+def _run_workload():
+    """Calls every query in src/db.py at least once."""
+    db.initialize_database(force=True)
+    db.invalidate_catalog()
+    db.get_factions()
+    db.get_units_by_faction("Inferno", False)
+    db.get_unit_hp("Imp")
+    db.get_all_units()
+    db.get_all_artifacts()
+
+    game = db.get_or_create_game("query-plan-check")
+    db.get_or_create_game("query-plan-check")
+    game_id = game["game_id"]
+    db.update_game_stats(game_id, 10, 2)
+    db.set_game_artifacts(game_id, [1, 4])
+    db.get_game_artifacts(game_id)
+    db.get_game_hp_bonus(game_id)
+    db.get_game_context(game_id)
+    db.log_calculation(game_id, "Imp", 4.0, 5.0, 100, 10, 11.43, 15.0)
+    db.flush_logs()
+    db.insert_imported_logs([(game_id, "2025-01-01 00:00:00", "Imp", 4.0, 5.0, 100, 10, 11.43, 15.0, b"query-plan-check")])
+    db.get_game_log_summary(game_id)
+    list(db.iter_calculation_logs(0))
+    list(db.read_game_logs_frames(game_id))
+    db.rebuild_game_unit_totals()
+    db.get_games_page()
+    db.get_games_page("query", ("query-plan-check", game_id), 5)
+    db.delete_game(game_id)
+
+
+def collect_statements() -> list:
+    """
+    Runs the workload on a scratch database and returns the distinct
+    (statement, parameters) pairs that reached SQLite.
+    """
+    from sqlalchemy import event
+
+    seen = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if executemany and parameters:
+            parameters = parameters[0]
+        seen.setdefault(_normalize(statement), (statement, parameters))
+
+    previous_database = db.get_engine().url.render_as_string(hide_password=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.configure_database(f"sqlite:///{Path(tmp) / 'query_plans.db'}")
+        engine = db.get_engine()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            _run_workload()
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        try:
+            return [(statement, parameters, _explain(statement, parameters)) for statement, parameters in seen.values()]
+        finally:
+            db.configure_database(previous_database)
+
+
+def _explain(statement: str, parameters) -> list:
+    """Returns the EXPLAIN QUERY PLAN detail lines for a planned statement."""
+    if not _normalize(statement).upper().startswith(tuple(p.upper() for p in _PLANNED_PREFIXES)):
+        return []
+    with db.unit_of_work() as con:
+        rows = con.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    return [row[-1] for row in rows]
+
+
+def is_full_scan(detail: str) -> bool:
+    """
+    True for plan steps that walk a whole table or index. Bounded lookups show up as
+    SEARCH (rowid or index ranges); any SCAN, even "USING INDEX", reads every entry.
+    """
+    return detail.startswith("SCAN ") and detail != "SCAN CONSTANT ROW"
+
+
+def check_query_plans() -> list:
+    """
+    Returns a list of (statement, plan_detail) for every unexpected full table scan.
+    An empty list means all queries use indexes.
+    """
+    problems = []
+    for statement, _, plan in collect_statements():
+        normalized = _normalize(statement)
+        if normalized in FULL_SCAN_ALLOWED:
+            continue
+        for detail in plan:
+            if is_full_scan(detail):
+                problems.append((normalized, detail))
+    return problems
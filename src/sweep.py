@@ -0,0 +1,94 @@
+"""
+Parallel scenario sweeps over unit x count x Pit Lords x First Aid x artifact bonus grids.
+
+The grid is flattened into one index range, cut into chunks and spread over a
+ProcessPoolExecutor. Each chunk comes back as a compact structured NumPy array
+and is copied into its slot of the preallocated result, so output order never
+depends on which worker finishes first.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import src.core
+import src.lut
+
+SWEEP_DTYPE = np.dtype([
+    ("total_hp_pool", np.float64),
+    ("max_demons_from_hp", np.float64),
+    ("actual_demons_gained", np.float64),
+    ("needed_pit_lords", np.int32),
+    ("wasted_hp", np.float64),
+])
+
+
+def _sweep_chunk(axes: tuple, start: int, stop: int) -> np.ndarray:
+    """Computes flat grid indices [start, stop) and returns them as a SWEEP_DTYPE array."""
+    base_hp, counts, pit_lords, fa_levels, bonuses = axes
+    shape = tuple(len(axis) for axis in axes)
+    hp_i, count_i, lords_i, fa_i, bonus_i = np.unravel_index(np.arange(start, stop), shape)
+
+    unit_hp = src.core.modified_hp_batch(base_hp[hp_i], bonuses[bonus_i], fa_levels[fa_i])
+    results = src.core.calculate_demon_farm_batch(
+        unit_hp, counts[count_i], pit_lords[lords_i], src.lut.perfect_stack_batch(unit_hp)
+    )
+
+    chunk = np.empty(stop - start, dtype=SWEEP_DTYPE)
+    for field in SWEEP_DTYPE.names:
+        chunk[field] = results[field]
+    return chunk
+
+
+def run_sweep(base_hp, counts, pit_lords, fa_levels=src.core.FIRST_AID_LEVELS, artifact_bonuses=(0,),
+              workers: int = None, chunk_size: int = 500_000) -> np.ndarray:
+    """
+    Evaluates every combination of the given axes.
+
+    Returns:
+        A SWEEP_DTYPE array of shape (len(base_hp), len(counts), len(pit_lords),
+        len(fa_levels), len(artifact_bonuses)).
+    """
+    axes = (
+        np.asarray(base_hp, dtype=np.float64),
+        np.asarray(counts, dtype=np.int64),
+        np.asarray(pit_lords, dtype=np.int64),
+        np.asarray(fa_levels, dtype=np.int64),
+        np.asarray(artifact_bonuses, dtype=np.int64),
+    )
+    shape = tuple(len(axis) for axis in axes)
+    total = int(np.prod(shape))
+    bounds = [(start, min(start + chunk_size, total)) for start in range(0, total, chunk_size)]
+    result = np.empty(total, dtype=SWEEP_DTYPE)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            result[start:stop] = _sweep_chunk(axes, start, stop)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_sweep_chunk, axes, start, stop) for start, stop in bounds]
+            for (start, stop), future in zip(bounds, futures):
+                result[start:stop] = future.result()
+
+    return result.reshape(shape)
+
+
+def run_roster_sweep(counts, pit_lords, workers: int = None, chunk_size: int = 500_000) -> tuple:
+    """
+    Sweeps every unit in the database over the count and Pit Lord ranges,
+    all First Aid levels and every reachable artifact bonus.
+
+    Returns:
+        (unit_names, artifact_bonuses, results) where results is indexed
+        [unit, count, pit_lords, fa_level, artifact_bonus].
+    """
+    import src.db as db
+
+    units = db.get_all_units()
+    artifact_bonuses = src.core.artifact_bonus_combinations([art["hp_bonus"] for art in db.get_all_artifacts()])
+    results = run_sweep(
+        [hp for _, hp in units], counts, pit_lords,
+        artifact_bonuses=artifact_bonuses, workers=workers, chunk_size=chunk_size
+    )
+    return [name for name, _ in units], artifact_bonuses, results
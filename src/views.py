@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -14,6 +16,7 @@ def display_main_menu():
         "[bold cyan][1][/bold cyan] Simple Calculator ('Sandbox' Mode)\n"
         "[bold cyan][2][/bold cyan] Game Mode (Load/Create)\n"
         "[bold cyan][3][/bold cyan] Reverse Calculator (Demons -> Units)\n"
+        "[bold cyan][4][/bold cyan] Sacrifice Planner (Cheapest Units -> Demons)\n"
         "\n"
         "[bold yellow][0][/bold yellow] Exit"
     )
@@ -28,14 +31,28 @@ def display_main_menu():
         )
     )
 
-def display_results(results: dict):
+@dataclass(slots=True)
+class ResultContext:
+    """
+    Presentation-only data shown next to a FarmResult: the unit's gold cost,
+    the Pit Lords the player entered and, in Game Mode, the HP modifiers.
+    """
+    gold_cost: int = 0
+    pit_lord_count: int = None
+    game_mode_data: dict = None
+
+def display_results(results, context: ResultContext = None):
     """
     Displays a formatted calculation report using rich.
     Handles both simple mode and game mode (with HP modifiers).
+    Old-style result dicts carrying 'gold_cost'/'game_mode_data' keys are still accepted.
     """
+    if context is None:
+        context = ResultContext(results.get("gold_cost", 0), None, results.get("game_mode_data"))
     
-    game_mode_data = results.get("game_mode_data")
-    unit_gold_cost = results.get("gold_cost", 0)
+    game_mode_data = context.game_mode_data
+    unit_gold_cost = context.gold_cost
+    pit_lord_count = results['pit_lord_count'] if context.pit_lord_count is None else context.pit_lord_count
     
     hp_section = ""
     if game_mode_data:
@@ -62,9 +79,9 @@ def display_results(results: dict):
             f"    ├─ Unit HP:         {results['unit_hp']}\n"
         )
 
-    pit_lord_section = f"    └─ Pit Lords Used:  {results['pit_lord_count']}\n"
+    pit_lord_section = f"    └─ Pit Lords Used:  {pit_lord_count}\n"
     if game_mode_data and 'base_hp' in game_mode_data:
-        pit_lord_section = f"    └─ Pit Lords Used:  {results['pit_lord_count']}\n"
+        pit_lord_section = f"    └─ Pit Lords Used:  {pit_lord_count}\n"
 
     unit_display_name = "Custom"
     if game_mode_data:
@@ -325,6 +342,49 @@ def display_game_summary(game_name: str, summary_data: list):
     
     console.print(table)
 
+def _percent(value) -> str:
+    return "-" if value != value else f"{value * 100:.1f}%"
+
+def display_game_analytics(game_name: str, sessions, totals: dict):
+    """Displays per-session analytics (from src.analytics) for a game."""
+    if not totals:
+        console.print(Panel(f"[yellow]No logs found for game '{game_name}'.[/yellow]", title="Empty Analytics"))
+        return
+
+    table = Table(title=f"Session Analytics: '{game_name}'", border_style="green", padding=(0, 1))
+    table.add_column("#", style="cyan", justify="right")
+    table.add_column("Started", style="cyan")
+    table.add_column("Length", justify="right")
+    table.add_column("Calcs", justify="right")
+    table.add_column("Demons", style="green", justify="right")
+    table.add_column("Waste", style="red", justify="right")
+    table.add_column("Gold/Demon", style="yellow", justify="right")
+    table.add_column(f"vs {DEMON_GOLD_COST}g", style="yellow", justify="right")
+    table.add_column("Lord Use", style="#FC591E", justify="right")
+
+    def add_row(label, started, length, row, style=""):
+        gold_per_demon = row["gold_per_demon"]
+        table.add_row(
+            label, started, length, f"{row['calculations']:.0f}", f"{row['demons']:.2f}",
+            _percent(row["waste_ratio"]),
+            "-" if gold_per_demon != gold_per_demon else f"{gold_per_demon:,.0f}",
+            "-" if row["gold_efficiency"] != row["gold_efficiency"] else f"{row['gold_efficiency']:.2f}x",
+            _percent(row["lord_utilization"]),
+            style=style
+        )
+
+    for number, row in enumerate(sessions.to_dict("records"), start=1):
+        minutes = (row["end"] - row["start"]).total_seconds() / 60
+        add_row(str(number), row["start"].strftime("%Y-%m-%d %H:%M"), f"{minutes:.0f} min", row)
+
+    table.add_section()
+    add_row("[bold]ALL[/bold]", f"{totals['sessions']} sessions", "", totals, style="bold")
+    console.print(table)
+    console.print(
+        f"  [dim]Gold/Demon and 'vs {DEMON_GOLD_COST}g' count only units with a gold cost; "
+        f"above 1.00x sacrificing beats buying demons. Lord Use = HP ground / Pit Lord capacity.[/dim]"
+    )
+
 def display_reverse_results(results: dict, unit_name: str):
     """Displays the results for the Reverse Calculator."""
     
@@ -364,4 +424,45 @@ def display_reverse_results(results: dict, unit_name: str):
         title="Reverse Calculator Results",
         border_style="cyan",
         padding=1
-    ))
\ No newline at end of file
+    ))
+
+def display_sacrifice_plan(plan: dict):
+    """Displays the cheapest unit mix found by the Sacrifice Planner."""
+    
+    table = Table(title=f"Sacrifice Plan: {plan['target_demons']} Demons", border_style="cyan", padding=(0, 1))
+    table.add_column("Unit", style="cyan", min_width=20)
+    table.add_column("Units", style="magenta", justify="right")
+    table.add_column("HP", justify="right")
+    table.add_column("Demons", style="green", justify="right")
+    table.add_column("Pit Lords", style="#FC591E", justify="right")
+    table.add_column("Gold", style="yellow", justify="right")
+
+    for stack in plan['stacks']:
+        table.add_row(
+            stack['unit_name'],
+            f"{stack['units']}",
+            f"{stack['hp']:,.0f}",
+            f"{stack['demons']}",
+            f"{stack['pit_lords']}",
+            f"{stack['gold_cost']:,}"
+        )
+
+    profit_loss = DEMON_GOLD_COST - plan['gold_per_demon']
+    profit_style = "bold green" if profit_loss > 0 else "bold red"
+
+    table.add_section()
+    table.add_row(
+        "[bold]TOTAL[/bold]",
+        "",
+        "",
+        f"[bold green]{plan['demons']}[/bold green]",
+        f"[bold]max {plan['max_pit_lords']}[/bold]",
+        f"[bold yellow]{plan['total_gold_cost']:,}[/bold yellow]"
+    )
+    
+    console.print(table)
+    console.print(
+        f"  Cost per Demon: [bold yellow]{plan['gold_per_demon']:,.0f} gold[/bold yellow] "
+        f"([{profit_style}]{profit_loss:+,.0f} gold / demon vs buying[/{profit_style}]) | "
+        f"Wasted HP: [dim]{plan['wasted_hp']:.2f}[/dim]"
+    )
@@ -0,0 +1,17 @@
+import contextlib
+import io
+
+import pytest
+
+import src.db as db
+
+
+@pytest.fixture(autouse=True)
+def scratch_db(tmp_path):
+    """Points src.db at a fresh, initialized database file for the duration of a test."""
+    previous_database = db.get_engine().url.render_as_string(hide_password=False)
+    db.configure_database(f"sqlite:///{tmp_path / 'test.db'}")
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        db.initialize_database()
+    yield db
+    db.configure_database(previous_database)
@@ -0,0 +1,13 @@
+import src.analytics as analytics
+import src.db as db
+
+
+def test_hp_columns_keep_hundredths():
+    game_id = db.get_or_create_game("Analytics")["game_id"]
+    db.log_calculation(game_id, "Custom Unit", 1234.57, 1234.57, 100_000, 0, 0, 0.57)
+    db.log_calculation(game_id, "Custom Unit", 4.55, 4.55, 3, 0, 0, 0.25)
+
+    logs = analytics.add_derived_columns(analytics.load_game_logs(game_id))
+    assert logs["unit_hp_modified"].dtype == "float64"
+    assert logs["hp_pool"].tolist() == [1234.57 * 100_000, 4.55 * 3]
+    assert logs["wasted_hp"].tolist() == [0.57, 0.25]
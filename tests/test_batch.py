@@ -0,0 +1,61 @@
+import io
+import json
+
+from src.batch import run_batch
+
+
+def _run(text: str, input_format: str = "jsonl", reverse: bool = False) -> tuple:
+    output, errors = io.StringIO(), io.StringIO()
+    written = run_batch(io.StringIO(text), output, input_format=input_format, output_format="jsonl",
+                        reverse=reverse, errors=errors)
+    return written, [json.loads(line) for line in output.getvalue().splitlines()], errors.getvalue()
+
+
+def test_bad_jsonl_lines_are_reported_and_the_stream_continues():
+    text = "\n".join([
+        '{"hp": 4, "count": 10}',
+        '{"hp": 4, "count": ',
+        '[4, 10]',
+        '{"hp": 13, "count": 3}',
+    ]) + "\n"
+    written, records, errors = _run(text)
+
+    assert written == 2
+    assert [record["unit_hp_base"] for record in records] == [4.0, 13.0]
+    assert "line 2: skipped (invalid JSON" in errors
+    assert "line 3: skipped (expected a JSON object, got list)" in errors
+
+
+def test_reverse_rows_without_positive_hp_are_reported():
+    text = "hp,target_demons\n0,5\n4,5\n-2,1\n"
+    written, records, errors = _run(text, input_format="csv", reverse=True)
+
+    assert written == 1
+    assert records[0]["needed_units"] == 44
+    assert errors.count("modified HP must be positive") == 2
+    assert "line 2:" in errors and "line 4:" in errors
+
+
+def test_errors_name_the_physical_line():
+    jsonl = '{"hp": 4, "count": 1}\n\n\n{"hp": 4}\n'
+    _, _, errors = _run(jsonl)
+    assert errors.startswith("line 4: skipped")
+
+    text = 'unit_name,hp,count\n"Two\nlines",4,1\n\nx,4,\n'
+    written, _, errors = _run(text, input_format="csv")
+    assert written == 1
+    assert errors.startswith("line 5: skipped")
+
+
+def test_counts_outside_int64_are_skipped_not_fatal():
+    text = "\n".join([
+        '{"hp": 4, "count": 100000000000000000000}',
+        '{"hp": 4, "count": 5, "pit_lords": 100000000000000000000}',
+        '{"hp": 1000, "count": 100000000000000000}',
+        '{"hp": 4, "count": 5, "artifacts": 100000000000000000000}',
+        '{"hp": 4, "count": 10}',
+    ]) + "\n"
+    written, records, errors = _run(text)
+
+    assert written == 1 and records[0]["unit_count"] == 10
+    assert [line.split(":")[0] for line in errors.splitlines()] == ["line 1", "line 2", "line 3", "line 4"]
@@ -0,0 +1,51 @@
+import dataclasses
+
+import pytest
+
+import src.core as core
+
+
+def test_results_behave_like_the_old_dicts():
+    result = core.calculate_demon_farm(4.4, 875, 77)
+    as_dict = result.to_dict()
+
+    assert dict(result) == as_dict
+    assert list(result) == list(as_dict)
+    assert len(result) == len(as_dict)
+    assert dict(result.items()) == as_dict
+    assert result["wasted_hp"] == result.wasted_hp == result.get("wasted_hp")
+    assert "needed_pit_lords" in result and "missing" not in result
+    assert result.get("missing", 1) == 1
+    with pytest.raises(KeyError):
+        result["missing"]
+
+
+def test_reverse_result_unpacks_into_keyword_arguments():
+    result = core.calculate_reverse_farm(40, 4.4, 50)
+    assert (lambda **fields: fields)(**result) == result.to_dict()
+
+
+def test_first_aid_keeps_hundredths_exact():
+    assert core.modified_hp(12.5, 0, 3) == 16.25
+    assert core.modified_hp_batch([12.5], [0], [3]).tolist() == [16.25]
+
+    result = core.calculate_demon_farm(16.25, 28, 10)
+    assert result.perfect_grind_units == 28
+    assert result.wasted_hp == 0
+    assert result.max_demons_from_hp == 13
+
+
+def test_memoized_results_cannot_be_changed_by_a_caller():
+    calculate = core.memoize(maxsize=8)(core.calculate_demon_farm)
+    expected = core.calculate_demon_farm(4.4, 875, 77)
+
+    result = calculate(4.4, 875, 77)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        result.wasted_hp = 999
+    assert calculate(4.4, 875, 77) == expected
+
+    reverse = core.memoize(maxsize=8)(core.calculate_reverse_farm)
+    error = reverse(5, 0, 50)
+    error["error"] = "changed"
+    assert reverse(5, 0, 50) == core.calculate_reverse_farm(5, 0, 50)
+    assert reverse.cache_info().hits == 1
@@ -0,0 +1,56 @@
+import pytest
+
+import src.db as db
+
+
+def _values():
+    with db.unit_of_work() as con:
+        return [row[0] for row in con.exec_driver_sql("SELECT x FROM t ORDER BY x").fetchall()]
+
+
+@pytest.fixture
+def table():
+    with db.unit_of_work() as con:
+        con.exec_driver_sql("CREATE TABLE t (x INTEGER PRIMARY KEY)")
+
+
+def test_failed_nested_block_undoes_only_its_own_work(table):
+    with db.unit_of_work() as con:
+        con.exec_driver_sql("INSERT INTO t VALUES (1)")
+        with pytest.raises(Exception):
+            with db.unit_of_work() as inner:
+                inner.exec_driver_sql("INSERT INTO t VALUES (2)")
+                inner.exec_driver_sql("INSERT INTO t VALUES (1)")
+        con.exec_driver_sql("INSERT INTO t VALUES (3)")
+    assert _values() == [1, 3]
+
+
+def test_failed_outer_block_undoes_committed_nested_blocks(table):
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work():
+            with db.unit_of_work() as inner:
+                inner.exec_driver_sql("INSERT INTO t VALUES (1)")
+            raise RuntimeError
+    assert _values() == []
+
+
+def test_games_page_prefix_is_case_insensitive_and_bounded():
+    for name in ("@home", "[x]", "_test", "Alpha", "ALPINE", "alpaca", "Beta"):
+        db.get_or_create_game(name)
+
+    def names(prefix, after=None, limit=20):
+        return [game["name"] for game in db.get_games_page(prefix, after, limit)]
+
+    assert names("@") == ["@home"]
+    assert names("ALP") == ["alpaca", "Alpha", "ALPINE"]
+    first = db.get_games_page("alp", limit=2)
+    assert names("alp", (first[-1]["name"], first[-1]["game_id"])) == ["ALPINE"]
+
+
+def test_game_summary_keeps_hundredths_of_wasted_hp():
+    game_id = db.get_or_create_game("Waste")["game_id"]
+    for waste in (0.25, 0.1, 0.2):
+        db.log_calculation(game_id, "Imp", 4, 4.55, 3, 0, 0, waste)
+
+    (row,) = db.get_game_log_summary(game_id)
+    assert row["total_hp_wasted"] == 0.55
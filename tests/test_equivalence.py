@@ -0,0 +1,213 @@
+"""The batch, sweep, LUT and chart paths must agree with the scalar calculators over the whole catalog."""
+import csv
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+import src.cli as cli
+import src.core as core
+import src.db as db
+import src.lut as lut
+from src.batch import FARM_FIELDS, REVERSE_FIELDS, run_batch
+from src.config import LUT_FILE_PATH
+from src.sweep import SWEEP_DTYPE, run_sweep
+
+COUNTS = (0, 1, 7, 28, 150)
+TARGETS = (1, 5, 33)
+PIT_LORDS = 9
+
+
+@pytest.fixture
+def catalog_bonuses():
+    return core.artifact_bonus_combinations([art["hp_bonus"] for art in db.get_all_artifacts()])
+
+
+@pytest.fixture
+def catalog_hp(catalog_bonuses):
+    """Every (base_hp, first_aid, bonus, modified_hp) reachable with the catalog."""
+    return sorted({
+        (base_hp, fa_level, bonus, core.modified_hp(base_hp, bonus, fa_level))
+        for base_hp in {hp for _, hp in db.get_all_units()}
+        for fa_level in core.FIRST_AID_LEVELS
+        for bonus in catalog_bonuses
+    })
+
+
+def _batch(rows: list, reverse: bool) -> list:
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    output, errors = io.StringIO(), io.StringIO()
+    run_batch(io.StringIO(text.getvalue()), output, output_format="jsonl", reverse=reverse, errors=errors)
+    assert errors.getvalue() == ""
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("with_lut", [False, True])
+def test_batch_farm_matches_scalar(catalog_hp, with_lut, request):
+    if with_lut:
+        request.getfixturevalue("default_lut")
+    scenarios = [(hp, fa, bonus, unit_hp, count) for hp, fa, bonus, unit_hp in catalog_hp for count in COUNTS]
+    records = _batch([
+        {"hp": hp, "count": count, "pit_lords": PIT_LORDS, "first_aid": fa, "artifacts": bonus}
+        for hp, fa, bonus, _, count in scenarios
+    ], reverse=False)
+
+    assert len(records) == len(scenarios)
+    for (_, _, _, unit_hp, count), record in zip(scenarios, records):
+        expected = core.calculate_demon_farm(unit_hp, count, PIT_LORDS)
+        assert {field: record[field] for field in FARM_FIELDS[4:]} == dict(expected)
+
+
+def test_batch_reverse_matches_scalar(catalog_hp):
+    scenarios = [(hp, fa, bonus, unit_hp, target) for hp, fa, bonus, unit_hp in catalog_hp for target in TARGETS]
+    records = _batch([
+        {"hp": hp, "target_demons": target, "first_aid": fa, "artifacts": bonus, "gold_cost": 100}
+        for hp, fa, bonus, _, target in scenarios
+    ], reverse=True)
+
+    assert len(records) == len(scenarios)
+    for (_, _, _, unit_hp, target), record in zip(scenarios, records):
+        expected = core.calculate_reverse_farm(target, unit_hp, 100)
+        assert {field: record[field] for field in REVERSE_FIELDS[4:]} == dict(expected)
+
+
+@pytest.mark.parametrize("with_lut", [False, True])
+def test_sweep_matches_scalar(catalog_bonuses, with_lut, request):
+    if with_lut:
+        request.getfixturevalue("default_lut")
+    base_hp = sorted({hp for _, hp in db.get_all_units()})
+    pit_lords = (0, PIT_LORDS)
+    grid = run_sweep(base_hp, COUNTS, pit_lords, artifact_bonuses=catalog_bonuses, workers=1)
+
+    for index in np.ndindex(grid.shape):
+        hp_i, count_i, lords_i, fa_i, bonus_i = index
+        unit_hp = core.modified_hp(base_hp[hp_i], catalog_bonuses[bonus_i], core.FIRST_AID_LEVELS[fa_i])
+        expected = core.calculate_demon_farm(unit_hp, COUNTS[count_i], pit_lords[lords_i])
+        assert {field: grid[index][field].item() for field in SWEEP_DTYPE.names} == {
+            field: expected[field] for field in SWEEP_DTYPE.names
+        }
+
+
+@pytest.fixture
+def small_lut(tmp_path):
+    path = tmp_path / "lut.npy"
+    lut.build_lut(path, max_count=max(COUNTS), max_demons=max(TARGETS))
+    yield path
+    lut.reset_lut()
+
+
+@pytest.fixture
+def default_lut(small_lut, monkeypatch):
+    """Serves small_lut to the sweep and batch paths, which read the configured LUT_FILE_PATH."""
+    monkeypatch.setitem(lut._tables, os.path.realpath(LUT_FILE_PATH), lut._open(small_lut))
+
+
+def test_lut_matches_scalar(catalog_hp, small_lut):
+    for _, _, _, unit_hp in catalog_hp:
+        assert lut._lookup(core.to_hundredths(unit_hp), small_lut) is not None
+        for count in COUNTS:
+            assert lut.calculate_demon_farm(unit_hp, count, PIT_LORDS, lut_path=small_lut) == (
+                core.calculate_demon_farm(unit_hp, count, PIT_LORDS)
+            )
+        for target in TARGETS:
+            assert lut.calculate_reverse_farm(target, unit_hp, 100, lut_path=small_lut) == (
+                core.calculate_reverse_farm(target, unit_hp, 100)
+            )
+
+
+def test_lut_tables_are_cached_per_path(small_lut, tmp_path):
+    other = tmp_path / "other.npy"
+    lut.build_lut(other, max_count=3, max_demons=2)
+    assert lut.load_lut(small_lut)["farm_pit_lords"].shape[1] == max(COUNTS) + 1
+    assert lut.load_lut(other)["farm_pit_lords"].shape[1] == 4
+    assert lut.load_lut(tmp_path / "missing.npy") is None
+
+
+@pytest.mark.parametrize("damage", ["truncate", "garbage", "empty"])
+def test_damaged_lut_falls_back_to_the_calculators(small_lut, damage):
+    data = small_lut.read_bytes()
+    small_lut.write_bytes({"truncate": data[:len(data) // 2], "garbage": b"not a table" * 50, "empty": b""}[damage])
+
+    assert lut.load_lut(small_lut) is None
+    assert lut.calculate_demon_farm(7.5, 28, PIT_LORDS, lut_path=small_lut) == core.calculate_demon_farm(7.5, 28, PIT_LORDS)
+    assert lut.calculate_reverse_farm(5, 7.5, 100, lut_path=small_lut) == core.calculate_reverse_farm(5, 7.5, 100)
+    units, pool, lords = lut.perfect_stack_batch([7.5], small_lut)
+    assert (units[0], pool[0], lords[0]) == core.perfect_stack_hundredths(750)
+
+
+def test_lut_perfect_stacks_match_direct_computation(catalog_hp, small_lut):
+    unit_hp = [unit_hp for _, _, _, unit_hp in catalog_hp] + [0, -3.5, 0.01, 12345.67]
+    units, pool, lords = lut.perfect_stack_batch(unit_hp, small_lut)
+    for row, hp in enumerate(unit_hp):
+        assert (units[row], pool[row], lords[row]) == core.perfect_stack_hundredths(core.to_hundredths(hp))
+
+
+def test_chart_rows_match_scalar(catalog_hp):
+    for _, _, _, unit_hp in catalog_hp:
+        for row in cli._iter_chart_rows(unit_hp, 0, 80):
+            expected = core.calculate_demon_farm(unit_hp, row["count"], 0)
+            assert (row["demons"], row["waste"], row["lords"]) == (
+                expected.max_demons_from_hp, expected.wasted_hp, expected.needed_pit_lords
+            )
+
+
+def test_chart_marks_the_perfect_stacks_around_the_current_count(catalog_hp):
+    for _, _, _, unit_hp in catalog_hp[::7]:
+        results, rows, next_perfect = cli._calculate_chart_data(unit_hp, 40, PIT_LORDS)
+        assert results == core.calculate_demon_farm(unit_hp, 40, PIT_LORDS)
+        for row in rows:
+            if row.get("is_special"):
+                assert row["waste"] == 0 and row["count"] % results.perfect_grind_units == 0
+        assert next_perfect > 40 and next_perfect % results.perfect_grind_units == 0
+
+
+def test_perfect_stack_index_matches_direct_computation():
+    index = db.get_perfect_stack_index()
+    units = dict(db.get_all_units())
+    assert len(index) == len(units) * len(core.FIRST_AID_LEVELS) * len(
+        core.artifact_bonus_combinations([art["hp_bonus"] for art in db.get_all_artifacts()])
+    )
+    for (unit_name, fa_level, bonus), stack in index.items():
+        assert stack == core.perfect_stack_hundredths(core.modified_hp_hundredths(units[unit_name], bonus, fa_level))
+
+
+def test_batch_catalog_units_use_the_index_and_match_scalar():
+    units = db.get_all_units()
+    records = _batch([
+        {"unit_name": unit_name, "count": 13, "pit_lords": PIT_LORDS, "first_aid": 3, "artifacts": "Elixir of Life"}
+        for unit_name, _ in units
+    ], reverse=False)
+
+    assert len(records) == len(units)
+    for (_, base_hp), record in zip(units, records):
+        expected = core.calculate_demon_farm(core.modified_hp(base_hp, 2, 3), 13, PIT_LORDS)
+        assert {field: record[field] for field in FARM_FIELDS[4:]} == dict(expected)
+
+
+@pytest.mark.parametrize("unit_hp", [0.01, 4.4, 7.77, 13.0, 1000.0])
+def test_batch_matches_scalar_at_the_int64_boundary(unit_hp):
+    limit = np.iinfo(np.int64).max
+    largest = limit // core.to_hundredths(unit_hp)
+    counts = np.array([largest, largest - 1, largest // 3, min(largest, 2**53 + 1)])
+    lords = limit // 50
+
+    results = core.calculate_demon_farm_batch(unit_hp, counts, lords)
+    for row, count in enumerate(counts.tolist()):
+        expected = core.calculate_demon_farm(unit_hp, count, lords)
+        assert {field: results[field][row].item() for field in expected} == dict(expected)
+
+    with pytest.raises(ValueError):
+        core.calculate_demon_farm_batch(unit_hp, largest + 1, 0)
+    with pytest.raises(ValueError):
+        core.calculate_demon_farm_batch(unit_hp, 1, lords + 1)
+
+
+def test_batch_rejects_hp_that_does_not_fit():
+    for unit_hp in (float("nan"), float("inf"), 1e17):
+        with pytest.raises(ValueError):
+            core.calculate_demon_farm_batch(unit_hp, 1, 0)
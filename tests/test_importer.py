@@ -0,0 +1,107 @@
+import io
+import time
+
+import pytest
+
+import src.db as db
+from src.config import DEMON_HP, PIT_LORD_GRIND_RATE
+from src.batch import BatchInputError
+from src.importer import _parse_timestamp, import_logs
+
+CSV_SESSION = """game,timestamp,unit_name,count,pit_lords,first_aid,artifacts
+Alpha,2025-03-01 18:20:05,Imp,100,10,2,Ring of Vitality
+Alpha,1700000000,Imp,50,,,
+Beta,2025-03-01T18:21:00+00:00,Chochlik,75,4,0,
+Beta,2025-03-01 18:22:00,No Such Unit,5,1,0,
+"""
+
+
+def _import(text: str, input_format: str = "csv") -> dict:
+    errors = io.StringIO()
+    summary = import_logs(io.StringIO(text), input_format=input_format, errors=errors)
+    summary["errors"] = errors.getvalue()
+    return summary
+
+
+def test_parse_timestamp_accepts_iso_and_unix_seconds():
+    expected = "2023-11-14 22:13:20"
+    assert _parse_timestamp("1700000000") == expected
+    assert _parse_timestamp(" 1700000000.0 ") == expected
+    assert _parse_timestamp(1_700_000_000) == expected
+    assert _parse_timestamp("2023-11-15T00:13:20+02:00") == expected
+    assert _parse_timestamp("2025-03-01 18:20:05") == "2025-03-01 18:20:05"
+    assert _parse_timestamp("2025-03-01T18:20:05.250000") == "2025-03-01 18:20:05.250000"
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+@pytest.mark.parametrize("zone", ["UTC", "America/New_York", "Asia/Kolkata"])
+def test_content_hashes_do_not_depend_on_the_local_timezone(zone, monkeypatch):
+    monkeypatch.setenv("TZ", zone)
+    time.tzset()
+    try:
+        stamps = [_parse_timestamp(value) for value in (1_700_000_000, "2023-11-15T00:13:20+02:00", "2025-03-01 18:20:05")]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert stamps == ["2023-11-14 22:13:20", "2023-11-14 22:13:20", "2025-03-01 18:20:05"]
+
+
+@pytest.mark.parametrize("value", ["", None, "yesterday", "1e30", "nan"])
+def test_parse_timestamp_rejects_bad_values(value):
+    with pytest.raises((BatchInputError, ValueError)):
+        _parse_timestamp(value)
+
+
+def test_import_skips_bad_rows_and_recomputes_results():
+    summary = _import(CSV_SESSION)
+    assert (summary["rows"], summary["inserted"], summary["skipped"], summary["games"]) == (4, 3, 1, 2)
+    assert "line 5: skipped (unknown unit 'No Such Unit')" in summary["errors"]
+
+    alpha = db.get_or_create_game("Alpha")["game_id"]
+    totals = {row["unit_name"]: row for row in db.get_game_log_summary(alpha)}
+    # Imp has 4 HP. Row 1: (4 + 1) HP at First Aid 2 = 6 HP x 100, capped by 10 Pit Lords.
+    # Row 2 falls back to the new game's 0 Pit Lords, so it yields nothing.
+    assert totals["Imp"]["total_units_ground"] == 150
+    assert totals["Imp"]["total_demons_gained"] == pytest.approx(10 * PIT_LORD_GRIND_RATE / DEMON_HP)
+
+
+def test_reimport_is_deduplicated():
+    first = _import(CSV_SESSION)
+    second = _import(CSV_SESSION)
+    assert second["inserted"] == 0
+    assert second["duplicates"] == first["inserted"]
+
+    alpha = db.get_or_create_game("Alpha")["game_id"]
+    assert sum(row["total_units_ground"] for row in db.get_game_log_summary(alpha)) == 150
+
+
+def test_jsonl_and_csv_rows_share_content_hashes():
+    _import(CSV_SESSION)
+    jsonl = '{"game": "Alpha", "timestamp": "2025-03-01 18:20:05", "unit_name": "Imp", "count": 100, ' \
+            '"pit_lords": 10, "first_aid": 2, "artifacts": "Ring of Vitality"}\n'
+    assert _import(jsonl, "jsonl")["duplicates"] == 1
+
+
+def test_bad_jsonl_lines_are_skipped_not_fatal():
+    text = "\n".join([
+        '{"game": "Alpha", "timestamp": 1700000000, "unit_name": "Imp", "count": 10, "pit_lords": 1}',
+        'not json',
+        '"just a string"',
+        '{"game": "Alpha", "timestamp": 1700000060, "unit_name": "Imp", "count": 20, "pit_lords": 1}',
+    ]) + "\n"
+    summary = _import(text, "jsonl")
+    assert (summary["rows"], summary["inserted"], summary["skipped"]) == (4, 2, 2)
+    assert "line 2: skipped (invalid JSON" in summary["errors"]
+    assert "line 3: skipped (expected a JSON object, got str)" in summary["errors"]
+
+
+def test_rows_that_overflow_int64_are_skipped_not_fatal():
+    text = "\n".join([
+        '{"game": "Alpha", "timestamp": 1700000000, "unit_name": "Imp", "count": 10, "pit_lords": 1}',
+        '{"game": "Alpha", "timestamp": 1700000060, "unit_name": "Imp", "count": 99999999999999999999}',
+        '{"game": "Alpha", "timestamp": 1700000120, "unit_name": "Imp", "count": 10, "pit_lords": 999999999999999999}',
+        '{"game": "Alpha", "timestamp": 1700000180, "hp": 1e300, "count": 10}',
+    ]) + "\n"
+    summary = _import(text, "jsonl")
+    assert (summary["rows"], summary["inserted"], summary["skipped"]) == (4, 1, 3)
+    assert [line.split(":")[0] for line in summary["errors"].splitlines()] == ["line 2", "line 3", "line 4"]
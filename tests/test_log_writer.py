@@ -0,0 +1,54 @@
+from src.log_writer import LogWriter
+
+
+class FlakyWriter:
+    """Fails the first `failures` writes, and always fails rows listed in `poison`."""
+
+    def __init__(self, failures: int = 0, poison=()):
+        self.failures = failures
+        self.poison = set(poison)
+        self.written = []
+
+    def __call__(self, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        if self.poison.intersection(rows):
+            raise RuntimeError("constraint failed")
+        self.written.extend(rows)
+
+
+def test_failed_batch_is_retried_not_dropped(capsys):
+    write_rows = FlakyWriter(failures=1)
+    writer = LogWriter(write_rows, flush_interval=60)
+    writer.submit(1)
+    writer.submit(2)
+    assert writer.flush() is False
+    assert write_rows.written == []
+
+    writer.submit(3)
+    writer.close()
+    assert write_rows.written == [1, 2, 3]
+    assert "will retry" in capsys.readouterr().out
+
+
+def test_rows_that_keep_failing_are_written_one_by_one(capsys):
+    write_rows = FlakyWriter(poison={2})
+    writer = LogWriter(write_rows, flush_interval=60, max_attempts=2)
+    for row in (1, 2, 3):
+        writer.submit(row)
+    writer.close()
+    assert write_rows.written == [1, 3]
+    assert "Dropped 1 of 3 calculation logs" in capsys.readouterr().out
+
+
+def test_flush_reports_whether_everything_was_written():
+    write_rows = FlakyWriter(failures=1)
+    writer = LogWriter(write_rows, flush_interval=60)
+    assert writer.flush() is True
+
+    writer.submit(1)
+    assert writer.flush() is False
+    assert writer.flush() is True
+    assert write_rows.written == [1]
+    writer.close()
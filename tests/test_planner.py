@@ -0,0 +1,73 @@
+import itertools
+import random
+
+import pytest
+
+import src.core as core
+import src.db as db
+from src.planner import plan_cheapest_sacrifice
+
+HP_CHOICES = (4, 6, 7.5, 10, 13, 20, 25, 30, 40)
+
+
+def _brute_force(target: int, units: list, fa_level: int, bonus: int, pit_lord_count, owned) -> int:
+    """Cheapest gold for >= target demons with zero waste, trying every count of every perfect stack."""
+    options = []
+    for unit in units:
+        if owned is None and unit["gold_cost"] <= 0:
+            continue
+        block_units, block_hp, _ = core.perfect_stack_hundredths(core.modified_hp_hundredths(unit["hp"], bonus, fa_level))
+        demons = block_hp // core.DEMON_HP_HUNDREDTHS
+        limit = -(-target // demons)
+        if owned is not None:
+            limit = min(limit, owned.get(unit["unit_name"], 0) // block_units)
+        if pit_lord_count is not None:
+            limit = min(limit, core.PIT_LORD_GRIND_RATE_HUNDREDTHS * pit_lord_count // block_hp)
+        options.append([(blocks * demons, blocks * block_units * unit["gold_cost"]) for blocks in range(limit + 1)])
+
+    best = None
+    for choice in itertools.product(*options):
+        if sum(demons for demons, _ in choice) >= target:
+            cost = sum(gold for _, gold in choice)
+            best = cost if best is None else min(best, cost)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_planner_finds_the_brute_force_optimum(seed):
+    rng = random.Random(seed)
+    units = [
+        {"unit_name": f"Unit {i}", "hp": rng.choice(HP_CHOICES), "gold_cost": rng.randint(20, 400)}
+        for i in range(rng.randint(1, 3))
+    ]
+    target = rng.randint(1, 30)
+    fa_level, bonus = rng.choice(core.FIRST_AID_LEVELS), rng.choice((0, 1, 2))
+    pit_lord_count = rng.choice((None, 3, 10))
+    owned = rng.choice((None, {unit["unit_name"]: rng.randint(0, 200) for unit in units}))
+
+    plan = plan_cheapest_sacrifice(target, units, fa_level, bonus, pit_lord_count, owned)
+    expected = _brute_force(target, units, fa_level, bonus, pit_lord_count, owned)
+
+    if expected is None:
+        assert "error" in plan
+        return
+    assert plan["total_gold_cost"] == expected
+    assert plan["demons"] >= target
+    assert sum(stack["demons"] for stack in plan["stacks"]) == plan["demons"]
+    assert sum(stack["gold_cost"] for stack in plan["stacks"]) == expected
+    for stack in plan["stacks"]:
+        unit = next(unit for unit in units if unit["unit_name"] == stack["unit_name"])
+        result = core.calculate_demon_farm(core.modified_hp(unit["hp"], bonus, fa_level), stack["units"], 0)
+        assert result.wasted_hp == 0 and result.max_demons_from_hp == stack["demons"]
+        if pit_lord_count is not None:
+            assert stack["pit_lords"] <= pit_lord_count
+        if owned is not None:
+            assert stack["units"] <= owned[unit["unit_name"]]
+
+
+def test_catalog_plan_is_the_same_through_the_perfect_stack_index():
+    units = db.get_all_unit_details()
+    for fa_level, bonus in ((0, 0), (3, 2), (1, 5)):
+        assert plan_cheapest_sacrifice(120, units, fa_level, bonus, perfect_stacks=db.get_perfect_stack_index()) == (
+            plan_cheapest_sacrifice(120, units, fa_level, bonus)
+        )
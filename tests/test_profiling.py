@@ -0,0 +1,23 @@
+import importlib
+
+import src.cli as cli
+import src.profiling as profiling
+
+
+def test_every_profiled_function_exists():
+    for module_name, names in profiling.PROFILED_FUNCTIONS.items():
+        module = importlib.import_module(module_name)
+        for name in names:
+            assert callable(getattr(module, name)), f"{module_name}.{name}"
+
+
+def test_enable_times_the_calculators_the_cli_calls(monkeypatch):
+    monkeypatch.setattr(profiling, "_timings", {})
+    monkeypatch.setattr(profiling, "_enabled", True)
+    monkeypatch.setattr(cli, "calculate_demon_farm", cli.calculate_demon_farm)
+
+    profiling.enable({"src.cli": ("calculate_demon_farm",)})
+    profiling.enable({"src.cli": ("calculate_demon_farm",)})
+    cli.calculate_demon_farm(4.4, 10, 5)
+
+    assert [row[:2] for row in profiling.get_report()] == [("cli.calculate_demon_farm", 1)]
@@ -0,0 +1,14 @@
+from src.query_plans import check_query_plans, is_full_scan
+
+
+def test_every_db_query_avoids_full_scans():
+    assert check_query_plans() == []
+
+
+def test_index_scans_count_as_full_scans():
+    assert is_full_scan("SCAN calculation_logs")
+    assert is_full_scan("SCAN calculation_logs USING INDEX idx_calculation_logs_game_unit")
+    assert is_full_scan("SCAN games USING COVERING INDEX idx_games_name_nocase")
+    assert not is_full_scan("SEARCH calculation_logs USING INTEGER PRIMARY KEY (rowid>?)")
+    assert not is_full_scan("SEARCH games USING INDEX idx_games_name_nocase (name>? AND name<?)")
+    assert not is_full_scan("SCAN CONSTANT ROW")